@@ -1,7 +1,10 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from .cache_utils import get_user
 from .jwt_utils import decode_access_jwt
+from .models import ClaimsUser
 
 User = get_user_model()
 
@@ -20,9 +23,14 @@ class JWTAuthentication(BaseAuthentication):
             return None
 
         payload = decode_access_jwt(token)
-        try:
-            user = User.objects.get(id=payload["user_id"])
-        except User.DoesNotExist:
+        if settings.JWT_CLAIMS_PRINCIPAL:
+            return (ClaimsUser.from_claims(payload), None)
+
+        user_id = payload["user_id"]
+        user = get_user(user_id, lambda: User.objects.filter(id=user_id).defer("password").first())
+        if user is None:
             raise AuthenticationFailed("User not found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive")
 
         return (user, None)
@@ -0,0 +1,69 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.cache_utils import VersionedCache
+
+
+KEY_PREFIX = "auth_user"
+
+# The User row behind an access token, under a per-user auth version that
+# every save/delete of the user bumps (password change, deactivation, ...).
+users = VersionedCache(
+    KEY_PREFIX,
+    ttl=settings.AUTH_USER_CACHE_TTL,
+    max_bytes=16 * 1024,
+)
+
+_local: "OrderedDict[tuple, tuple[float, object]]" = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def get_user(user_id, load):
+    """
+    User for `user_id`, from the per-process LRU, then Redis, then `load()`.
+    The auth version is read from Redis once per call and the entry is
+    stored under that version, so a bump revokes cached copies in every
+    process at once, including a row loaded just before the bump.
+    The password hash is never cached: it stays deferred on the copies.
+    """
+    key = users.entry_key(user_id, "user")
+    now = time.monotonic()
+    with _local_lock:
+        hit = _local.get(key)
+        if hit is not None and hit[0] > now:
+            _local.move_to_end(key)
+            return copy.copy(hit[1])
+
+    user = users.get(key)
+    if user is None:
+        user = load()
+        if user is None:
+            return None
+        user = _without_password(user)
+        users.set(key, user)
+
+    with _local_lock:
+        _local[key] = (now + settings.AUTH_USER_CACHE_TTL, user)
+        while len(_local) > settings.AUTH_USER_CACHE_SIZE:
+            _local.popitem(last=False)
+    return copy.copy(user)
+
+
+def _without_password(user):
+    # A field missing from __dict__ is deferred: loaded on first access.
+    user = copy.copy(user)
+    user.__dict__.pop("password", None)
+    return user
+
+
+def invalidate(user_id):
+    users.bump(user_id)
+
+
+def clear_local() -> None:
+    with _local_lock:
+        _local.clear()
@@ -1,3 +1,23 @@
-from django.db import models
+from django.contrib.auth import get_user_model
+from django.db import router
 
-# Create your models here.
+
+class ClaimsUser(get_user_model()):
+    """
+    Request principal built from access-token claims alone. Only the id is
+    set; every other field is deferred, and the first one touched loads the
+    whole row in a single query.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "ClaimsUser":
+        return cls.from_db(router.db_for_read(cls), ["id"], [payload["user_id"]])
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
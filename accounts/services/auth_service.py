@@ -1,13 +1,14 @@
 import datetime
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
 from rest_framework.exceptions import AuthenticationFailed
 from ..jwt_utils import create_jwt, create_refresh_jwt, decode_refresh_jwt
+from .password_service import verify_credentials
 
 
 class AuthService:
     @staticmethod
     def login_user(username: str, password: str) -> tuple[str, datetime.datetime, str]:
-        user = authenticate(username=username, password=password)
+        user = verify_credentials(username, password)
         if not user:
             raise AuthenticationFailed("Invalid credentials")
 
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins in progress; retry shortly."
+    default_code = "hashing_busy"
+    wait = 1  # sent as Retry-After
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+
+
+def _pool():
+    # Created on first use, so forked web workers each start their own.
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = settings.PASSWORD_HASH_WORKERS
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            _slots = threading.BoundedSemaphore(workers)
+        return _executor, _slots
+
+
+def _with_connections(shared, fn, args, kwargs):
+    # Pool threads borrow the caller's DB connections (the caller waits
+    # meanwhile), so they see its transaction and open none of their own.
+    for alias, conn in shared.items():
+        connections[alias] = conn
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        for alias in shared:
+            del connections[alias]
+
+
+def run_bounded(fn, *args, **kwargs):
+    """
+    Run a password check in the per-process pool. At most
+    PASSWORD_HASH_WORKERS checks run at once; a caller that cannot get a
+    slot within PASSWORD_HASH_WAIT seconds gets HashingBusy instead of
+    piling up behind the others.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT):
+        raise HashingBusy()
+    shared = {conn.alias: conn for conn in connections.all()}
+    for conn in shared.values():
+        conn.inc_thread_sharing()
+    try:
+        return executor.submit(_with_connections, shared, fn, args, kwargs).result()
+    finally:
+        for conn in shared.values():
+            conn.dec_thread_sharing()
+        slots.release()
+
+
+def verify_credentials(username, password):
+    """
+    django.contrib.auth.authenticate, run in the pool so the hashing is
+    bounded while AUTHENTICATION_BACKENDS and user_login_failed work as
+    usual. ModelBackend hashes for unknown usernames too and replaces a
+    hash from an older hasher (e.g. MD5) on success.
+    """
+    return run_bounded(authenticate, request=None, username=username, password=password)
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_utils import invalidate
+from .models import ClaimsUser
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+@receiver(post_delete, sender=ClaimsUser)
+def bump_auth_version(sender, instance, **kwargs):
+    # Bump now and again after commit, so a request racing the transaction
+    # cannot re-cache the old row under the new version.
+    invalidate(instance.pk)
+    transaction.on_commit(lambda: invalidate(instance.pk))
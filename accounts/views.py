@@ -6,6 +6,7 @@ from .services.auth_service import AuthService
 from django.conf import settings
 from rest_framework import generics
 from .serializers import RegisterSerializer
+from .throttles import LoginIPThrottle, LoginUsernameThrottle
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -35,6 +36,8 @@ class RegisterView(generics.CreateAPIView):
         return response
 
 class LoginView(APIView):
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
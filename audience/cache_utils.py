@@ -1,17 +1,29 @@
-from django.core.cache import cache
+from django.conf import settings
+
+from core.cache_utils import VersionedCache, query_fingerprint
 
 
 KEY_PREFIX = "user_audiences"
 
-def audiences_key(user_id: int | str) -> str:
-    return f"{KEY_PREFIX}:{user_id}"
+# One entry per list page, under a per-user version bumped by audience
+# writes and by contact writes that move an audience's contacts_count.
+pages = VersionedCache(
+    KEY_PREFIX,
+    ttl=settings.AUDIENCES_CACHE_TTL,
+    max_bytes=settings.AUDIENCES_CACHE_MAX_BYTES,
+)
+
+def page_fingerprint(request) -> str:
+    return query_fingerprint(request.query_params, request.get_host())
+
+def entry_key(user_id, fingerprint):
+    return pages.entry_key(user_id, fingerprint)
 
-def get_cached(user_id):
-    return cache.get(audiences_key(user_id))
+def get_cached(key):
+    return pages.get(key)
 
-def set_cached(user_id, data):
-    # no TTL: we’ll invalidate on CRUD
-    cache.set(audiences_key(user_id), data)
+def set_cached(key, data):
+    pages.set(key, data)
 
 def invalidate(user_id):
-    cache.delete(audiences_key(user_id))
\ No newline at end of file
+    pages.bump(user_id)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from audience.models import Audience
+from audience.services import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Audience.contacts_count from the contacts table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--audience", action="append", default=[], help="Audience id (repeatable)")
+        parser.add_argument("--user-id", type=int, default=None, help="Only this user's audiences")
+
+    def handle(self, *args, **options):
+        audiences = Audience.all_objects.all()
+        if options["audience"]:
+            audiences = audiences.filter(pk__in=options["audience"])
+        if options["user_id"] is not None:
+            audiences = audiences.filter(user_id=options["user_id"])
+
+        n = counters.recount(audiences)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {n} audiences."))
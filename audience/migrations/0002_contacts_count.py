@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audience', '0001_initial'),
+        ('contacts', '0005_contact_audience_id_active_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audience',
+            name='contacts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE audience_audience AS a
+                SET contacts_count = c.n
+                FROM (
+                    SELECT audience_id, COUNT(*) AS n
+                    FROM contacts_contact
+                    WHERE status <> 'archived'
+                    GROUP BY audience_id
+                ) AS c
+                WHERE c.audience_id = a.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -45,6 +45,8 @@ class Audience(TimeStampedModel):
     )
     description = models.TextField(blank=True)
     archived_at = models.DateTimeField(null=True, blank=True)
+    # Non-archived contacts; kept in step by audience.services.counters
+    contacts_count = models.PositiveIntegerField(default=0)
 
     objects = ActiveManager()
     all_objects = AllObjectsManager()
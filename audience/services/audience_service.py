@@ -1,27 +1,19 @@
-from audience.cache_utils import get_cached, set_cached
-from audience.models import Audience
-from audience.serializers import AudienceSerializer
-from django.db.models import Q, Count
-from contacts.models import ContactStatus
+from audience.cache_utils import entry_key, get_cached, page_fingerprint, set_cached
+
 class AudienceService:
     def __init__(self, user):
         self.user = user
 
-    def get_audiences(self, search=None):
-        cached = get_cached(self.user.id)
+    def list_page(self, request, build):
+        """
+        Cached body of one audience list page. `build` renders the page
+        from the database on a miss and returns the response data.
+        """
+        key = entry_key(self.user.id, page_fingerprint(request))
+        cached = get_cached(key)
         if cached is not None:
-            if search:
-                return [
-                    item for item in cached
-                    if search.lower() in str(item).lower()
-                ]
             return cached
 
-        # fetch from DB if no cache
-        qs = Audience.objects.filter(user=self.user).annotate(
-            contacts_count=Count("contacts", ~Q(contacts__status=ContactStatus.ARCHIVED))
-        )
-        serializer = AudienceSerializer(qs, many=True)
-        data = serializer.data
-        set_cached(self.user.id, data)
+        data = build()
+        set_cached(key, data)
         return data
@@ -0,0 +1,61 @@
+from collections import Counter
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from audience import cache_utils
+from audience.models import Audience
+from contacts.models import Contact, ContactStatus
+
+
+def counted(status: str) -> bool:
+    """Whether a contact in `status` is part of its audience's contacts_count."""
+    return status != ContactStatus.ARCHIVED
+
+
+def adjust(user_id, deltas: dict) -> None:
+    """
+    Apply {audience_id: +n/-n} to contacts_count in the caller's
+    transaction. The user's audience list cache is invalidated on commit.
+    """
+    deltas = {aid: n for aid, n in deltas.items() if n}
+    if not deltas:
+        return
+    for audience_id, n in sorted(deltas.items(), key=lambda item: str(item[0])):
+        Audience.all_objects.filter(pk=audience_id).update(contacts_count=F("contacts_count") + n)
+    transaction.on_commit(lambda: cache_utils.invalidate(user_id))
+
+
+def contacts_added(user_id, contacts: Iterable) -> None:
+    adjust(user_id, Counter(c.audience_id for c in contacts if counted(c.status)))
+
+
+def contact_moved(user_id, old_audience_id, old_status, contact) -> None:
+    """A contact's audience and/or status changed from the given values."""
+    deltas = Counter()
+    if counted(old_status):
+        deltas[old_audience_id] -= 1
+    if counted(contact.status):
+        deltas[contact.audience_id] += 1
+    adjust(user_id, deltas)
+
+
+def recount(audiences=None) -> int:
+    """Recompute contacts_count from the contacts table; returns rows updated."""
+    per_audience = (
+        Contact.all_objects.filter(audience=OuterRef("pk"))
+        .exclude(status=ContactStatus.ARCHIVED)
+        .order_by()
+        .values("audience")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    qs = audiences if audiences is not None else Audience.all_objects.all()
+    with transaction.atomic():
+        updated = qs.update(contacts_count=Coalesce(Subquery(per_audience), Value(0)))
+        user_ids = set(qs.values_list("user_id", flat=True).distinct())
+    for user_id in user_ids:
+        cache_utils.invalidate(user_id)
+    return updated
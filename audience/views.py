@@ -4,11 +4,8 @@ from rest_framework import viewsets, filters
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Q, Count
 from audience.cache_utils import invalidate
 
-
-from contacts.models import ContactStatus
 from .models import Audience
 from .serializers import AudienceSerializer
 
@@ -23,18 +20,13 @@ class AudienceViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"] 
 
     def get_queryset(self):
-        return Audience.objects.filter(user=self.request.user).annotate(contacts_count=Count("contacts",~Q(contacts__status=ContactStatus.ARCHIVED)))
+        # contacts_count is a column now; listing needs no aggregate
+        return Audience.objects.filter(user=self.request.user)
     
     def list(self, request, *args, **kwargs):
         service = AudienceService(request.user)
-        data = service.get_audiences(search=request.query_params.get("search"))
-        page = self.paginate_queryset(self.get_queryset())
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return Response(serializer.data)
+        data = service.list_page(request, lambda: super(AudienceViewSet, self).list(request, *args, **kwargs).data)
+        return Response(data)
     
     def perform_destroy(self, instance):
         instance.archive()
@@ -0,0 +1,120 @@
+"""
+Compare the prefork send path with the asyncio sender against a local
+stand-in SMTP server that adds per-message latency.
+
+    python benchmarks/bench_async_send.py --messages 2000 --latency 0.05 --concurrency 200
+
+The sync figure is what one prefork worker process achieves; matching the
+async throughput takes (async rate / sync rate) such processes, each with
+its own interpreter (see the RSS lines).
+"""
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.mail import EmailMessage  # noqa: E402
+
+
+class SlowHandler:
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        return "250 Message accepted"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _messages(n):
+    return [
+        EmailMessage(subject=f"bench {i}", body="hello", from_email="bench@example.com", to=[f"r{i}@example.com"])
+        for i in range(n)
+    ]
+
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_sync(messages):
+    from emails.services.smtp_pool import SMTPConnectionPool
+
+    pool = SMTPConnectionPool()
+    start = time.perf_counter()
+    with pool.connection() as connection:
+        for message in messages:
+            connection.send_messages([message])
+    elapsed = time.perf_counter() - start
+    pool.close_all()
+    return elapsed
+
+
+def bench_async(messages, concurrency):
+    from emails.services.async_sender import AsyncSMTPSender
+
+    async def _run():
+        sender = AsyncSMTPSender(concurrency)
+        await sender.start()
+        start = time.perf_counter()
+        futures = [await sender.send(m) for m in messages]
+        await asyncio.gather(*futures)
+        elapsed = time.perf_counter() - start
+        await sender.close()
+        return elapsed, sender.stats
+
+    return asyncio.run(_run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--sync-messages", type=int, default=200, help="The sync path is slow; sample fewer")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stand-in server waits per DATA")
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    port = _free_port()
+    controller = Controller(SlowHandler(args.latency), hostname="127.0.0.1", port=port)
+    controller.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST, settings.EMAIL_PORT = "127.0.0.1", port
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+
+    try:
+        baseline_rss = _rss_mb()
+        sync_elapsed = bench_sync(_messages(args.sync_messages))
+        sync_rate = args.sync_messages / sync_elapsed
+        print(f"sync  (1 process, 1 session):     {sync_rate:8.1f} msg/s")
+
+        async_elapsed, stats = bench_async(_messages(args.messages), args.concurrency)
+        async_rate = args.messages / async_elapsed
+        print(f"async (1 process, {args.concurrency} sessions): {async_rate:8.1f} msg/s, "
+              f"{stats['connections_opened']} connections")
+        print(f"peak RSS: {_rss_mb():.0f} MB (Django baseline {baseline_rss:.0f} MB)")
+        print(f"prefork processes needed to match: {async_rate / sync_rate:.0f} "
+              f"(~{async_rate / sync_rate * baseline_rss:.0f} MB RSS)")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Requests/second on GET /api/contacts/ with and without the JWT user cache,
+and with the claims-only principal (JWT_CLAIMS_PRINCIPAL).
+
+    python benchmarks/bench_auth_cache.py --requests 2000
+
+Runs in-process through the full middleware/DRF stack against the
+configured database and cache, as a throwaway user that is deleted
+afterwards. The contacts page cache is warm in both runs, so the
+difference is the per-request User lookup.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts import authentication  # noqa: E402
+from accounts.jwt_utils import create_jwt  # noqa: E402
+from audience.models import Audience  # noqa: E402
+from contacts.models import Contact  # noqa: E402
+
+
+def run(client, n):
+    client.get("/api/contacts/")  # warm page cache and user cache
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        start = time.perf_counter()
+        for _ in range(n):
+            resp = client.get("/api/contacts/")
+        elapsed = time.perf_counter() - start
+    assert resp.status_code == 200, resp.status_code
+    return n / elapsed, len(queries) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    user = get_user_model().objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@bench.local", password="x",
+    )
+    audience = Audience.objects.create(user=user, name="Auth benchmark")
+    Contact.objects.bulk_create(Contact(audience=audience, email=f"c{i}@bench.local") for i in range(50))
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {create_jwt(user.id)[0]}")
+
+    try:
+        cached = run(client, args.requests)
+        settings.JWT_CLAIMS_PRINCIPAL = True
+        claims = run(client, args.requests)
+        settings.JWT_CLAIMS_PRINCIPAL = False
+        authentication.get_user = lambda user_id, load: load()
+        uncached = run(client, args.requests)
+    finally:
+        user.delete()
+
+    for label, (rps, queries) in (("without cache", uncached), ("with cache", cached), ("claims only", claims)):
+        print(f"{label:>14}: {rps:,.0f} req/s, {queries:.1f} queries/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Throughput of the CSV contact import (stream + COPY + one merge).
+
+    python benchmarks/bench_contact_import.py --rows 1000000
+
+Runs against the configured database (migrated), in a throwaway user
+and audience that are deleted afterwards. The CSV carries a few percent
+of duplicate and invalid rows, like a real export.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+
+from audience.models import Audience  # noqa: E402
+from contacts.models import ContactImport  # noqa: E402
+from contacts.services.import_service import ContactImporter  # noqa: E402
+
+
+def write_csv(path, rows):
+    tags = ["vip", "lead", "customer", "newsletter", "webinar"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("email,first_name,last_name,phone,tags\n")
+        for i in range(rows):
+            roll = random.random()
+            if roll < 0.02:
+                email = f"user{random.randrange(max(i, 1))}@example.com"  # duplicate
+            elif roll < 0.03:
+                email = f"broken-{i}"  # invalid
+            else:
+                email = f"User{i}@Example.com"
+            phone = f"+20 10 {random.randrange(10**7, 10**8)}" if roll < 0.5 else ""
+            f.write(f"{email},First{i},Last{i},{phone},{'|'.join(random.sample(tags, 2))}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    user = get_user_model().objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@bench.local", password="x",
+    )
+    audience = Audience.objects.create(user=user, name="Import benchmark")
+    with tempfile.TemporaryDirectory() as media:
+        settings.MEDIA_ROOT = media
+        path = os.path.join(media, "contacts.csv")
+        write_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        job = ContactImport.objects.create(user=user, audience=audience, file="contacts.csv", filename="contacts.csv")
+
+        try:
+            start = time.perf_counter()
+            job = ContactImporter(job).run()
+            elapsed = time.perf_counter() - start
+        finally:
+            user.delete()
+
+    print(f"{args.rows} rows ({size_mb:.0f} MB) in {elapsed:.1f}s: {args.rows / elapsed:,.0f} rows/s")
+    print(f"status={job.status} imported={job.rows_imported} duplicate={job.rows_duplicate} "
+          f"invalid={job.rows_invalid} existing={job.rows_existing}")
+    print(f"1M rows at this rate: ~{1_000_000 / (args.rows / elapsed):.0f}s")
+
+
+if __name__ == "__main__":
+    main()
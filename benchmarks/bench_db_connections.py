@@ -0,0 +1,44 @@
+"""
+Cost of the per-request/per-task connection lifecycle under each DB setting.
+
+    DB_POOL=true                       python benchmarks/bench_db_connections.py
+    DB_POOL=false DB_CONN_MAX_AGE=0    python benchmarks/bench_db_connections.py
+    DB_POOL=false DB_CONN_MAX_AGE=300  python benchmarks/bench_db_connections.py
+
+Each cycle runs one query and then what request_finished (web) or
+task_postrun (Celery) does with the connection.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import close_old_connections, connection  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=500)
+    args = parser.parse_args()
+
+    settings_dict = connection.settings_dict
+    start = time.perf_counter()
+    for _ in range(args.cycles):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        close_old_connections()
+    elapsed = time.perf_counter() - start
+
+    mode = "pool" if "pool" in settings_dict["OPTIONS"] else f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+    print(f"{mode}: {elapsed / args.cycles * 1000:.2f} ms per cycle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Login throughput, and latency of other API calls during a login burst.
+
+    python benchmarks/bench_login.py --threads 16 --seconds 10
+
+Runs in-process through the full middleware/DRF stack against the
+configured database and cache. Each scenario has --threads clients
+logging in while one client keeps calling GET /api/contacts/. Scenarios:
+
+    md5             the old MD5-only setting
+    pbkdf2 inline   PBKDF2 with one hashing slot per login thread (no bound)
+    pbkdf2 bounded  PBKDF2 through the PASSWORD_HASH_WORKERS pool
+
+Login throttles are disabled; the throwaway user is deleted afterwards.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import get_hashers, get_hashers_by_algorithm  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts.jwt_utils import create_jwt  # noqa: E402
+from accounts.services import password_service  # noqa: E402
+from accounts.throttles import LoginIPThrottle, LoginUsernameThrottle  # noqa: E402
+
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+PBKDF2 = "django.contrib.auth.hashers.PBKDF2PasswordHasher"
+LOGIN_URL = reverse("accounts:login")
+CONTACTS_URL = reverse("contacts:contact-list")
+
+
+def configure(hashers, workers, user):
+    settings.PASSWORD_HASHERS = hashers
+    get_hashers.cache_clear()
+    get_hashers_by_algorithm.cache_clear()
+    settings.PASSWORD_HASH_WORKERS = workers
+    if password_service._executor is not None:
+        password_service._executor.shutdown()
+    password_service._executor = None
+    user.set_password("pass1234")
+    user.save()
+
+
+def scenario(user, threads, seconds):
+    stop = time.monotonic() + seconds
+    statuses, latencies = Counter(), []
+
+    def login():
+        client = APIClient()
+        while time.monotonic() < stop:
+            resp = client.post(LOGIN_URL, {"username": user.username, "password": "pass1234"}, format="json")
+            statuses[resp.status_code] += 1
+        connection.close()
+
+    def probe():
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {create_jwt(user.id)[0]}")
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            client.get(CONTACTS_URL)
+            latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    workers = [threading.Thread(target=login) for _ in range(threads)] + [threading.Thread(target=probe)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    latencies.sort()
+    return (
+        statuses[200] / seconds,
+        statuses[503],
+        statistics.median(latencies),
+        latencies[int(len(latencies) * 0.95)],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    for throttle in (LoginIPThrottle, LoginUsernameThrottle):
+        throttle.THROTTLE_RATES = {throttle.scope: None}
+    user = get_user_model().objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@bench.local", password="x",
+    )
+    bounded = settings.PASSWORD_HASH_WORKERS
+    scenarios = [
+        ("md5", [MD5], args.threads),
+        ("pbkdf2 inline", [PBKDF2, MD5], args.threads),
+        (f"pbkdf2 bounded ({bounded})", [PBKDF2, MD5], bounded),
+    ]
+    try:
+        for label, hashers, workers in scenarios:
+            configure(hashers, workers, user)
+            logins, busy, p50, p95 = scenario(user, args.threads, args.seconds)
+            print(f"{label:>20}: {logins:7.1f} logins/s, {busy:5d} x 503 | "
+                  f"/api/contacts/ p50 {p50:6.1f} ms, p95 {p95:6.1f} ms")
+    finally:
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Tracking click throughput: sync views under WSGI vs async views under ASGI.
+
+    python benchmarks/bench_tracking_serving.py --connections 1000 --requests 20000
+
+Starts one single-process server per mode on localhost, then drives
+GET /t/c from --connections concurrent keep-alive connections:
+
+    wsgi  gunicorn core.wsgi, gthread worker, --threads threads, sync views
+    asgi  uvicorn core.asgi (uvloop + httptools): buffered hits are served
+          by tracking.asgi's fast path with the async views
+
+Both run with TRACKING_WRITE_BEHIND, so a hit is one Redis push. Links are
+signed for random recipient ids: the flush drops them as unknown.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from tracking.utils import build_click_url  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+def server_command(mode, port, threads):
+    if mode == "wsgi":
+        return ["gunicorn", "core.wsgi:application", "-b", f"{HOST}:{port}", "-w", "1",
+                "-k", "gthread", "--threads", str(threads), "--backlog", "4096", "--log-level", "warning"]
+    return ["uvicorn", "core.asgi:application", "--host", HOST, "--port", str(port), "--workers", "1",
+            "--loop", "uvloop", "--http", "httptools", "--lifespan", "off", "--backlog", "4096",
+            "--no-access-log", "--log-level", "warning"]
+
+
+def click_paths(count):
+    paths = []
+    for _ in range(count):
+        parts = urlsplit(build_click_url(None, str(uuid.uuid4()), "https://example.com/landing"))
+        paths.append(f"{parts.path}?{parts.query}".encode())
+    return paths
+
+
+async def connection(port, paths, count, latencies, errors):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    for i in range(count):
+        start = time.perf_counter()
+        writer.write(b"GET " + paths[i % len(paths)] + b" HTTP/1.1\r\nHost: " + HOST.encode() + b"\r\n\r\n")
+        status = await reader.readline()
+        length, close = 0, False
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection" and value.strip().lower() == b"close":
+                close = True
+        await reader.readexactly(length)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not status.startswith(b"HTTP/1.1 302"):
+            errors.append(status)
+        if close:
+            writer.close()
+            reader, writer = await asyncio.open_connection(HOST, port)
+    writer.close()
+
+
+async def drive(port, paths, connections, requests):
+    latencies, errors = [], []
+    per_connection = max(requests // connections, 1)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        connection(port, paths, per_connection, latencies, errors) for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99)], len(errors)
+
+
+def wait_ready(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=32, help="gthread threads for the WSGI run")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    paths = click_paths(100)
+    env = {**os.environ, "TRACKING_WRITE_BEHIND": "true", "DEBUG": "False"}
+    for mode in ("wsgi", "asgi"):
+        env["TRACKING_ASYNC_VIEWS"] = "true" if mode == "asgi" else "false"
+        proc = subprocess.Popen(server_command(mode, args.port, args.threads), cwd=ROOT, env=env)
+        try:
+            wait_ready(args.port, proc)
+            asyncio.run(drive(args.port, paths, 10, 200))  # warm up
+            rps, p50, p99, errors = asyncio.run(drive(args.port, paths, args.connections, args.requests))
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait()
+        print(f"{mode}: {rps:8,.0f} req/s  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  "
+              f"non-302 {errors}  ({args.connections} connections)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+KEY_PREFIX = "campaign_analytics"
+
+# Keys carry the user id so a cache hit can skip the ownership lookup;
+# entries are never invalidated, they just expire after a few seconds.
+def analytics_key(user_id, campaign_id, kind: str, *params) -> str:
+    suffix = ":".join(str(p) for p in params)
+    return f"{KEY_PREFIX}:{user_id}:{campaign_id}:{kind}:{suffix}"
+
+def get_cached(key):
+    return cache.get(key)
+
+def set_cached(key, data):
+    cache.set(key, data, timeout=settings.CAMPAIGN_ANALYTICS_CACHE_TTL)
@@ -2,6 +2,7 @@ from django.utils import timezone
 from rest_framework import serializers
 from .models import Campaign, CampaignStatus, ScheduleType
 from campaigns.services.campaign_validation import CampaignValidator
+from tracking.services import stats as email_stats
 
 
 class CampaignSerializer(serializers.ModelSerializer):
@@ -39,4 +40,15 @@ class CampaignSerializer(serializers.ModelSerializer):
             if timezone.is_naive(scheduled_at):
                 raise serializers.ValidationError({"scheduled_at": "Datetime must be timezone-aware."})
 
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+class CampaignDetailSerializer(CampaignSerializer):
+    stats = serializers.SerializerMethodField()
+
+    class Meta(CampaignSerializer.Meta):
+        fields = CampaignSerializer.Meta.fields + ("stats",)
+
+    def get_stats(self, obj):
+        # Sum of the per-email rollups; never scans EmailRecipient.
+        return email_stats.for_emails({"campaign_id": obj.id})
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from emails.models import Email
+from tracking.models import EmailStatsHourly
+from tracking.services import stats as email_stats
+
+BUCKETS = ("hour", "day", "week")
+BUCKET_STEP = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+# Window used when the client does not pass `since`.
+DEFAULT_WINDOW = {
+    "hour": timedelta(days=2),
+    "day": timedelta(days=30),
+    "week": timedelta(weeks=26),
+}
+# Hard cap so one request cannot ask for years of hourly points.
+MAX_POINTS = 24 * 31
+
+
+def floor_bucket(moment: datetime, bucket: str) -> datetime:
+    moment = email_stats.hour_bucket(moment)
+    if bucket in ("day", "week"):
+        moment = moment.replace(hour=0)
+    if bucket == "week":
+        moment -= timedelta(days=moment.weekday())
+    return moment
+
+
+def campaign_stats(campaign_id) -> dict:
+    """
+    Recipient counts for the campaign as a whole and per email, follow-ups
+    included, read from the per-email rollups (one row per email).
+    """
+    emails = (
+        Email.objects.filter(campaign_id=campaign_id)
+        .select_related("stats")
+        .only("id", "subject", "depends_on_id", "status", "created_at", "stats")
+        .order_by("created_at")
+    )
+    per_email = []
+    for email in emails:
+        per_email.append({
+            "id": str(email.id),
+            "subject": email.subject,
+            "depends_on": str(email.depends_on_id) if email.depends_on_id else None,
+            "status": email.status,
+            "stats": email_stats.for_email(email),
+        })
+
+    totals = {f: sum(e["stats"][f] for e in per_email) for f in email_stats.STATUS_FIELDS}
+    return {"campaign_id": str(campaign_id), "totals": email_stats.summarize(totals), "emails": per_email}
+
+
+def campaign_timeseries(campaign_id, bucket: str = "hour", since: datetime | None = None,
+                        until: datetime | None = None) -> dict:
+    """
+    Event counts per bucket across the campaign's emails, summed from
+    EmailStatsHourly. Buckets with no events are returned as zeros so the
+    series is continuous.
+    """
+    if bucket not in BUCKETS:
+        raise ValidationError({"bucket": f"Must be one of: {', '.join(BUCKETS)}."})
+
+    until = floor_bucket(until or timezone.now(), bucket)
+    since = floor_bucket(since or until - DEFAULT_WINDOW[bucket], bucket)
+    if since > until:
+        raise ValidationError({"since": "Must be before `until`."})
+    if (until - since) / BUCKET_STEP[bucket] >= MAX_POINTS:
+        raise ValidationError({"since": f"Range is limited to {MAX_POINTS} {bucket} buckets."})
+
+    rows = (
+        EmailStatsHourly.objects.filter(
+            email__campaign_id=campaign_id,
+            bucket__gte=since,
+            bucket__lt=until + BUCKET_STEP[bucket],
+        )
+        .annotate(period=Trunc("bucket", bucket, tzinfo=dt_timezone.utc))
+        .values("period")
+        .annotate(**{f: Sum(f) for f in email_stats.EVENT_FIELDS})
+        .order_by()
+    )
+    by_period = {row.pop("period"): row for row in rows}
+
+    points, moment = [], since
+    while moment <= until:
+        counts = by_period.get(moment, {})
+        points.append({"bucket": moment.isoformat(), **{f: counts.get(f) or 0 for f in email_stats.EVENT_FIELDS}})
+        moment += BUCKET_STEP[bucket]
+    return {
+        "campaign_id": str(campaign_id),
+        "bucket": bucket,
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "points": points,
+    }
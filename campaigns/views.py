@@ -1,9 +1,30 @@
+from datetime import timezone as dt_timezone
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from .models import Campaign
-from .serializers import CampaignSerializer
+from .serializers import CampaignDetailSerializer, CampaignSerializer
 from .filters import CampaignFilter 
+from . import cache_utils
+from .services import analytics
+
+
+def _parse_moment(request, name):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    moment = parse_datetime(raw)
+    if moment is None:
+        raise ValidationError({name: "Must be an ISO 8601 datetime."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
+
 
 class CampaignViewSet(viewsets.ModelViewSet):
     serializer_class = CampaignSerializer
@@ -17,8 +38,36 @@ class CampaignViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Campaign.objects.filter(user=self.request.user)
 
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return CampaignDetailSerializer
+        return super().get_serializer_class()
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
     def perform_destroy(self, instance):
-        instance.archive()
\ No newline at end of file
+        instance.archive()
+
+    def _cached_analytics(self, key, build):
+        data = cache_utils.get_cached(key)
+        if data is None:
+            campaign = self.get_object()
+            data = build(campaign.id)
+            cache_utils.set_cached(key, data)
+        return Response(data)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        key = cache_utils.analytics_key(request.user.id, pk, "stats")
+        return self._cached_analytics(key, analytics.campaign_stats)
+
+    @action(detail=True, methods=["get"])
+    def timeseries(self, request, pk=None):
+        bucket = request.query_params.get("bucket", "hour")
+        since = _parse_moment(request, "since")
+        until = _parse_moment(request, "until")
+        key = cache_utils.analytics_key(request.user.id, pk, "timeseries", bucket, since, until)
+        return self._cached_analytics(
+            key, lambda campaign_id: analytics.campaign_timeseries(campaign_id, bucket, since, until),
+        )
@@ -1,18 +1,30 @@
-from django.core.cache import cache
+from django.conf import settings
+
+from core.cache_utils import VersionedCache, query_fingerprint
 
 
 KEY_PREFIX = "user_contacts"
 
-def contacts_key(user_id: int | str) -> str:
-    return f"{KEY_PREFIX}:{user_id}"
+# One entry per list page (filters + search + ordering + page), under a
+# per-user version that every contact write bumps.
+pages = VersionedCache(
+    KEY_PREFIX,
+    ttl=settings.CONTACTS_CACHE_TTL,
+    max_bytes=settings.CONTACTS_CACHE_MAX_BYTES,
+)
+
+def page_fingerprint(request) -> str:
+    # next/previous links are absolute, so the host is part of the key
+    return query_fingerprint(request.query_params, request.get_host())
+
+def entry_key(user_id, fingerprint):
+    return pages.entry_key(user_id, fingerprint)
 
-def get_cached(user_id):
-    return cache.get(contacts_key(user_id))
+def get_cached(key):
+    return pages.get(key)
 
-def set_cached(user_id, data):
-    # no TTL: we’ll invalidate on CRUD
-    cache.set(contacts_key(user_id), data)
+def set_cached(key, data):
+    pages.set(key, data)
 
 def invalidate(user_id):
-    cache.delete(contacts_key(user_id))
-    
+    pages.bump(user_id)
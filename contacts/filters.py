@@ -1,6 +1,16 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery
+from django.db.models.functions import Lower
 from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
+
 from .models import Contact, ContactStatus
 
+# Same word boundaries as to_tsvector('simple'): letters/digits, no "_"
+WORD_RE = re.compile(r"[^\W_]+")
+PHONE_QUERY_RE = re.compile(r"^\+?[\d\s()-]+$")
+
 class ContactFilter(filters.FilterSet):
     # /api/contacts?tags=vip,owner  -> OR
     tags = filters.CharFilter(method="filter_tags_any")
@@ -22,4 +32,32 @@ class ContactFilter(filters.FilterSet):
 
     def filter_tags_any(self, qs, name, value):
         tags = self._parse_csv_tags(value)
-        return qs if not tags else qs.filter(tags__overlap=tags)
\ No newline at end of file
+        return qs if not tags else qs.filter(tags__overlap=tags)
+
+class ContactSearchFilter(SearchFilter):
+    """
+    ?search= over Contact.search_vector instead of icontains scans.
+
+    Terms containing "@" are email prefixes (LIKE 'term%' on lower(email));
+    a phone-looking query is reduced to its digits; anything else matches
+    words of the email, names and phone by prefix, all terms ANDed.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        if PHONE_QUERY_RE.match(" ".join(terms)):
+            terms = ["".join(terms)]
+
+        words = []
+        for term in terms:
+            term = term.lower()
+            if "@" in term:
+                queryset = queryset.alias(email_lower=Lower("email")).filter(email_lower__startswith=term)
+            else:
+                words.extend(WORD_RE.findall(term))
+        if words:
+            tsquery = " & ".join(f"{word}:*" for word in dict.fromkeys(words))
+            queryset = queryset.filter(search_vector=SearchQuery(tsquery, search_type="raw", config="simple"))
+        return queryset
@@ -11,6 +11,8 @@ from django.utils.text import slugify
 # TODO: adjust to your real app paths
 from audience.models import Audience
 from contacts.models import Contact # <-- change 'your_app' if needed
+from contacts.cache_utils import invalidate
+from audience.services import counters as audience_counters
 
 fake = Faker()
 
@@ -193,14 +195,17 @@ class Command(BaseCommand):
                     contacts_batch.append(Contact(**contact_kwargs))
 
                     if len(contacts_batch) >= batch_size:
-                        Contact.objects.bulk_create(contacts_batch)
+                        audience_counters.contacts_added(user.id, Contact.objects.bulk_create(contacts_batch))
                         contacts_batch = []
 
                 if contacts_batch:
-                    Contact.objects.bulk_create(contacts_batch)
+                    audience_counters.contacts_added(user.id, Contact.objects.bulk_create(contacts_batch))
 
                 self.stdout.write(self.style.SUCCESS(f"  -> Done: {count} contacts for audience {aud.pk}"))
 
+        if user is not None:
+            invalidate(user.id)
+
         self.stdout.write(self.style.SUCCESS(
             f"Seeding complete. Audiences: {n_audiences}, Contacts: ~{total_contacts}"
         ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audience', '0001_initial'),
+        ('contacts', '0004_tag_contact_tags_contact_contacts_co_tags_710a2a_gin_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['audience', 'id'], name='idx_contact_aud_id_active'),
+        ),
+    ]
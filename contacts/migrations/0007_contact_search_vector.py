@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:15
+
+import contacts.models
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audience', '0002_contacts_count'),
+        ('contacts', '0006_contactimport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='search_vector',
+            field=contacts.models.UnreturnedGeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector(models.Func(django.db.models.functions.text.Lower('email'), models.Value('@.+_-'), models.Value('     '), function='translate'), 'first_name', 'last_name', models.Func(models.F('phone'), models.Value('+'), models.Value(''), function='translate'), config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('status', 'archived'), _negated=True), fields=['search_vector'], name='idx_contact_search_active'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('email'), name='text_pattern_ops'), condition=models.Q(('status', 'archived'), _negated=True), name='idx_email_prefix_active'),
+        ),
+    ]
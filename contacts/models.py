@@ -1,10 +1,12 @@
 import uuid
 from django.db import models
 from django.db.models.functions import Lower
+from django.db.models import F, Func, Value
 from django.core.validators import RegexValidator
 from django.db.models import Q
 from django.contrib.postgres.fields import ArrayField
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 
 
@@ -32,10 +34,25 @@ class ContactSource(models.TextChoices):
     FORM = "form", "Form Signup"
     CSV = "csv", "CSV Import"
 
-class NonArchivedManager(models.Manager):
+class ContactManager(models.Manager):
+    # search_vector is only ever filtered on (ContactSearchFilter); don't
+    # ship it with every row.
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+
+class NonArchivedManager(ContactManager):
     def get_queryset(self):
         return super().get_queryset().exclude(status=ContactStatus.ARCHIVED)
 
+
+class UnreturnedGeneratedField(models.GeneratedField):
+    """
+    GeneratedField left out of INSERT ... RETURNING, so save() and
+    bulk_create() don't read it back; it stays deferred on the instance.
+    """
+    db_returning = False
+
 class Contact(TimeStampedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -73,8 +90,20 @@ class Contact(TimeStampedModel):
         help_text="List of lowercase tag names (user-scoped).",
     )
 
+    # Words of the email (split on @ . + _ -), names and phone, for ?search=
+    search_vector = UnreturnedGeneratedField(
+        expression=SearchVector(
+            Func(Lower("email"), Value("@.+_-"), Value("     "), function="translate"),
+            "first_name", "last_name",
+            Func(F("phone"), Value("+"), Value(""), function="translate"),
+            config="simple",
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     objects = NonArchivedManager()
-    all_objects = models.Manager()  # includes archived
+    all_objects = ContactManager()  # includes archived
 
     class Meta:
         constraints = [
@@ -96,6 +125,23 @@ class Contact(TimeStampedModel):
                 name="idx_email_active",
                 condition=~Q(status=ContactStatus.ARCHIVED),
             ),
+            # ?search= : prefix tsquery on the words, LIKE 'term%' on full emails
+            GinIndex(
+                fields=["search_vector"],
+                name="idx_contact_search_active",
+                condition=~Q(status=ContactStatus.ARCHIVED),
+            ),
+            models.Index(
+                OpClass(Lower("email"), name="text_pattern_ops"),
+                name="idx_email_prefix_active",
+                condition=~Q(status=ContactStatus.ARCHIVED),
+            ),
+            # Keyset scans of sendable contacts per audience (email dispatch)
+            models.Index(
+                fields=["audience", "id"],
+                name="idx_contact_aud_id_active",
+                condition=Q(status=ContactStatus.ACTIVE),
+            ),
         ]
         ordering = ["-created_at"]
 
@@ -133,3 +179,53 @@ class Tag(models.Model):
 
 
 
+
+
+class ImportStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    COMPLETED = "completed", "Completed"
+    FAILED = "failed", "Failed"
+
+
+class ContactImport(TimeStampedModel):
+    """
+    One CSV upload into an audience. Counters are updated as the file is
+    streamed so clients can poll progress.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="contact_imports",
+    )
+    audience = models.ForeignKey(
+        "audience.Audience",
+        on_delete=models.CASCADE,
+        related_name="imports",
+    )
+    file = models.FileField(upload_to="contact_imports/")
+    filename = models.CharField(max_length=255, blank=True)
+    tags = ArrayField(base_field=models.CharField(max_length=64), default=list, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=ImportStatus.choices,
+        default=ImportStatus.PENDING,
+        db_index=True,
+    )
+
+    rows_read = models.PositiveIntegerField(default=0)
+    rows_invalid = models.PositiveIntegerField(default=0)
+    rows_duplicate = models.PositiveIntegerField(default=0, help_text="Repeated within the file.")
+    rows_existing = models.PositiveIntegerField(default=0, help_text="Already in the audience.")
+    rows_imported = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="First invalid rows: line and reason.")
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.filename or self.file.name} -> {self.audience_id} [{self.status}]"
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.db import transaction
 from .services.contact_validation import ContactService, DuplicateContactEmail
-from .models import Contact
+from .models import Contact, ContactImport, ContactSource, ContactStatus
 from audience.models import Audience
+from audience.services import counters as audience_counters
 
 
 class ContactSerializer(serializers.ModelSerializer):
@@ -67,6 +69,7 @@ class ContactSerializer(serializers.ModelSerializer):
         contact = Contact.objects.create(**validated_data, tags=tags)
         if tags:
             ContactService.get_or_create_tags(user, tags)
+        audience_counters.contacts_added(user.id, [contact])
 
         return contact
     
@@ -74,6 +77,7 @@ class ContactSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         user = self.context["request"].user
         tags = validated_data.pop("tags", None)
+        old_audience_id, old_status = instance.audience_id, instance.status
 
         if tags is not None:
             tags = ContactService.normalize_tags(tags)
@@ -81,4 +85,98 @@ class ContactSerializer(serializers.ModelSerializer):
             if tags:
                 ContactService.get_or_create_tags(user, tags)
 
-        return super().update(instance, validated_data)
+        contact = super().update(instance, validated_data)
+        if (contact.audience_id, contact.status) != (old_audience_id, old_status):
+            audience_counters.contact_moved(user.id, old_audience_id, old_status, contact)
+        return contact
+
+
+class ContactImportSerializer(serializers.ModelSerializer):
+    audience = serializers.PrimaryKeyRelatedField(queryset=Audience.objects.all())
+    file = serializers.FileField(write_only=True)
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        required=False
+    )
+
+    class Meta:
+        model = ContactImport
+        fields = [
+            "id",
+            "audience",
+            "file",
+            "filename",
+            "tags",
+            "status",
+            "rows_read",
+            "rows_invalid",
+            "rows_duplicate",
+            "rows_existing",
+            "rows_imported",
+            "errors",
+            "started_at",
+            "finished_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [f for f in fields if f not in ("audience", "file", "tags")]
+
+    def validate_audience(self, audience):
+        request = self.context["request"]
+        if audience.user != request.user:
+            raise serializers.ValidationError("No audience found for this id.")
+        return audience
+
+    def validate_file(self, upload):
+        if not upload.name.lower().endswith(".csv"):
+            raise serializers.ValidationError("Upload a .csv file.")
+        if upload.size > settings.CONTACT_IMPORT_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"File is larger than {settings.CONTACT_IMPORT_MAX_BYTES // (1024 * 1024)} MB."
+            )
+        return upload
+
+    def validate_tags(self, tags):
+        return ContactService.normalize_tags(tags)
+
+    def create(self, validated_data):
+        upload = validated_data["file"]
+        return ContactImport.objects.create(
+            user=self.context["request"].user,
+            filename=upload.name,
+            **validated_data,
+        )
+
+
+class BulkContactItemSerializer(serializers.Serializer):
+    """
+    Shape/format checks for one bulk operation. Ownership and uniqueness
+    are checked for the whole batch at once by bulk_service.
+    """
+    id = serializers.UUIDField(required=False)
+    audience = serializers.UUIDField(required=False)
+    email = serializers.EmailField(max_length=254, required=False)
+    first_name = serializers.CharField(max_length=120, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=120, required=False, allow_blank=True)
+    phone = serializers.CharField(
+        max_length=16, required=False, allow_blank=True, validators=[Contact.phone_regex]
+    )
+    status = serializers.ChoiceField(choices=ContactStatus.choices, required=False)
+    source = serializers.ChoiceField(choices=ContactSource.choices, required=False)
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        required=False
+    )
+
+    def validate_email(self, value):
+        return value.lower()
+
+    def validate_tags(self, tags):
+        return ContactService.normalize_tags(tags)
+
+    def validate(self, attrs):
+        required = ("id",) if self.context.get("update") else ("audience", "email")
+        missing = {f: ["This field is required."] for f in required if f not in attrs}
+        if missing:
+            raise serializers.ValidationError(missing)
+        return attrs
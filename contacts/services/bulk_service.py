@@ -0,0 +1,226 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from audience.models import Audience
+from audience.services import counters as audience_counters
+from contacts import cache_utils as contacts_cache
+from contacts.models import Contact, ContactSource, ContactStatus
+from contacts.serializers import BulkContactItemSerializer
+from contacts.services.contact_validation import ContactService
+
+NOT_FOUND_AUDIENCE = "No audience found for this id."
+DUPLICATE_EMAIL = "This email already exists in this audience."
+UPDATABLE_FIELDS = ("audience", "email", "first_name", "last_name", "phone", "status", "source", "tags")
+
+
+class BulkConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A concurrent write created one of these contacts; retry the request."
+    default_code = "conflict"
+
+
+def _check_size(items) -> None:
+    limit = settings.CONTACTS_BULK_MAX_OPERATIONS
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError({"detail": "Expected a non-empty list."})
+    if len(items) > limit:
+        raise serializers.ValidationError({"detail": f"At most {limit} operations per request."})
+
+
+class BulkOperation:
+    """Per-item outcome bookkeeping shared by the bulk create/update paths."""
+
+    def __init__(self, user, items, update: bool):
+        _check_size(items)
+        self.user = user
+        self.results = [None] * len(items)
+        self.valid = []
+        context = {"update": update}
+        for index, item in enumerate(items):
+            ser = BulkContactItemSerializer(data=item, context=context)
+            if ser.is_valid():
+                self.valid.append((index, ser.validated_data))
+            else:
+                self.fail(index, ser.errors)
+
+    def fail(self, index, errors) -> None:
+        self.results[index] = {"index": index, "ok": False, "errors": errors}
+
+    def ok(self, index, contact_id) -> None:
+        self.results[index] = {"index": index, "ok": True, "id": str(contact_id)}
+
+    def owned_audiences(self, audience_ids) -> set:
+        if not audience_ids:
+            return set()
+        return set(Audience.objects.filter(user=self.user, id__in=audience_ids).values_list("id", flat=True))
+
+    @staticmethod
+    def taken_emails(audience_ids, emails) -> dict:
+        """{(audience_id, lower(email)): contact_id} for active contacts, in one query."""
+        if not audience_ids or not emails:
+            return {}
+        rows = (
+            Contact.objects.filter(audience_id__in=audience_ids)
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=list(emails))
+            .values_list("audience_id", "email_lower", "id")
+        )
+        return {(aud, email): pk for aud, email, pk in rows}
+
+    def response(self, verb: str, done: int) -> dict:
+        return {verb: done, "failed": len(self.results) - done, "results": self.results}
+
+
+def create_contacts(user, items) -> dict:
+    """
+    Create many contacts: one ownership query, one uniqueness query,
+    bulk_create, one Tag upsert and one cache invalidation.
+    """
+    op = BulkOperation(user, items, update=False)
+    owned = op.owned_audiences({attrs["audience"] for _, attrs in op.valid})
+    taken = op.taken_emails(owned, {attrs["email"] for _, attrs in op.valid})
+
+    to_create, tags = [], set()
+    for index, attrs in op.valid:
+        key = (attrs["audience"], attrs["email"])
+        if attrs["audience"] not in owned:
+            op.fail(index, {"audience": [NOT_FOUND_AUDIENCE]})
+            continue
+        if key in taken:
+            op.fail(index, {"email": [DUPLICATE_EMAIL]})
+            continue
+        contact = Contact(
+            audience_id=attrs["audience"],
+            email=attrs["email"],
+            first_name=attrs.get("first_name", ""),
+            last_name=attrs.get("last_name", ""),
+            phone=attrs.get("phone", ""),
+            status=attrs.get("status", ContactStatus.ACTIVE),
+            source=attrs.get("source", ContactSource.API),
+            tags=attrs.get("tags", []),
+        )
+        if contact.status != ContactStatus.ARCHIVED:
+            taken[key] = contact.id  # later duplicates in this request
+        tags.update(contact.tags)
+        to_create.append((index, contact))
+
+    if to_create:
+        contacts = [contact for _, contact in to_create]
+        try:
+            with transaction.atomic():
+                Contact.objects.bulk_create(contacts, batch_size=1000)
+                if tags:
+                    ContactService.get_or_create_tags(user, sorted(tags))
+                audience_counters.contacts_added(user.id, contacts)
+        except IntegrityError:
+            raise BulkConflict()
+        contacts_cache.invalidate(user.id)
+        for index, contact in to_create:
+            op.ok(index, contact.id)
+    return op.response("created", len(to_create))
+
+
+def update_contacts(user, items) -> dict:
+    """
+    Partially update many contacts by id; same set-based checks as
+    create_contacts, one bulk_update for all changed fields.
+    """
+    op = BulkOperation(user, items, update=True)
+    ids = {attrs["id"] for _, attrs in op.valid}
+    contacts = {c.id: c for c in Contact.objects.filter(id__in=ids, audience__user=user)}
+    owned = op.owned_audiences({attrs["audience"] for _, attrs in op.valid if "audience" in attrs})
+
+    # Final (audience, email) of every contact whose address may change
+    targets = {}
+    for index, attrs in op.valid:
+        contact = contacts.get(attrs["id"])
+        if contact and ("email" in attrs or "audience" in attrs):
+            targets[index] = (attrs.get("audience", contact.audience_id), attrs.get("email", contact.email.lower()))
+    taken = op.taken_emails({aud for aud, _ in targets.values()}, {email for _, email in targets.values()})
+
+    now = timezone.now()
+    changed, fields, tags, seen = [], set(), set(), set()
+    deltas = Counter()
+    for index, attrs in op.valid:
+        contact = contacts.get(attrs["id"])
+        if contact is None:
+            op.fail(index, {"id": ["No contact found for this id."]})
+            continue
+        if contact.id in seen:
+            op.fail(index, {"id": ["Contact appears more than once in this request."]})
+            continue
+        if "audience" in attrs and attrs["audience"] not in owned:
+            op.fail(index, {"audience": [NOT_FOUND_AUDIENCE]})
+            continue
+        if index in targets:
+            holder = taken.get(targets[index])
+            if holder is not None and holder != contact.id:
+                op.fail(index, {"email": [DUPLICATE_EMAIL]})
+                continue
+        seen.add(contact.id)
+
+        old_audience_id, old_status = contact.audience_id, contact.status
+        for field in UPDATABLE_FIELDS:
+            if field in attrs:
+                setattr(contact, "audience_id" if field == "audience" else field, attrs[field])
+                fields.add(field)
+        if index in targets and contact.status != ContactStatus.ARCHIVED:
+            taken[targets[index]] = contact.id
+        if audience_counters.counted(old_status):
+            deltas[old_audience_id] -= 1
+        if audience_counters.counted(contact.status):
+            deltas[contact.audience_id] += 1
+        contact.updated_at = now
+        tags.update(attrs.get("tags", []))
+        changed.append((index, contact))
+
+    if changed:
+        try:
+            with transaction.atomic():
+                Contact.objects.bulk_update(
+                    [contact for _, contact in changed], sorted(fields | {"updated_at"}), batch_size=1000
+                )
+                if tags:
+                    ContactService.get_or_create_tags(user, sorted(tags))
+                audience_counters.adjust(user.id, deltas)
+        except IntegrityError:
+            raise BulkConflict()
+        contacts_cache.invalidate(user.id)
+        for index, contact in changed:
+            op.ok(index, contact.id)
+    return op.response("updated", len(changed))
+
+
+def archive_contacts(user, ids) -> dict:
+    """
+    Archive many contacts with one UPDATE ... RETURNING. Only rows it
+    actually moved out of a counted status are returned, so a concurrent
+    archive of the same ids cannot decrement contacts_count twice.
+    """
+    _check_size(ids)
+    ids = serializers.ListField(child=serializers.UUIDField()).run_validation(ids)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Contact._meta.db_table} AS c SET status = %s, updated_at = %s "
+                f"FROM {Audience._meta.db_table} AS a "
+                "WHERE a.id = c.audience_id AND a.user_id = %s AND c.id = ANY(%s::uuid[]) AND c.status <> %s "
+                "RETURNING c.id, c.audience_id",
+                [ContactStatus.ARCHIVED, timezone.now(), user.id, list(dict.fromkeys(ids)), ContactStatus.ARCHIVED],
+            )
+            rows = cursor.fetchall()
+        removed = Counter(aud for _, aud in rows)
+        audience_counters.adjust(user.id, {aud: -n for aud, n in removed.items()})
+    found = {pk for pk, _ in rows}
+    if rows:
+        contacts_cache.invalidate(user.id)
+    return {
+        "archived": len(found),
+        "not_found": [str(pk) for pk in dict.fromkeys(ids) if pk not in found],
+    }
@@ -1,23 +1,19 @@
-from contacts.models import Contact
-from contacts.serializers import ContactSerializer
-from contacts.cache_utils import get_cached, set_cached
+from contacts.cache_utils import entry_key, get_cached, page_fingerprint, set_cached
 
 class ContactService:
     def __init__(self, user):
         self.user = user
 
-    def get_contacts(self, queryset, search=None):
-        cached = get_cached(self.user.id)
+    def list_page(self, request, build):
+        """
+        Cached body of one contacts list page. `build` renders the page
+        from the database on a miss and returns the response data.
+        """
+        key = entry_key(self.user.id, page_fingerprint(request))
+        cached = get_cached(key)
         if cached is not None:
-            if search:
-                return [
-                    item for item in cached
-                    if search.lower() in str(item).lower()
-                ]
             return cached
 
-        # No cache → use queryset provided by the viewset
-        serializer = ContactSerializer(queryset, many=True)
-        data = serializer.data
-        set_cached(self.user.id, data)
-        return data
\ No newline at end of file
+        data = build()
+        set_cached(key, data)
+        return data
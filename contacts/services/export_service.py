@@ -0,0 +1,89 @@
+import csv
+import json
+import zlib
+
+from django.conf import settings
+
+# Column order of both export formats.
+EXPORT_FIELDS = (
+    "id",
+    "audience_id",
+    "email",
+    "first_name",
+    "last_name",
+    "phone",
+    "status",
+    "source",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+TAGS_INDEX = EXPORT_FIELDS.index("tags")
+TIME_INDEXES = (EXPORT_FIELDS.index("created_at"), EXPORT_FIELDS.index("updated_at"))
+
+
+class _Line:
+    """File-like sink so csv.writer hands back each formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Tuples in EXPORT_FIELDS order through a server-side cursor, so memory
+    stays at one chunk whatever the size of the export.
+    """
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=settings.CONTACTS_EXPORT_CHUNK_SIZE)
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _plain(row) -> list:
+    """JSON/CSV-ready values: ISO timestamps, string ids."""
+    row = list(row)
+    row[0], row[1] = str(row[0]), str(row[1])
+    for i in TIME_INDEXES:
+        row[i] = row[i].isoformat()
+    return row
+
+
+def csv_chunks(rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORT_FIELDS)
+    for batch in _batched(rows, settings.CONTACTS_EXPORT_CHUNK_SIZE):
+        lines = []
+        for row in batch:
+            row = _plain(row)
+            row[TAGS_INDEX] = ",".join(row[TAGS_INDEX])
+            lines.append(writer.writerow(row))
+        yield "".join(lines)
+
+
+def ndjson_chunks(rows):
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for batch in _batched(rows, settings.CONTACTS_EXPORT_CHUNK_SIZE):
+        yield "".join(dumps(dict(zip(EXPORT_FIELDS, _plain(row)))) + "\n" for row in batch)
+
+
+def encode(chunks, gzip: bool = False):
+    """UTF-8 bytes, gzip-compressed on the fly when asked."""
+    if not gzip:
+        for chunk in chunks:
+            yield chunk.encode()
+        return
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
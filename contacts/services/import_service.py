@@ -0,0 +1,299 @@
+import csv
+import io
+import logging
+import re
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from audience.services import counters as audience_counters
+from contacts import cache_utils as contacts_cache
+from contacts.models import Contact, ContactImport, ContactSource, ContactStatus, ImportStatus
+from contacts.services.contact_validation import ContactService
+
+logger = logging.getLogger(__name__)
+
+# Accepted header spellings, compared after lower-casing and turning
+# spaces/dashes into underscores.
+HEADER_ALIASES = {
+    "email": "email",
+    "e_mail": "email",
+    "email_address": "email",
+    "first_name": "first_name",
+    "firstname": "first_name",
+    "first": "first_name",
+    "last_name": "last_name",
+    "lastname": "last_name",
+    "last": "last_name",
+    "phone": "phone",
+    "phone_number": "phone",
+    "mobile": "phone",
+    "tags": "tags",
+}
+STAGE_COLUMNS = ("line", "email", "first_name", "last_name", "phone", "tags")
+
+NAME_MAX_LENGTH = Contact._meta.get_field("first_name").max_length
+TAG_MAX_LENGTH = 64
+PHONE_RE = re.compile(Contact.phone_regex.regex)
+PHONE_NOISE = str.maketrans("", "", " \t-().")
+TAG_SPLIT_RE = re.compile(r"[,;|]")
+# Plain ASCII addresses that Django's EmailValidator is known to accept;
+# anything else goes through the validator itself.
+SIMPLE_EMAIL_RE = re.compile(
+    r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}"
+)
+EMAIL_MAX_LENGTH = 320
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def normalize_email(value: str) -> str:
+    email = (value or "").strip().lower()
+    if not email:
+        raise InvalidRow("Email is required.")
+    if len(email) <= EMAIL_MAX_LENGTH and SIMPLE_EMAIL_RE.fullmatch(email):
+        return email
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise InvalidRow(f"Invalid email: {value!r}.")
+    return email
+
+
+def normalize_phone(value: str) -> str:
+    """Strip formatting; accepts 00-prefixed international numbers."""
+    phone = (value or "").translate(PHONE_NOISE)
+    if not phone:
+        return ""
+    if phone.startswith("00"):
+        phone = "+" + phone[2:]
+    if not PHONE_RE.match(phone):
+        raise InvalidRow(f"Invalid phone: {value!r}.")
+    return phone
+
+
+def normalize_name(value: str, field: str) -> str:
+    name = (value or "").strip()
+    if len(name) > NAME_MAX_LENGTH:
+        raise InvalidRow(f"{field} is longer than {NAME_MAX_LENGTH} characters.")
+    return name
+
+
+def normalize_row_tags(value: str, extra: list) -> list:
+    if not value and not extra:
+        return []
+    tags = ContactService.normalize_tags(TAG_SPLIT_RE.split(value or "") + extra)
+    if any(len(t) > TAG_MAX_LENGTH for t in tags):
+        raise InvalidRow(f"Tags are limited to {TAG_MAX_LENGTH} characters.")
+    return tags
+
+
+def map_header(header: list) -> dict:
+    """{field: column index} for the recognised columns."""
+    columns = {}
+    for index, name in enumerate(header):
+        key = re.sub(r"[\s\-]+", "_", (name or "").strip().lower())
+        field = HEADER_ALIASES.get(key)
+        if field and field not in columns:
+            columns[field] = index
+    if "email" not in columns:
+        raise InvalidRow("The CSV header has no email column.")
+    return columns
+
+
+def _copy_rows(cursor, table: str, rows: list) -> None:
+    """Bulk-load `rows` (tuples in STAGE_COLUMNS order) with COPY ... FROM STDIN."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    with cursor.cursor.copy(f"COPY {table} ({', '.join(STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)") as copy:
+        copy.write(buf.getvalue())
+
+
+class ContactImporter:
+    """
+    Streams a ContactImport's CSV into its audience:
+
+    1. rows are parsed and normalized one at a time, duplicates within a
+       batch are dropped in memory;
+    2. each batch is COPY'd into a session temp table, and progress is
+       written to the job row;
+    3. one INSERT ... SELECT DISTINCT ON ... ON CONFLICT merges the stage
+       into contacts_contact, letting the uniq_email_aud_active index
+       skip addresses already in the audience.
+    """
+
+    def __init__(self, job: ContactImport):
+        self.job = job
+        self.stage = f"contact_import_{uuid.uuid4().hex[:12]}"
+        self.batch_size = settings.CONTACT_IMPORT_BATCH_SIZE
+        self.tags_seen = set()
+
+    def run(self) -> ContactImport:
+        """Import a job already claimed by run_import; the CSV is deleted once it ends."""
+        job = self.job
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TEMP TABLE {self.stage} "
+                    "(line integer, email text, first_name text, last_name text, phone text, tags text)"
+                )
+                try:
+                    self._stage_file(cursor)
+                    self._merge(cursor)
+                finally:
+                    cursor.execute(f"DROP TABLE IF EXISTS {self.stage}")
+        except InvalidRow as e:
+            self._fail(str(e))
+        except Exception as e:
+            logger.exception("Contact import %s failed", job.id)
+            self._fail(f"Import failed: {e}")
+        if job.status in (ImportStatus.COMPLETED, ImportStatus.FAILED):
+            job.file.delete(save=False)
+            ContactImport.objects.filter(pk=job.pk).update(file="")
+        return job
+
+    def _fail(self, message: str) -> None:
+        self.job.status, self.job.finished_at = ImportStatus.FAILED, timezone.now()
+        self.job.errors = (self.job.errors + [{"line": None, "error": message}])[-settings.CONTACT_IMPORT_MAX_ERRORS:]
+        self.job.save(update_fields=["status", "finished_at", "errors", "updated_at"])
+
+    def _invalid(self, line: int, error: str) -> None:
+        self.job.rows_invalid += 1
+        if len(self.job.errors) < settings.CONTACT_IMPORT_MAX_ERRORS:
+            self.job.errors.append({"line": line, "error": error})
+
+    def _stage_file(self, cursor) -> None:
+        job = self.job
+        with job.file.open("rb") as raw:
+            reader = csv.reader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+            columns = map_header(next(reader, []))
+
+            def field(row, name):
+                index = columns.get(name)
+                return row[index] if index is not None and index < len(row) else ""
+
+            batch, batch_emails = [], set()
+            for row in reader:
+                if not any(row):
+                    continue
+                job.rows_read += 1
+                try:
+                    email = normalize_email(field(row, "email"))
+                    record = (
+                        reader.line_num,
+                        email,
+                        normalize_name(field(row, "first_name"), "first_name"),
+                        normalize_name(field(row, "last_name"), "last_name"),
+                        normalize_phone(field(row, "phone")),
+                        ",".join(normalize_row_tags(field(row, "tags"), job.tags)),
+                    )
+                except InvalidRow as e:
+                    self._invalid(reader.line_num, str(e))
+                    continue
+                if email in batch_emails:
+                    job.rows_duplicate += 1
+                    continue
+                batch_emails.add(email)
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    self._flush(cursor, batch)
+                    batch, batch_emails = [], set()
+            if batch:
+                self._flush(cursor, batch)
+
+    def _flush(self, cursor, batch: list) -> None:
+        _copy_rows(cursor, self.stage, batch)
+        self.tags_seen.update(t for record in batch if record[5] for t in record[5].split(","))
+        ContactImport.objects.filter(pk=self.job.pk).update(
+            rows_read=self.job.rows_read,
+            rows_invalid=self.job.rows_invalid,
+            rows_duplicate=self.job.rows_duplicate,
+            errors=self.job.errors,
+            updated_at=timezone.now(),
+        )
+
+    def _merge(self, cursor) -> None:
+        job = self.job
+        # The merge can outlast CONTACT_IMPORT_STALE_AFTER without progress writes.
+        ContactImport.objects.filter(pk=job.pk).update(updated_at=timezone.now())
+        with transaction.atomic():
+            # Let the DISTINCT ON sort of a large stage happen in memory.
+            cursor.execute("SET LOCAL work_mem = '256MB'")
+            cursor.execute(
+                f"""
+                WITH src AS (
+                    SELECT DISTINCT ON (email) email, first_name, last_name, phone, tags
+                    FROM {self.stage}
+                    ORDER BY email, line
+                ), ins AS (
+                    INSERT INTO {Contact._meta.db_table}
+                        (id, audience_id, email, first_name, last_name, phone, status, source, tags,
+                         created_at, updated_at)
+                    SELECT gen_random_uuid(), %s, email, COALESCE(first_name, ''), COALESCE(last_name, ''),
+                           COALESCE(phone, ''), %s, %s,
+                           COALESCE(string_to_array(tags, ','), '{{}}')::varchar(64)[], now(), now()
+                    FROM src
+                    ON CONFLICT (lower(email), audience_id) WHERE status <> %s DO NOTHING
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM src), (SELECT count(*) FROM ins)
+                """,
+                [job.audience_id, ContactStatus.ACTIVE, ContactSource.CSV, ContactStatus.ARCHIVED],
+            )
+            distinct, inserted = cursor.fetchone()
+            if self.tags_seen:
+                ContactService.get_or_create_tags(job.user, sorted(self.tags_seen))
+            audience_counters.adjust(job.user_id, {job.audience_id: inserted})
+            transaction.on_commit(lambda: contacts_cache.invalidate(job.user_id))
+
+            staged = job.rows_read - job.rows_invalid - job.rows_duplicate
+            job.rows_duplicate += staged - distinct
+            job.rows_existing = distinct - inserted
+            job.rows_imported = inserted
+            job.status, job.finished_at = ImportStatus.COMPLETED, timezone.now()
+            job.save()
+
+
+def run_import(import_id) -> ContactImport:
+    """
+    Claim the job and import it. The claim is one conditional UPDATE, so
+    of several deliveries of the task only one runs the import. A RUNNING
+    job whose progress has not moved for CONTACT_IMPORT_STALE_AFTER
+    seconds lost its worker and is claimed again from the start: the
+    stage was a temp table and the merge never committed.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.CONTACT_IMPORT_STALE_AFTER)
+    claimed = ContactImport.objects.filter(
+        Q(status=ImportStatus.PENDING) | Q(status=ImportStatus.RUNNING, updated_at__lt=stale),
+        pk=import_id,
+    ).update(
+        status=ImportStatus.RUNNING, started_at=now, updated_at=now, errors=[],
+        rows_read=0, rows_invalid=0, rows_duplicate=0, rows_existing=0, rows_imported=0,
+    )
+    job = ContactImport.objects.select_related("user").get(pk=import_id)
+    if not claimed:
+        # running in another delivery of the task, or finished
+        return job
+    return ContactImporter(job).run()
+
+
+def stale_imports():
+    """
+    Ids of imports that went quiet: RUNNING ones whose worker stopped
+    reporting progress, and PENDING ones whose enqueue never reached a
+    worker.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.CONTACT_IMPORT_STALE_AFTER)
+    return ContactImport.objects.filter(
+        status__in=[ImportStatus.PENDING, ImportStatus.RUNNING], updated_at__lt=stale,
+    ).values_list("id", flat=True)
@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from contacts.services import import_service
+
+
+@shared_task(queue="imports", ignore_result=True)
+def import_contacts(import_id) -> None:
+    """Stream an uploaded CSV into its audience; progress is kept on the ContactImport."""
+    import_service.run_import(import_id)
+
+
+@shared_task(queue="imports", ignore_result=True)
+def requeue_stale_imports() -> None:
+    """Hand imports whose worker died or whose enqueue was lost back to the queue; run_import claims each once."""
+    for import_id in import_service.stale_imports():
+        import_contacts.apply_async(args=[str(import_id)])
@@ -1,9 +1,10 @@
 from rest_framework.routers import DefaultRouter
-from .views import ContactViewSet
+from .views import ContactImportViewSet, ContactViewSet
 
 app_name = "contacts"
 
 
 router = DefaultRouter()
 router.register(r"contacts", ContactViewSet, basename="contact")
+router.register(r"contact-imports", ContactImportViewSet, basename="contact-import")
 urlpatterns = router.urls
\ No newline at end of file
@@ -1,26 +1,36 @@
+import re
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.db import transaction
 from django.db.models import Q
+from contacts.services import bulk_service, export_service
 from contacts.services.contact_service import ContactService
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from .filters import ContactFilter
+from .filters import ContactFilter, ContactSearchFilter
+from core.renderers import CSVRenderer, NDJSONRenderer
 
-from .models import Contact
-from .serializers import ContactSerializer
+from .models import Contact, ContactImport
+from .serializers import ContactImportSerializer, ContactSerializer
+from .tasks import import_contacts
 from contacts.cache_utils import invalidate
+from audience.services import counters as audience_counters
 
 
 
 class ContactViewSet(viewsets.ModelViewSet):
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
+    filter_backends = [ContactSearchFilter, OrderingFilter, DjangoFilterBackend]
     filterset_class = ContactFilter
-    search_fields = ["email", "first_name", "last_name", "phone"]
+    search_fields = ["email", "first_name", "last_name", "phone"]  # indexed as Contact.search_vector
     ordering_fields = ["created_at", "updated_at", "email", "first_name", "last_name"]
     ordering = ["-created_at"]
 
@@ -28,28 +38,90 @@ class ContactViewSet(viewsets.ModelViewSet):
         return Contact.objects.filter(audience__user=self.request.user).select_related('audience').all()
     
     def list(self, request, *args, **kwargs):
-        params = set(request.query_params.keys())
-        if params - {"page"}:
-            invalidate(self.request.user.id)
-
-        queryset = self.filter_queryset(self.get_queryset())
         service = ContactService(request.user)
-        data = service.get_contacts(queryset, search=request.query_params.get("search"))
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        data = service.list_page(request, lambda: super(ContactViewSet, self).list(request, *args, **kwargs).data)
+        return Response(data)
     
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        """
+        POST {"contacts": [...]} creates, PATCH {"contacts": [{"id": ..., ...}]}
+        updates. Valid items are written, invalid ones reported per index.
+        """
+        items = request.data.get("contacts") if isinstance(request.data, dict) else None
+        if request.method == "POST":
+            return Response(bulk_service.create_contacts(request.user, items))
+        return Response(bulk_service.update_contacts(request.user, items))
+
+    @action(detail=False, methods=["post"], url_path="bulk/archive")
+    def bulk_archive(self, request):
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        return Response(bulk_service.archive_contacts(request.user, ids))
+
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every contact matching the list filters as CSV (default)
+        or NDJSON; gzip-compressed when the client accepts it.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = export_service.export_rows(queryset)
+        if request.accepted_renderer.format == "ndjson":
+            chunks = export_service.ndjson_chunks(rows)
+        else:
+            chunks = export_service.csv_chunks(rows)
+
+        gzip = settings.CONTACTS_EXPORT_GZIP and bool(
+            re.search(r"\bgzip\b", request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        )
+        response = StreamingHttpResponse(
+            export_service.encode(chunks, gzip=gzip),
+            content_type=f"{request.accepted_renderer.media_type}; charset=utf-8",
+        )
+        filename = f"contacts-{timezone.now():%Y%m%d-%H%M%S}.{request.accepted_renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Vary"] = "Accept, Accept-Encoding"
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        return response
+
+    @transaction.atomic
     def perform_destroy(self, instance):
-        obj = instance.archive()
+        old_status = instance.status
+        instance.archive()
+        audience_counters.contact_moved(self.request.user.id, instance.audience_id, old_status, instance)
         invalidate(self.request.user.id)
 
     def perform_create(self, serializer):
         obj = serializer.save()
         invalidate(self.request.user.id)
 
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate(self.request.user.id)
+
     
     
+
+
+class ContactImportViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    POST a CSV (multipart: file, audience, optional tags) to start an
+    import; GET the job to follow its progress.
+    """
+    serializer_class = ContactImportSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def get_queryset(self):
+        return ContactImport.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    def perform_create(self, serializer):
+        job = serializer.save()
+        transaction.on_commit(lambda: import_contacts.apply_async(args=[str(job.id)]))
@@ -2,6 +2,7 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Buffered tracking hits (/t/*) are answered before Django, see tracking.asgi.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +14,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from tracking.asgi import fast_view, serve  # noqa: E402
+
+
+async def application(scope, receive, send):
+    view = fast_view(scope)
+    if view is not None:
+        return await serve(view, scope, send)
+    return await django_application(scope, receive, send)
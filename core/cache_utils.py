@@ -0,0 +1,70 @@
+import hashlib
+import pickle
+import time
+
+from django.core.cache import cache
+
+
+class VersionedCache:
+    """
+    Per-user cache namespace. Entry keys embed the user's current version,
+    so invalidating is a single INCR: old entries are never read again and
+    expire on their TTL instead of being deleted one by one.
+    """
+
+    def __init__(self, prefix: str, ttl: int, max_bytes: int):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def version_key(self, user_id) -> str:
+        return f"{self.prefix}:ver:{user_id}"
+
+    def version(self, user_id) -> int:
+        key = self.version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so an evicted counter cannot restart at a
+            # value whose entries are still alive.
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    def bump(self, user_id) -> None:
+        try:
+            cache.incr(self.version_key(user_id))
+        except ValueError:
+            cache.set(self.version_key(user_id), time.time_ns(), timeout=None)
+
+    def entry_key(self, user_id, fingerprint: str) -> str:
+        """
+        Key for one entry under the user's current version. Take it once,
+        before building the data, and use it for both get and set: a
+        write that bumps the version mid-build then leaves the entry
+        under the old version, where it is never read.
+        """
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()
+        return f"{self.prefix}:{user_id}:{self.version(user_id)}:{digest}"
+
+    def get(self, key: str):
+        return cache.get(key)
+
+    def set(self, key: str, data) -> bool:
+        """Store `data` unless it is larger than `max_bytes` pickled."""
+        if len(pickle.dumps(data, pickle.HIGHEST_PROTOCOL)) > self.max_bytes:
+            return False
+        cache.set(key, data, timeout=self.ttl)
+        return True
+
+
+def query_fingerprint(query_params, *extra) -> str:
+    """
+    Order-independent representation of a request's query string: keys
+    sorted, repeated values trimmed and sorted. Keys are kept even when
+    empty, since a bare flag such as ``?cursor`` changes the response.
+    """
+    parts = [str(e) for e in extra]
+    for key in sorted(query_params.keys()):
+        values = sorted(v.strip() for v in query_params.getlist(key))
+        parts.append(f"{key}={','.join(values)}")
+    return "&".join(parts)
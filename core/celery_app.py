@@ -12,4 +12,6 @@ from kombu import Queue, Exchange
 app.conf.task_queues = (
     Queue("dispatch", Exchange("dispatch"), routing_key="dispatch"),
     Queue("send", Exchange("send"), routing_key="send"),
+    Queue("tracking", Exchange("tracking"), routing_key="tracking"),
+    Queue("imports", Exchange("imports"), routing_key="imports"),
 )
@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+USAGE_SQL = """
+SELECT coalesce(nullif(application_name, ''), '(unnamed)') AS app,
+       count(*),
+       count(*) FILTER (WHERE state = 'active'),
+       count(*) FILTER (WHERE state = 'idle'),
+       count(*) FILTER (WHERE state IN ('idle in transaction', 'idle in transaction (aborted)'))
+FROM pg_stat_activity
+WHERE datname = current_database() AND backend_type = 'client backend'
+GROUP BY 1
+ORDER BY 2 DESC, 1
+"""
+
+
+def connection_usage():
+    """
+    (max_connections, rows) where rows are (application_name, total,
+    active, idle, idle_in_transaction) for this database.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW max_connections")
+        max_connections = int(cursor.fetchone()[0])
+        cursor.execute(USAGE_SQL)
+        return max_connections, cursor.fetchall()
+
+
+class Command(BaseCommand):
+    help = (
+        "Postgres connections in use per process type (DB_APPLICATION_NAME), "
+        "for sizing DB_POOL_MAX_SIZE and worker concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--watch", type=float, default=0, help="Repeat every N seconds")
+
+    def handle(self, *args, **options):
+        pool = settings.DATABASES["default"]["OPTIONS"].get("pool")
+        if pool:
+            self.stdout.write(f"this process type: pool min={pool['min_size']} max={pool['max_size']}")
+        else:
+            self.stdout.write(f"this process type: no pool, CONN_MAX_AGE={settings.DATABASES['default']['CONN_MAX_AGE']}")
+
+        while True:
+            max_connections, rows = connection_usage()
+            used = sum(row[1] for row in rows)
+            self.stdout.write(f"{used}/{max_connections} connections ({used * 100 // max_connections}%)")
+            self.stdout.write(f"{'application':<28}{'total':>7}{'active':>8}{'idle':>7}{'idle_tx':>9}")
+            for app, total, active, idle, idle_tx in rows:
+                self.stdout.write(f"{app:<28}{total:>7}{active:>8}{idle:>7}{idle_tx:>9}")
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
+            self.stdout.write("")
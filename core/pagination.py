@@ -0,0 +1,187 @@
+import base64
+import binascii
+import json
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset) -> int:
+    """Planner row estimate for `queryset` (EXPLAIN, no scan)."""
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def fast_count(queryset) -> int:
+    """
+    Exact COUNT for small results, planner estimate above
+    PAGINATION_EXACT_COUNT_BELOW.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    estimate = estimate_count(queryset)
+    if estimate < settings.PAGINATION_EXACT_COUNT_BELOW:
+        return queryset.count()
+    return estimate
+
+
+class _LookaheadPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self._has_more = has_more
+
+    def has_next(self):
+        return self._has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count is an estimate. Pages are not bounded by it:
+    each page reads one extra row to know whether another page follows.
+    """
+
+    @cached_property
+    def count(self):
+        return fast_count(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            return super().validate_number(number)
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return _LookaheadPage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class ListPagination(PageNumberPagination):
+    """
+    Page numbers by default, as before. Two opt-ins for large lists:
+
+    - ``?cursor`` switches to keyset pagination on (created_at, id): each
+      page is an index range scan from the previous page's last row, so
+      page 10,000 costs the same as page 1. The ``next``/``previous``
+      links carry the cursor. Only ``ordering=created_at`` or
+      ``-created_at`` (the default) are allowed in this mode.
+    - ``?count=estimate`` reports the planner's row estimate instead of
+      running COUNT(*) (exact below PAGINATION_EXACT_COUNT_BELOW rows).
+      In cursor mode the count is omitted unless ``count=estimate`` or
+      ``count=exact`` is passed.
+    """
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    keyset_fields = ("created_at", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_mode = request.query_params.get(self.count_query_param, "")
+        if self.count_mode not in ("", "exact", "estimate"):
+            raise ValidationError({self.count_query_param: "Must be 'exact' or 'estimate'."})
+
+        self.keyset = self.cursor_query_param in request.query_params
+        if self.keyset:
+            return self.paginate_keyset(queryset, request)
+
+        if self.count_mode == "estimate":
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.next_link
+        body["previous"] = self.previous_link
+        body["results"] = data
+        return Response(body)
+
+    # Keyset mode
+
+    def _descending(self, request) -> bool:
+        ordering = request.query_params.get("ordering", "").strip()
+        if ordering in ("", "-created_at"):
+            return True
+        if ordering == "created_at":
+            return False
+        raise ValidationError({"ordering": "Cursor pagination supports only 'created_at' or '-created_at'."})
+
+    def paginate_keyset(self, queryset, request):
+        descending = self._descending(request)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        page_size = self.get_page_size(request)
+        reverse = bool(position and position["reverse"])
+
+        if self.count_mode == "exact":
+            self.count = queryset.count()
+        elif self.count_mode == "estimate":
+            self.count = fast_count(queryset)
+        else:
+            self.count = None
+
+        # Walking back (previous link) scans the other way and flips the page.
+        scan_descending = descending != reverse
+        if position:
+            created_at, pk = position["created_at"], position["id"]
+            if scan_descending:
+                queryset = queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+            else:
+                queryset = queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, id__lte=pk)
+        prefix = "-" if scan_descending else ""
+        queryset = queryset.order_by(*(f"{prefix}{f}" for f in self.keyset_fields))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else True
+        has_previous = position is not None if not reverse else has_more
+        self.next_link = self.encode_cursor(rows[-1], reverse=False) if rows and has_next else None
+        self.previous_link = self.encode_cursor(rows[0], reverse=True) if rows and has_previous else None
+        return rows
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            created_at = parse_datetime(raw["t"])
+            if created_at is None:
+                raise ValueError(raw["t"])
+            pk = uuid.UUID(str(raw["i"]))
+            return {"created_at": created_at, "id": pk, "reverse": bool(raw.get("r"))}
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        raw = {"t": obj.created_at.isoformat(), "i": str(obj.pk)}
+        if reverse:
+            raw["r"] = 1
+        token = base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
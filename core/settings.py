@@ -14,6 +14,7 @@ from pathlib import Path
 import os, datetime
 from decouple import config, Csv
 import dj_database_url
+from celery.schedules import crontab
 
 
 
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'corsheaders',
     'accounts',
@@ -51,6 +53,7 @@ INSTALLED_APPS = [
     'campaigns',
     'emails',
     'tracking',
+    'core',
     'django_extensions',
     'django_filters',
     'django_celery_beat',
@@ -85,6 +88,115 @@ CELERY_ENABLE_UTC = True
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_TASK_ACKS_LATE = True
 
+# Sending pipeline
+EMAIL_DISPATCH_CHUNK_SIZE = config("EMAIL_DISPATCH_CHUNK_SIZE", default=1000, cast=int)
+EMAIL_SEND_BATCH_SIZE = config("EMAIL_SEND_BATCH_SIZE", default=100, cast=int)
+EMAIL_SEND_RETRY_DELAY = config("EMAIL_SEND_RETRY_DELAY", default=60, cast=int)
+# Compiled Email templates kept per worker process (emails.services.render_service)
+EMAIL_RENDER_CACHE_SIZE = config("EMAIL_RENDER_CACHE_SIZE", default=256, cast=int)
+
+# "celery": send_batch tasks on the send queue; "async": batches go to a
+# Redis queue drained by `manage.py send_async` (emails.services.async_sender)
+EMAIL_SEND_ENGINE = config("EMAIL_SEND_ENGINE", default="celery")
+ASYNC_SEND_CONCURRENCY = config("ASYNC_SEND_CONCURRENCY", default=200, cast=int)
+
+# Per-process SMTP connection pool (emails.services.smtp_pool)
+SMTP_POOL_MAX_MESSAGES = config("SMTP_POOL_MAX_MESSAGES", default=500, cast=int)
+SMTP_POOL_MAX_IDLE = config("SMTP_POOL_MAX_IDLE", default=300, cast=int)  # seconds
+SMTP_POOL_HEALTHCHECK_INTERVAL = config("SMTP_POOL_HEALTHCHECK_INTERVAL", default=30, cast=int)  # seconds
+
+# Fleet-wide send throttling (emails.services.rate_limiter), Celery notation:
+# "600/m". Per-domain overrides: SEND_RATE_LIMIT_DOMAINS=gmail.com=1200/m,...
+SEND_RATE_LIMITS = {
+    "domain": {
+        "default": config("SEND_RATE_LIMIT_DOMAIN", default="600/m"),
+        **dict(
+            item.split("=", 1)
+            for item in config("SEND_RATE_LIMIT_DOMAINS", default="", cast=Csv())
+        ),
+    },
+    "sender": {"default": config("SEND_RATE_LIMIT_SENDER", default="")},
+}
+SEND_RATE_LIMIT_BURST_SECONDS = config("SEND_RATE_LIMIT_BURST_SECONDS", default=5, cast=float)
+SEND_RATE_LIMIT_DOMAIN_ALIASES = {
+    "googlemail.com": "gmail.com",
+    "hotmail.com": "outlook.com",
+    "live.com": "outlook.com",
+    "msn.com": "outlook.com",
+    "ymail.com": "yahoo.com",
+}
+
+# Absolute base for tracked links rendered outside a request (Celery workers)
+TRACKING_BASE_URL = config("TRACKING_BASE_URL", default="http://localhost:8000")
+
+# Write-behind tracking: views push hits to Redis and redirect at once;
+# flush_tracking_events (tracking queue) writes them in batches.
+TRACKING_WRITE_BEHIND = config("TRACKING_WRITE_BEHIND", default=False, cast=bool)
+TRACKING_FLUSH_INTERVAL = config("TRACKING_FLUSH_INTERVAL", default=2.0, cast=float)  # seconds
+TRACKING_FLUSH_BATCH_SIZE = config("TRACKING_FLUSH_BATCH_SIZE", default=1000, cast=int)
+TRACKING_FLUSH_MAX_BATCHES = config("TRACKING_FLUSH_MAX_BATCHES", default=50, cast=int)  # per run
+TRACKING_FLUSH_LOCK_TIMEOUT = 300  # seconds; longer than one run
+# Opens always use the buffer; repeats per recipient inside the window are dropped
+TRACKING_OPEN_DEDUPE_WINDOW = config("TRACKING_OPEN_DEDUPE_WINDOW", default=3600, cast=int)  # seconds
+# Serve /t/* with tracking.async_views; set by the ASGI serving profile.
+# Under WSGI each async view would run in its own throwaway event loop.
+TRACKING_ASYNC_VIEWS = config("TRACKING_ASYNC_VIEWS", default=False, cast=bool)
+
+# TrackEvent is partitioned by month (tracking.services.partitions).
+# Retention of 0 keeps every partition; otherwise older ones are detached,
+# or dropped with TRACKEVENT_RETENTION_DROP.
+TRACKEVENT_PARTITIONS_AHEAD = config("TRACKEVENT_PARTITIONS_AHEAD", default=3, cast=int)  # months
+TRACKEVENT_RETENTION_MONTHS = config("TRACKEVENT_RETENTION_MONTHS", default=0, cast=int)
+TRACKEVENT_RETENTION_DROP = config("TRACKEVENT_RETENTION_DROP", default=False, cast=bool)
+
+# Nightly rebuild of the per-email rollups that changed in this many days
+EMAIL_STATS_RECONCILE_DAYS = config("EMAIL_STATS_RECONCILE_DAYS", default=2, cast=int)
+# Contact and audience list pages are cached per user and query; writes bump a
+# per-user version instead of deleting keys.
+CONTACTS_CACHE_TTL = config("CONTACTS_CACHE_TTL", default=300, cast=int)  # seconds
+CONTACTS_CACHE_MAX_BYTES = config("CONTACTS_CACHE_MAX_BYTES", default=256 * 1024, cast=int)
+AUDIENCES_CACHE_TTL = config("AUDIENCES_CACHE_TTL", default=300, cast=int)  # seconds
+AUDIENCES_CACHE_MAX_BYTES = config("AUDIENCES_CACHE_MAX_BYTES", default=256 * 1024, cast=int)
+
+# CSV contact imports: rows per COPY batch, invalid rows kept on the job,
+# and the largest accepted upload
+CONTACT_IMPORT_BATCH_SIZE = config("CONTACT_IMPORT_BATCH_SIZE", default=10000, cast=int)
+CONTACT_IMPORT_MAX_ERRORS = config("CONTACT_IMPORT_MAX_ERRORS", default=100, cast=int)
+CONTACT_IMPORT_MAX_BYTES = config("CONTACT_IMPORT_MAX_BYTES", default=200 * 1024 * 1024, cast=int)
+# A RUNNING import without progress for this long lost its worker and is
+# claimed again (requeued by beat every STALE_AFTER / 2)
+CONTACT_IMPORT_STALE_AFTER = config("CONTACT_IMPORT_STALE_AFTER", default=1800, cast=int)  # seconds
+
+# Largest batch accepted by /api/contacts/bulk/
+CONTACTS_BULK_MAX_OPERATIONS = config("CONTACTS_BULK_MAX_OPERATIONS", default=5000, cast=int)
+
+# /api/contacts/export/: rows fetched per server-side cursor round trip,
+# and whether to gzip the stream for clients that accept it
+CONTACTS_EXPORT_CHUNK_SIZE = config("CONTACTS_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+CONTACTS_EXPORT_GZIP = config("CONTACTS_EXPORT_GZIP", default=True, cast=bool)
+
+# Campaign stats/timeseries responses are cached this long
+CAMPAIGN_ANALYTICS_CACHE_TTL = config("CAMPAIGN_ANALYTICS_CACHE_TTL", default=15, cast=int)  # seconds
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-tracking-events": {
+        "task": "tracking.tasks.flush_tracking_events",
+        "schedule": TRACKING_FLUSH_INTERVAL,
+    },
+    "rotate-trackevent-partitions": {
+        "task": "tracking.tasks.rotate_trackevent_partitions",
+        "schedule": 60 * 60 * 24,
+    },
+    "reconcile-email-stats": {
+        "task": "tracking.tasks.reconcile_email_stats",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "requeue-stale-imports": {
+        "task": "contacts.tasks.requeue_stale_imports",
+        "schedule": CONTACT_IMPORT_STALE_AFTER / 2,
+    },
+}
+
 
 CORS_ALLOWED_ORIGINS = [ "http://localhost:8080", "http://127.0.0.1:8080", ]
 CORS_ALLOW_CREDENTIALS = True
@@ -130,15 +242,48 @@ else:
         }
     }
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds or, with DB_POOL
+# on, pooled (psycopg_pool, per process). The pool is not fork-safe, so it
+# is off unless a process type turns it on: in docker-compose the
+# threaded/async servers pool, prefork Celery children keep one persistent
+# connection each. DB_APPLICATION_NAME tags the connections
+# so `manage.py db_connections` can report usage per process type.
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+DATABASES["default"].setdefault("OPTIONS", {})
+DATABASES["default"]["OPTIONS"]["application_name"] = config("DB_APPLICATION_NAME", default="coldreach-web")
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True  # also makes the pool ping before handing out
+if DB_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # required by pooling; close() returns to the pool
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        "timeout": config("DB_POOL_TIMEOUT", default=10.0, cast=float),  # seconds to wait for a connection
+        "max_idle": config("DB_POOL_MAX_IDLE", default=300.0, cast=float),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = config("DB_CONN_MAX_AGE", default=300, cast=int)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'accounts.authentication.JWTAuthentication',
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "PAGE_SIZE": 8
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.ListPagination",
+    "PAGE_SIZE": 8,
+    # Reverse proxies in front of the app that append to X-Forwarded-For.
+    # Throttles trust only the address the last of them saw; with 0 they
+    # use REMOTE_ADDR and ignore the client-supplied header.
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": config("LOGIN_RATE_PER_IP", default="30/min"),
+        "login_username": config("LOGIN_RATE_PER_USERNAME", default="10/min"),
+    },
 }
 
+# ?count=estimate runs an exact COUNT only when the planner expects
+# fewer rows than this
+PAGINATION_EXACT_COUNT_BELOW = config("PAGINATION_EXACT_COUNT_BELOW", default=10000, cast=int)
+
 
 
 # Password validation
@@ -159,13 +304,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
-PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+# The first hasher hashes new passwords; the rest are still accepted and
+# upgraded to the first on the next successful login.
+PASSWORD_HASHERS = config(
+    "PASSWORD_HASHERS",
+    default="django.contrib.auth.hashers.PBKDF2PasswordHasher,"
+            "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher,"
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+    cast=Csv(),
+)
+# Login hashing runs in a per-process pool of this many threads; callers
+# wait at most PASSWORD_HASH_WAIT seconds for a slot, then get a 503.
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+PASSWORD_HASH_WAIT = config("PASSWORD_HASH_WAIT", default=2.0, cast=float)
 
 JWT_SECRET = config('JWT_SECRET')
 JWT_REFRESH_SECRET = config('JWT_REFRESH_SECRET')
 JWT_ALGORITHM = config('JWT_ALGORITHM')
 JWT_EXP_DELTA = datetime.timedelta(minutes=15)
 JWT_REFRESH_EXP_DELTA = datetime.timedelta(days=7)
+# Authenticated users are cached per process (LRU) and in Redis, keyed by
+# a per-user auth version bumped on every save/delete of the user.
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=60, cast=int)  # seconds
+AUTH_USER_CACHE_SIZE = config("AUTH_USER_CACHE_SIZE", default=1024, cast=int)
+# Authenticate from the token claims alone: request.user.id needs no lookup
+# and the User row loads only when another attribute is read. Deactivation
+# and deletion then take effect when the access token expires.
+JWT_CLAIMS_PRINCIPAL = config("JWT_CLAIMS_PRINCIPAL", default=False, cast=bool)
 
 
 # Internationalization
@@ -185,6 +350,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (contact import CSVs); every service mounts the project dir
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,20 @@
+from django.core.cache import cache
+
+
+KEY_PREFIX = "email_dispatch"
+
+# A checkpoint only matters while a dispatch is in flight; a week covers
+# any realistic worker outage without leaking keys forever.
+CHECKPOINT_TTL = 60 * 60 * 24 * 7
+
+def checkpoint_key(email_id) -> str:
+    return f"{KEY_PREFIX}:checkpoint:{email_id}"
+
+def get_checkpoint(email_id):
+    return cache.get(checkpoint_key(email_id))
+
+def set_checkpoint(email_id, contact_id):
+    cache.set(checkpoint_key(email_id), str(contact_id), timeout=CHECKPOINT_TTL)
+
+def clear_checkpoint(email_id):
+    cache.delete(checkpoint_key(email_id))
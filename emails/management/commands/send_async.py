@@ -0,0 +1,54 @@
+import asyncio
+import signal
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from emails.services.async_sender import AsyncSendEngine, AsyncSMTPSender
+from emails.services.send_queue import async_redis_client, queue
+
+
+class Command(BaseCommand):
+    help = "Send queued recipient batches over many concurrent SMTP sessions from one asyncio process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=settings.ASYNC_SEND_CONCURRENCY,
+            help=f"Concurrent SMTP sessions (default: {settings.ASYNC_SEND_CONCURRENCY})",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None,
+            help="Recipient batches in flight (default: enough to keep every session busy)",
+        )
+        parser.add_argument(
+            "--consumer", type=str, default=socket.gethostname(),
+            help="Stable consumer name; unacked batches of this name are recovered on start (default: hostname)",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        max_batches = options["max_batches"] or max(2, 2 * concurrency // settings.EMAIL_SEND_BATCH_SIZE)
+        self.stdout.write(
+            f"Async sender '{options['consumer']}': {concurrency} sessions, {max_batches} batches in flight"
+        )
+        asyncio.run(self._run(concurrency, max_batches, options["consumer"]))
+        self.stdout.write(self.style.SUCCESS("Async sender stopped."))
+
+    async def _run(self, concurrency, max_batches, consumer):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        redis = async_redis_client()
+        sender = AsyncSMTPSender(concurrency)
+        engine = AsyncSendEngine(sender, redis, consumer=consumer, queue=queue, max_batches=max_batches)
+        try:
+            await engine.run(stop)
+        finally:
+            await redis.aclose()
+        self.stdout.write(
+            f"connections opened: {sender.stats['connections_opened']}, "
+            f"messages sent: {sender.stats['messages_sent']}"
+        )
@@ -3,6 +3,7 @@ from django.utils import timezone
 from emails.models import Email, EmailStatus
 from campaigns.models import Campaign
 from audience.models import Audience
+from tracking.services import stats as email_stats
 
 class EmailSerializer(serializers.ModelSerializer):
     # Client must NOT send campaign in body; it comes from URL.
@@ -28,9 +29,15 @@ class EmailSerializer(serializers.ModelSerializer):
             "scheduled_at",
             "created_at",
             "updated_at",
+            "stats",
         ]
         read_only_fields = ["id", "status", "created_at", "updated_at"]
 
+    stats = serializers.SerializerMethodField()
+
+    def get_stats(self, obj):
+        return email_stats.for_email(obj)
+
     def validate(self, attrs):
         scheduled_at = attrs.get("scheduled_at")
         if scheduled_at and scheduled_at < timezone.now():
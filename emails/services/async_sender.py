@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from typing import List, Tuple
+
+import aiosmtplib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from tracking.models import EmailRecipient, RecipientStatus
+from tracking.services import events as tracking_events
+
+from .rate_limiter import group_deferred, limiter as rate_limiter
+from .send_queue import SendQueue
+from .send_service import build_message
+
+logger = logging.getLogger(__name__)
+
+DISCONNECTED_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError)
+
+
+class AsyncSMTPSender:
+    """
+    Drives `concurrency` SMTP sessions from one event loop.
+    Each session is a worker coroutine that owns one aiosmtplib
+    connection, reuses it across messages, rotates it at
+    SMTP_POOL_MAX_MESSAGES and reconnects once if the server drops it.
+    """
+
+    def __init__(self, concurrency: int, **smtp_kwargs):
+        self.concurrency = concurrency
+        self.smtp_kwargs = smtp_kwargs or self._settings_kwargs()
+        self.stats = {"connections_opened": 0, "messages_sent": 0, "reconnects": 0}
+        self._jobs: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        self._workers: List[asyncio.Task] = []
+
+    @staticmethod
+    def _settings_kwargs() -> dict:
+        # Mirrors how Django's SMTP backend reads the same settings.
+        return {
+            "hostname": settings.EMAIL_HOST,
+            "port": int(settings.EMAIL_PORT),
+            "username": settings.EMAIL_HOST_USER or None,
+            "password": settings.EMAIL_HOST_PASSWORD or None,
+            "start_tls": bool(settings.EMAIL_USE_TLS),
+            "use_tls": bool(getattr(settings, "EMAIL_USE_SSL", False)),
+        }
+
+    async def start(self) -> None:
+        self._workers = [asyncio.create_task(self._session()) for _ in range(self.concurrency)]
+
+    async def close(self) -> None:
+        for _ in self._workers:
+            await self._jobs.put(None)
+        await asyncio.gather(*self._workers)
+
+    async def send(self, message) -> asyncio.Future:
+        """
+        Queue a Django EmailMessage; the returned future resolves to
+        RecipientStatus.SENT / BOUNCED or raises the SMTP error.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._jobs.put((message, future))
+        return future
+
+    async def _connect(self):
+        smtp = aiosmtplib.SMTP(**self.smtp_kwargs)
+        await smtp.connect()
+        self.stats["connections_opened"] += 1
+        return smtp
+
+    async def _session(self) -> None:
+        smtp, sent_on_connection = None, 0
+        while True:
+            job = await self._jobs.get()
+            if job is None:
+                break
+            message, future = job
+            try:
+                if smtp is None or sent_on_connection >= settings.SMTP_POOL_MAX_MESSAGES:
+                    await _quit_quietly(smtp)
+                    smtp, sent_on_connection = await self._connect(), 0
+                try:
+                    await self._deliver(smtp, message)
+                except DISCONNECTED_ERRORS:
+                    self.stats["reconnects"] += 1
+                    smtp.close()  # release the dropped session's transport first
+                    smtp, sent_on_connection = await self._connect(), 0
+                    await self._deliver(smtp, message)
+            except aiosmtplib.SMTPRecipientsRefused:
+                future.set_result(RecipientStatus.BOUNCED)
+            except Exception as e:
+                await _quit_quietly(smtp)
+                smtp = None
+                future.set_exception(e)
+            else:
+                sent_on_connection += 1
+                self.stats["messages_sent"] += 1
+                future.set_result(RecipientStatus.SENT)
+        await _quit_quietly(smtp)
+
+    @staticmethod
+    async def _deliver(smtp, message) -> None:
+        await smtp.send_message(message.message(), sender=message.from_email, recipients=message.recipients())
+
+
+async def _quit_quietly(smtp) -> None:
+    if smtp is None:
+        return
+    try:
+        await smtp.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        smtp.close()
+
+
+class AsyncSendEngine:
+    """
+    Consumes recipient batches from a SendQueue and sends them through an
+    AsyncSMTPSender. Outcomes are buffered and written back with one
+    apply_send_results per flush; a batch is acked only after its flush.
+    """
+
+    def __init__(self, sender: AsyncSMTPSender, redis, *, consumer: str,
+                 queue: SendQueue, max_batches: int, flush_interval: float = 1.0):
+        self.sender = sender
+        self.redis = redis
+        self.consumer = consumer
+        self.queue = queue
+        self.flush_interval = flush_interval
+        self._batch_slots = asyncio.Semaphore(max_batches)
+        self._in_flight: set = set()
+        self._done: List[Tuple[bytes, List[EmailRecipient]]] = []
+
+    async def run(self, stop: asyncio.Event) -> None:
+        recovered = await self.queue.recover(self.redis, self.consumer)
+        if recovered:
+            logger.info("async sender %s requeued %d unacked batches", self.consumer, recovered)
+        await self.sender.start()
+        housekeeping = asyncio.create_task(self._housekeeping(stop))
+        try:
+            while not stop.is_set():
+                await self._batch_slots.acquire()
+                item = await self.queue.take(self.redis, self.consumer, timeout=1)
+                if item is None:
+                    self._batch_slots.release()
+                    continue
+                task = asyncio.create_task(self._process(*item))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            await asyncio.gather(*self._in_flight)
+        finally:
+            await housekeeping
+            await self._flush()
+            await self.sender.close()
+
+    async def _process(self, raw: bytes, recipient_ids: List[str]) -> None:
+        handed_off: set = set()
+        try:
+            recipients = [
+                r async for r in EmailRecipient.objects
+                .filter(id__in=recipient_ids, status=RecipientStatus.QUEUED)
+                .select_related("email", "contact")
+                .defer("contact__search_vector")
+            ]
+            waits = await sync_to_async(rate_limiter.acquire_many)(
+                [(r.contact.email, r.email.from_email) for r in recipients]
+            )
+            for countdown, ids in group_deferred(
+                {str(r.id): wait for r, wait in zip(recipients, waits) if wait > 0}
+            ).items():
+                await self.queue.apush_later(self.redis, ids, countdown)
+                handed_off.update(ids)
+            recipients = [r for r, wait in zip(recipients, waits) if wait == 0]
+
+            messages = [build_message(r.email, r.contact, str(r.id)) for r in recipients]
+            futures = [await self.sender.send(msg) for msg in messages]
+            outcomes = await asyncio.gather(*futures, return_exceptions=True)
+
+            done, failed = [], []
+            for recipient, msg, outcome in zip(recipients, messages, outcomes):
+                if isinstance(outcome, Exception):
+                    failed.append(str(recipient.id))
+                    continue
+                recipient.status = outcome
+                if outcome == RecipientStatus.SENT:
+                    recipient.provider_message_id = msg.extra_headers["Message-ID"]
+                done.append(recipient)
+            if failed:
+                logger.warning("async sender %s: %d sends failed, retrying later", self.consumer, len(failed))
+                await self.queue.apush_later(self.redis, failed, settings.EMAIL_SEND_RETRY_DELAY)
+            self._done.append((raw, done))
+        except Exception:
+            logger.exception("async sender %s: batch failed, retrying later", self.consumer)
+            await self._retry_later(raw, [i for i in recipient_ids if i not in handed_off])
+        finally:
+            self._batch_slots.release()
+
+    async def _retry_later(self, raw: bytes, recipient_ids: List[str]) -> None:
+        """Move a failed batch (minus ids already deferred) to the delayed queue."""
+        try:
+            if recipient_ids:
+                await self.queue.apush_later(self.redis, recipient_ids, settings.EMAIL_SEND_RETRY_DELAY)
+            await self.queue.ack(self.redis, self.consumer, raw)
+        except Exception:
+            logger.exception("async sender %s: could not requeue batch, left for recovery", self.consumer)
+
+    async def _housekeeping(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+            await self.queue.promote_due(self.redis)
+
+    async def _flush(self) -> None:
+        pending, self._done = self._done, []
+        if not pending:
+            return
+        rows = [r for _, done in pending for r in done]
+        try:
+            await sync_to_async(close_old_connections)()
+            await sync_to_async(tracking_events.apply_send_results)(rows)
+        except Exception:
+            # Keep the outcomes; the next flush retries them.
+            logger.exception("async sender %s: status flush failed", self.consumer)
+            self._done = pending + self._done
+            return
+        for raw, _ in pending:
+            await self.queue.ack(self.redis, self.consumer, raw)
@@ -0,0 +1,125 @@
+import logging
+import time
+from typing import Callable, Iterator, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from contacts.models import Contact, ContactStatus
+from emails.cache_utils import clear_checkpoint, get_checkpoint, set_checkpoint
+from emails.models import Email, EmailStatus
+from tracking.models import EmailRecipient, RecipientStatus
+from tracking.services import stats
+
+logger = logging.getLogger(__name__)
+
+# Recipients of the parent email in these states must not get follow-ups.
+FOLLOWUP_EXCLUDED_STATUSES = (
+    RecipientStatus.BOUNCED,
+    RecipientStatus.COMPLAINED,
+    RecipientStatus.UNSUBSCRIBED,
+)
+
+NOT_DISPATCHABLE = (EmailStatus.COMPLETED, EmailStatus.CANCELLED)
+
+
+def eligible_contacts(email: Email):
+    """
+    Contacts that should receive `email`: active contacts of its audience,
+    narrowed to the parent's reachable recipients for follow-ups.
+    """
+    qs = Contact.objects.filter(audience_id=email.audience_id, status=ContactStatus.ACTIVE)
+    if email.depends_on_id:
+        # Both conditions on the same parent recipient row; a bounce or
+        # unsubscribe recorded on another email does not count here.
+        parent = EmailRecipient.objects.filter(contact=OuterRef("pk"), email_id=email.depends_on_id)
+        qs = qs.filter(Exists(parent), ~Exists(parent.filter(status__in=FOLLOWUP_EXCLUDED_STATUSES)))
+    return qs
+
+
+def iter_contact_id_chunks(queryset, chunk_size: int, after=None) -> Iterator[List]:
+    """
+    Keyset iteration over contact ids ordered by primary key.
+    Each chunk is one indexed range query, so memory stays bounded by
+    `chunk_size` and the scan can be resumed from any id.
+    """
+    ids_qs = queryset.order_by("id").values_list("id", flat=True)
+    while True:
+        page = ids_qs.filter(id__gt=after) if after else ids_qs
+        ids = list(page[:chunk_size])
+        if not ids:
+            return
+        yield ids
+        after = ids[-1]
+
+
+def materialize_recipients(email_id, contact_ids, *, only_new: bool = False) -> List:
+    """
+    Insert EmailRecipient rows for a chunk (skipping existing pairs),
+    count the new ones as queued in the email's rollup, and return ids of
+    the chunk's recipients that are still waiting to be sent, or with
+    `only_new` just the ids of the rows this call inserted.
+    """
+    rows = [EmailRecipient(email_id=email_id, contact_id=cid) for cid in contact_ids]
+    with transaction.atomic():
+        EmailRecipient.objects.bulk_create(rows, ignore_conflicts=True)
+        # Ids are generated client-side, so skipped rows' ids are not in the table.
+        created = list(EmailRecipient.objects.filter(id__in=[r.id for r in rows]).values_list("id", flat=True))
+        delta = stats.StatsDelta()
+        delta.created(email_id, RecipientStatus.QUEUED, len(created))
+        delta.apply()
+    if only_new:
+        return created
+    return list(
+        EmailRecipient.objects.filter(
+            email_id=email_id,
+            contact_id__in=contact_ids,
+            status=RecipientStatus.QUEUED,
+        ).values_list("id", flat=True)
+    )
+
+
+def dispatch_email(email_id, *, enqueue: Callable[[List], None], chunk_size: int | None = None) -> int:
+    """
+    Fan an email out to its audience.
+    - Streams eligible contacts in keyset chunks
+    - Bulk-creates EmailRecipient rows per chunk (conflicts skipped)
+    - Hands each chunk's queued recipient ids to `enqueue` (only newly
+      created ones when the email is already SENDING)
+    - Stores a checkpoint after every chunk so a crashed run resumes there
+    Returns the number of recipients enqueued by this run.
+    """
+    chunk_size = chunk_size or settings.EMAIL_DISPATCH_CHUNK_SIZE
+    email = Email.objects.get(pk=email_id)
+    if email.status in NOT_DISPATCHABLE or not email.audience_id:
+        return 0
+
+    # A finished fan-out already handed its queued recipients to the
+    # senders, which may hold them right now; re-enqueuing those would
+    # send twice. A re-dispatch only hands over recipients it creates.
+    only_new = email.status == EmailStatus.SENDING
+    Email.objects.filter(pk=email.pk).update(status=EmailStatus.QUEUING)
+
+    after = get_checkpoint(email.pk)
+    if after:
+        logger.info("dispatch email=%s resuming after contact=%s", email.pk, after)
+
+    total = 0
+    for n, contact_ids in enumerate(
+        iter_contact_id_chunks(eligible_contacts(email), chunk_size, after=after), start=1
+    ):
+        started = time.perf_counter()
+        recipient_ids = materialize_recipients(email.pk, contact_ids, only_new=only_new)
+        if recipient_ids:
+            enqueue(recipient_ids)
+        set_checkpoint(email.pk, contact_ids[-1])
+        total += len(recipient_ids)
+        logger.info(
+            "dispatch email=%s chunk=%d contacts=%d enqueued=%d took=%.3fs",
+            email.pk, n, len(contact_ids), len(recipient_ids), time.perf_counter() - started,
+        )
+
+    Email.objects.filter(pk=email.pk).update(status=EmailStatus.SENDING)
+    clear_checkpoint(email.pk)
+    return total
@@ -0,0 +1,132 @@
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+KEY_PREFIX = "coldreach:send_rate"
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Takes one token from every bucket in KEYS, or none of them.
+# ARGV: rate (tokens/sec) and capacity for each key, in KEYS order.
+# Returns 0 when the tokens were taken, else milliseconds until they would be.
+TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local capacity = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, math.ceil((1 - tokens) * 1000 / rate))
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local capacity = tonumber(ARGV[i * 2])
+    redis.call('HSET', key, 'tokens', levels[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity * 1000 / rate) + 1000)
+end
+return 0
+"""
+
+
+def parse_rate(spec: str) -> float:
+    """'600/m' -> 10.0 tokens per second (same notation as Celery rate_limit)."""
+    count, _, period = spec.partition("/")
+    return float(count) / PERIODS[(period or "s")[0]]
+
+
+def provider_domain(address: str) -> str:
+    """
+    Bucket for the recipient's mailbox provider: the address domain,
+    folded through SEND_RATE_LIMIT_DOMAIN_ALIASES for domains served
+    by the same MX (googlemail.com -> gmail.com, ...).
+    """
+    domain = address.rpartition("@")[2].strip().lower()
+    return settings.SEND_RATE_LIMIT_DOMAIN_ALIASES.get(domain, domain)
+
+
+class SendRateLimiter:
+    """
+    Fleet-wide token buckets in the cache Redis, one per recipient
+    provider domain and one per sending address. A send needs a token
+    from both; a throttled send gets back how long to wait.
+    """
+
+    def __init__(self):
+        self._script = None
+
+    def _limit(self, kind: str, name: str):
+        limits = settings.SEND_RATE_LIMITS.get(kind) or {}
+        spec = limits.get(name, limits.get("default"))
+        if not spec:
+            return None
+        rate = parse_rate(spec)
+        capacity = max(1.0, rate * settings.SEND_RATE_LIMIT_BURST_SECONDS)
+        return rate, capacity
+
+    def _buckets(self, to_address: str, from_address: str) -> List[Tuple[str, float, float]]:
+        buckets = []
+        for kind, name in (("domain", provider_domain(to_address)), ("sender", from_address.lower())):
+            limit = self._limit(kind, name)
+            if limit:
+                buckets.append((f"{KEY_PREFIX}:{kind}:{name}", *limit))
+        return buckets
+
+    def acquire_many(self, sends: Iterable[Tuple[str, str]]) -> List[float]:
+        """
+        Try to take tokens for each (to_address, from_address) in order,
+        in a single Redis round trip. Returns seconds to wait per send
+        (0.0 = go ahead). Throttled sends are spaced by their position:
+        the nth one deferred on a bucket waits n - 1 more token intervals
+        than the first, so a deferred tail comes back one token at a time
+        instead of all at once.
+        """
+        sends = list(sends)
+        plans = [self._buckets(to, frm) for to, frm in sends]
+        if not any(plans):
+            return [0.0] * len(sends)
+
+        client = get_redis_connection("default")
+        if self._script is None:
+            self._script = client.register_script(TOKEN_BUCKET_LUA)
+        pipe = client.pipeline(transaction=False)
+        for buckets in plans:
+            if buckets:
+                keys = [key for key, _, _ in buckets]
+                args = [v for _, rate, capacity in buckets for v in (rate, capacity)]
+                self._script(keys=keys, args=args, client=pipe)
+        results = iter(pipe.execute())
+
+        waits = []
+        deferred = Counter()
+        for buckets in plans:
+            wait = int(next(results)) / 1000 if buckets else 0.0
+            if wait > 0:
+                wait += max(deferred[key] / rate for key, rate, _ in buckets)
+                deferred.update(key for key, _, _ in buckets)
+            waits.append(wait)
+        return waits
+
+
+def group_deferred(deferred: Dict[str, float]) -> Dict[int, List[str]]:
+    """Bucket throttled recipient ids by whole-second countdown."""
+    groups: Dict[int, List[str]] = {}
+    for recipient_id, wait in deferred.items():
+        groups.setdefault(max(1, math.ceil(wait)), []).append(recipient_id)
+    return groups
+
+
+limiter = SendRateLimiter()
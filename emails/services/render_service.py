@@ -0,0 +1,127 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.utils import DNS_NAME
+from django.utils.html import escape
+from email.utils import make_msgid
+
+from emails.models import Email
+from tracking.rewrite import RecipientLinks, TrackedLink, compile_html_links
+
+# Merge tags usable in subject and body, e.g. "Hi {{ first_name }}".
+MERGE_FIELDS = ("first_name", "last_name", "email")
+MERGE_FIELD_RE = re.compile(r"\{\{\s*(%s)\s*\}\}" % "|".join(MERGE_FIELDS))
+FIELD = "field"
+
+
+def _build_html_from_plain(plain: str) -> str:
+    # minimal safe HTML wrapping + newline → <br>
+    plain = plain or ""
+    formatted = escape(plain).replace("\n", "<br>")
+    return f"<div>{formatted}</div>"
+
+
+def _split_merge_fields(segments: list) -> Tuple:
+    """Split every literal segment further at its merge tags."""
+    out = []
+    for segment in segments:
+        if not isinstance(segment, str):
+            out.append(segment)
+            continue
+        pos = 0
+        for match in MERGE_FIELD_RE.finditer(segment):
+            out.append(segment[pos:match.start()])
+            out.append((FIELD, match.group(1)))
+            pos = match.end()
+        out.append(segment[pos:])
+    return tuple(s for s in out if s != "")
+
+
+@dataclass(frozen=True)
+class CompiledEmail:
+    """
+    An Email rendered once with the per-recipient parts left as slots.
+    Segment lists hold literal strings, TrackedLink slots and
+    (FIELD, name) merge-field slots.
+    """
+    subject: Tuple
+    text: Tuple
+    html: Tuple
+    from_email: str
+    reply_to: Optional[List[str]]
+
+    def render(self, contact, recipient_id: str, request=None) -> EmailMultiAlternatives:
+        """
+        Build the message for one contact: plain body, HTML alternative
+        with tracked links, and a pre-assigned Message-ID.
+        """
+        links = RecipientLinks(request, recipient_id)
+
+        def fill(segments, html):
+            out = []
+            for segment in segments:
+                if isinstance(segment, str):
+                    out.append(segment)
+                elif isinstance(segment, TrackedLink):
+                    out.append(links.url(segment))
+                else:
+                    value = getattr(contact, segment[1]) or ""
+                    out.append(escape(value) if html else value)
+            return "".join(out)
+
+        msg = EmailMultiAlternatives(
+            subject=fill(self.subject, False),
+            body=fill(self.text, False),
+            from_email=self.from_email,
+            to=[contact.email],
+            reply_to=self.reply_to,
+            headers={"Message-ID": make_msgid(domain=DNS_NAME)},
+        )
+        msg.attach_alternative(fill(self.html, True), "text/html")
+        return msg
+
+
+def compile_email(email: Email) -> CompiledEmail:
+    plain = email.content_text or ""
+    from_addr = email.from_email or settings.DEFAULT_FROM_EMAIL
+    return CompiledEmail(
+        subject=_split_merge_fields([email.subject or "(no subject)"]),
+        text=_split_merge_fields([plain]),
+        html=_split_merge_fields(compile_html_links(_build_html_from_plain(plain))),
+        from_email=from_addr if not email.from_name else f"{email.from_name} <{from_addr}>",
+        reply_to=[email.reply_to] if email.reply_to else None,
+    )
+
+
+_compiled: "OrderedDict[tuple, CompiledEmail]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def get_compiled(email: Email) -> CompiledEmail:
+    """
+    Per-process LRU of compiled Emails. Keyed by id + updated_at, so an
+    edit compiles a fresh entry and the stale one ages out.
+    """
+    key = (email.pk, email.updated_at)
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+
+    compiled = compile_email(email)
+    with _compiled_lock:
+        _compiled[key] = compiled
+        while len(_compiled) > settings.EMAIL_RENDER_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def clear_compiled() -> None:
+    with _compiled_lock:
+        _compiled.clear()
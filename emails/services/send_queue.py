@@ -0,0 +1,80 @@
+import json
+import time
+from typing import List
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django_redis import get_redis_connection
+
+KEY_PREFIX = "coldreach"
+
+# Moves due delayed batches to the ready list; atomic so two engines
+# never promote the same batch twice.
+PROMOTE_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, batch in ipairs(due) do
+    redis.call('ZREM', KEYS[1], batch)
+    redis.call('LPUSH', KEYS[2], batch)
+end
+return #due
+"""
+
+
+class SendQueue:
+    """
+    Redis queue of recipient-id batches consumed by the async send engine.
+
+    Producers (dispatch, throttling) push JSON batches. A consumer moves
+    each batch to its own processing list while working on it and removes
+    it only once the outcomes are persisted, so a crashed consumer's
+    batches are recovered on restart instead of lost.
+    """
+
+    def __init__(self, name: str = "send_queue"):
+        self.ready_key = f"{KEY_PREFIX}:{name}"
+        self.delayed_key = f"{KEY_PREFIX}:{name}:delayed"
+        self._processing_prefix = f"{KEY_PREFIX}:{name}:processing"
+
+    def processing_key(self, consumer: str) -> str:
+        return f"{self._processing_prefix}:{consumer}"
+
+    # -- producer side (sync: Celery tasks, services) --
+
+    def push(self, recipient_ids: List[str]) -> None:
+        get_redis_connection("default").lpush(self.ready_key, json.dumps([str(i) for i in recipient_ids]))
+
+    def push_later(self, recipient_ids: List[str], countdown: float) -> None:
+        batch = json.dumps([str(i) for i in recipient_ids])
+        get_redis_connection("default").zadd(self.delayed_key, {batch: time.time() + countdown})
+
+    # -- consumer side (redis.asyncio client) --
+
+    async def take(self, client, consumer: str, timeout: float = 1.0):
+        """Block up to `timeout` for the next batch; returns (raw, ids) or None."""
+        raw = await client.blmove(self.ready_key, self.processing_key(consumer), timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        return raw, json.loads(raw)
+
+    async def ack(self, client, consumer: str, raw) -> None:
+        await client.lrem(self.processing_key(consumer), 1, raw)
+
+    async def apush_later(self, client, recipient_ids: List[str], countdown: float) -> None:
+        await client.zadd(self.delayed_key, {json.dumps(recipient_ids): time.time() + countdown})
+
+    async def promote_due(self, client, limit: int = 100) -> int:
+        return await client.eval(PROMOTE_DUE_LUA, 2, self.delayed_key, self.ready_key, time.time(), limit)
+
+    async def recover(self, client, consumer: str) -> int:
+        """Requeue batches a previous run of `consumer` took but never acked."""
+        moved = 0
+        while await client.lmove(self.processing_key(consumer), self.ready_key, "RIGHT", "RIGHT"):
+            moved += 1
+        return moved
+
+
+def async_redis_client():
+    return aioredis.from_url(settings.CACHES["default"]["LOCATION"])
+
+
+queue = SendQueue()
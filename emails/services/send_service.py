@@ -1,16 +1,29 @@
-from typing import Dict
+import smtplib
+from typing import Callable, Dict, List
 from django.core.exceptions import ValidationError
-from django.utils import timezone
-from django.conf import settings
-from django.utils.html import escape
 from django.core.mail import EmailMultiAlternatives
 
 from emails.models import Email
 from audience.models import Audience
 from tracking.models import EmailRecipient, RecipientStatus
-from tracking.rewrite import rewrite_html_links
+from tracking.services import events as tracking_events
 
 from .email_services import PermissionDeniedError
+from .render_service import get_compiled
+from .smtp_pool import pool as smtp_pool
+from .rate_limiter import group_deferred, limiter as rate_limiter
+
+
+class SendInterrupted(Exception):
+    """
+    Raised when the SMTP session fails mid-batch.
+    Outcomes up to the failure are already persisted; `remaining_ids`
+    are still QUEUED and safe to retry.
+    """
+    def __init__(self, remaining_ids: List[str], cause: Exception):
+        super().__init__(f"{len(remaining_ids)} recipients left unsent: {cause}")
+        self.remaining_ids = remaining_ids
+        self.cause = cause
 
 
 def _assert_ownership(user_id: int, email: Email) -> None:
@@ -34,12 +47,12 @@ def _pick_test_contact(email: Email):
     return contact
 
 
-def _build_html_from_plain(plain: str) -> str:
-    # minimal safe HTML wrapping + newline → <br>
-    plain = plain or ""
-    formatted = escape(plain).replace("\n", "<br>")
-    return f"<div>{formatted}</div>"
-
+def build_message(email: Email, contact, recipient_id: str, request=None) -> EmailMultiAlternatives:
+    """
+    Render `email` for one contact from its cached compiled form: plain
+    body, HTML alternative with tracked links, and a pre-assigned Message-ID.
+    """
+    return get_compiled(email).render(contact, recipient_id, request=request)
 
 
 def send_test_email(*, request, user, email: Email) -> Dict:
@@ -54,34 +67,77 @@ def send_test_email(*, request, user, email: Email) -> Dict:
     _assert_ownership(user.id, email)
     contact = _pick_test_contact(email)
 
-    recipient, _ = EmailRecipient.objects.get_or_create(
+    recipient, created = EmailRecipient.objects.get_or_create(
         email=email,
         contact=contact,
         defaults={"status": RecipientStatus.QUEUED},
     )
 
-    plain = email.content_text or ""
-    html = _build_html_from_plain(plain)
-    html_tracked = rewrite_html_links(request, html, str(recipient.id))
-
-    from_addr = email.from_email or settings.DEFAULT_FROM_EMAIL
-    subject = email.subject or "(no subject)"
-    to_list = [contact.email]
-
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=plain,
-        from_email=from_addr if not email.from_name else f"{email.from_name} <{from_addr}>",
-        to=to_list,
-        reply_to=[email.reply_to] if email.reply_to else None,
-    )
-    msg.attach_alternative(html_tracked, "text/html")
+    msg = build_message(email, contact, str(recipient.id), request=request)
 
     # Try to send
-    msg.send(fail_silently=False)
+    with smtp_pool.connection() as connection:
+        connection.send_messages([msg])
 
-    # Update recipient status on success
+    # Update recipient status (and rollups) on success
     recipient.status = RecipientStatus.SENT
-    recipient.save(update_fields=["status", "updated_at"])
+    recipient.provider_message_id = msg.extra_headers["Message-ID"]
+    tracking_events.apply_send_results([recipient], created=created)
 
     return {"status": "sent", "to": contact.email}
+
+
+def send_recipients(recipient_ids: List[str], *, reschedule: Callable[[List[str], int], None]) -> Dict:
+    """
+    Sends a batch of queued recipients over one pooled backend connection.
+    - Loads recipients with their Email and Contact in one query
+    - Skips recipients that are no longer QUEUED (retries, duplicates)
+    - Takes per-domain/per-sender rate tokens; throttled recipients are
+      handed to `reschedule(ids, countdown_seconds)` instead of waiting
+    - Marks refused addresses BOUNCED; other SMTP errors abort the batch
+    - Persists all outcomes with one bulk update
+    Returns: {"sent": n, "bounced": n, "deferred": n} or raises SendInterrupted.
+    """
+    recipients = list(
+        EmailRecipient.objects
+        .filter(id__in=recipient_ids, status=RecipientStatus.QUEUED)
+        .select_related("email", "contact")
+        .defer("contact__search_vector")
+    )
+    if not recipients:
+        return {"sent": 0, "bounced": 0, "deferred": 0}
+
+    waits = rate_limiter.acquire_many((r.contact.email, r.email.from_email) for r in recipients)
+    deferred = {str(r.id): wait for r, wait in zip(recipients, waits) if wait > 0}
+    for countdown, ids in group_deferred(deferred).items():
+        reschedule(ids, countdown)
+    recipients = [r for r, wait in zip(recipients, waits) if wait == 0]
+
+    messages = [(r, build_message(r.email, r.contact, str(r.id))) for r in recipients]
+    done: List[EmailRecipient] = []
+    interrupted = None
+
+    with smtp_pool.connection() as connection:
+        for recipient, msg in messages:
+            # One send_messages call per message keeps the outcome per
+            # recipient; the pooled connection (and TLS session) is shared.
+            try:
+                connection.send_messages([msg])
+            except smtplib.SMTPRecipientsRefused:
+                recipient.status = RecipientStatus.BOUNCED
+            except (smtplib.SMTPException, OSError) as e:
+                interrupted = e
+                break
+            else:
+                recipient.status = RecipientStatus.SENT
+                recipient.provider_message_id = msg.extra_headers["Message-ID"]
+            done.append(recipient)
+
+    tracking_events.apply_send_results(done)
+
+    if interrupted is not None:
+        remaining = [str(r.id) for r, _ in messages[len(done):]]
+        raise SendInterrupted(remaining, interrupted)
+
+    sent = sum(1 for r in done if r.status == RecipientStatus.SENT)
+    return {"sent": sent, "bounced": len(done) - sent, "deferred": len(deferred)}
@@ -0,0 +1,189 @@
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.mail import get_connection
+from prometheus_client import Counter
+
+CONNECTIONS_OPENED = Counter(
+    "coldreach_smtp_connections_opened_total",
+    "SMTP connections opened by the per-process pool.",
+)
+MESSAGES_SENT = Counter(
+    "coldreach_smtp_messages_sent_total",
+    "Messages sent through pooled SMTP connections.",
+)
+
+# Errors that mean the session is gone and a fresh connection may succeed.
+DISCONNECTED_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+
+class PooledConnection:
+    """A Django mail backend kept open across tasks, plus its usage counters."""
+
+    def __init__(self, pool: "SMTPConnectionPool", key: Tuple, backend):
+        self.pool = pool
+        self.key = key
+        self.backend = backend
+        self.messages = 0
+        self.last_used = time.monotonic()
+        self.broken = False
+
+    def send_messages(self, email_messages) -> int:
+        """
+        Same contract as a backend's send_messages.
+        Rotates the session at the per-connection message cap and
+        reconnects once if the server dropped it. Any failure other than
+        refused recipients marks the connection broken so it is not pooled.
+        """
+        try:
+            sent = self._send(email_messages)
+        except smtplib.SMTPRecipientsRefused:
+            raise
+        except BaseException:
+            self.broken = True
+            raise
+        self.messages += sent
+        self.last_used = time.monotonic()
+        self.pool.stats["messages_sent"] += sent
+        MESSAGES_SENT.inc(sent)
+        return sent
+
+    def _send(self, email_messages) -> int:
+        if self.messages >= self.pool.max_messages:
+            self.pool._reopen(self)
+        try:
+            return self.backend.send_messages(email_messages)
+        except DISCONNECTED_ERRORS:
+            self.pool._reopen(self)
+            self.pool.stats["reconnects"] += 1
+            return self.backend.send_messages(email_messages)
+
+
+class SMTPConnectionPool:
+    """
+    Per-process pool of open mail backend connections, keyed by backend
+    and credentials. Celery prefork children each get their own pool;
+    connections inherited across fork are dropped, never shared.
+    """
+
+    def __init__(self):
+        self._idle: Dict[Tuple, List[PooledConnection]] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.stats = {"connections_opened": 0, "messages_sent": 0, "reconnects": 0}
+
+    @property
+    def max_messages(self) -> int:
+        return settings.SMTP_POOL_MAX_MESSAGES
+
+    @staticmethod
+    def _key(**kwargs) -> Tuple:
+        """Backend path + server + credentials, as get_connection() would resolve them."""
+        return (
+            kwargs.get("backend") or settings.EMAIL_BACKEND,
+            kwargs.get("host", settings.EMAIL_HOST),
+            kwargs.get("port", settings.EMAIL_PORT),
+            kwargs.get("username", settings.EMAIL_HOST_USER),
+            kwargs.get("password", settings.EMAIL_HOST_PASSWORD),
+            kwargs.get("use_tls", settings.EMAIL_USE_TLS),
+            kwargs.get("use_ssl", getattr(settings, "EMAIL_USE_SSL", False)),
+        )
+
+    def _check_pid(self) -> None:
+        if os.getpid() != self._pid:
+            # Forked: the parent's sockets are not ours to use or close.
+            self._idle = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def _open(self, key: Tuple, **kwargs) -> PooledConnection:
+        backend = get_connection(fail_silently=False, **kwargs)
+        backend.open()
+        self.stats["connections_opened"] += 1
+        CONNECTIONS_OPENED.inc()
+        return PooledConnection(self, key, backend)
+
+    def _reopen(self, conn: PooledConnection) -> None:
+        _close_quietly(conn.backend)
+        conn.backend.open()
+        conn.messages = 0
+        self.stats["connections_opened"] += 1
+        CONNECTIONS_OPENED.inc()
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        idle_for = time.monotonic() - conn.last_used
+        if idle_for > settings.SMTP_POOL_MAX_IDLE:
+            return False
+        smtp = getattr(conn.backend, "connection", None)
+        if smtp is None or not hasattr(smtp, "noop"):
+            # Non-SMTP backends (locmem, console) have nothing to probe.
+            return True
+        if idle_for < settings.SMTP_POOL_HEALTHCHECK_INTERVAL:
+            return True
+        try:
+            code, _ = smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+        return code == 250
+
+    def acquire(self, **kwargs) -> PooledConnection:
+        key = self._key(**kwargs)
+        while True:
+            with self._lock:
+                self._check_pid()
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                return self._open(key, **kwargs)
+            # Probe outside the lock: NOOP is a network round trip.
+            if self._is_healthy(conn):
+                return conn
+            _close_quietly(conn.backend)
+
+    def release(self, conn: PooledConnection) -> None:
+        if conn.broken or conn.messages >= self.max_messages:
+            _close_quietly(conn.backend)
+            return
+        with self._lock:
+            self._check_pid()
+            self._idle.setdefault(conn.key, []).append(conn)
+
+    def discard(self, conn: PooledConnection) -> None:
+        _close_quietly(conn.backend)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                _close_quietly(conn.backend)
+
+    @contextmanager
+    def connection(self, **kwargs):
+        """
+        Borrow an open connection for the duration of the block.
+        Connections that raised are closed instead of returned.
+        """
+        conn = self.acquire(**kwargs)
+        try:
+            yield conn
+        except BaseException:
+            self.discard(conn)
+            raise
+        else:
+            self.release(conn)
+
+
+def _close_quietly(backend) -> None:
+    try:
+        backend.close()
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+pool = SMTPConnectionPool()
@@ -1,4 +1,24 @@
 from celery import shared_task
+from django.conf import settings
+
+from emails.services import dispatch_service, send_service
+from emails.services.send_queue import queue as async_send_queue
+
+
+def _enqueue_send(recipient_ids) -> None:
+    size = settings.EMAIL_SEND_BATCH_SIZE
+    ids = [str(rid) for rid in recipient_ids]
+    for start in range(0, len(ids), size):
+        if settings.EMAIL_SEND_ENGINE == "async":
+            async_send_queue.push(ids[start:start + size])
+        else:
+            send_batch.apply_async(args=[ids[start:start + size]])
+
+
+def _reschedule_send(recipient_ids, countdown) -> None:
+    # Throttled recipients come back later instead of holding a worker slot.
+    send_batch.apply_async(args=[recipient_ids], countdown=countdown)
+
 
 @shared_task(bind=True, queue="dispatch")
 def dispatch_email(self, email_id: str) -> int:
@@ -7,13 +27,28 @@ def dispatch_email(self, email_id: str) -> int:
     bulk-create EmailRecipient rows in chunks,
     enqueue send tasks. Return number of recipients enqueued.
     """
-    # implement later
-    return 0
+    return dispatch_service.dispatch_email(email_id, enqueue=_enqueue_send)
+
+@shared_task(bind=True, queue="send", max_retries=5)
+def send_batch(self, recipient_ids: list[str]) -> dict:
+    """
+    Render and send many recipients over one SMTP connection,
+    then update their statuses in bulk. Retries only the unsent tail.
+    """
+    try:
+        return send_service.send_recipients(recipient_ids, reschedule=_reschedule_send)
+    except send_service.SendInterrupted as e:
+        raise self.retry(exc=e.cause, args=[e.remaining_ids], countdown=settings.EMAIL_SEND_RETRY_DELAY)
 
+# Throttling is fleet-wide in emails.services.rate_limiter; Celery's
+# rate_limit only applies per worker.
 @shared_task(bind=True, queue="send", rate_limit=None)
 def send_one(self, recipient_id: str) -> str:
     """
     Render, rewrite links, send via SMTP/SES, update recipient status.
     """
-    # implement later
+    try:
+        send_service.send_recipients([recipient_id], reschedule=_reschedule_send)
+    except send_service.SendInterrupted as e:
+        raise self.retry(exc=e.cause, countdown=settings.EMAIL_SEND_RETRY_DELAY)
     return "ok"
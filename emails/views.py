@@ -34,7 +34,7 @@ class EmailViewSet(viewsets.ModelViewSet):
         return (
             Email.objects
             .filter(campaign__user=self.request.user, campaign_id=campaign_id)
-            .select_related("campaign", "audience")
+            .select_related("campaign", "audience", "stats")
             .order_by("-created_at")
         )
 
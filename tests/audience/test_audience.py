@@ -3,6 +3,7 @@ from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from audience.models import Audience
+from audience.services import counters
 
 pytestmark = [pytest.mark.django_db, pytest.mark.auth]
 
@@ -107,3 +108,60 @@ def test_delete_archives_audience(auth_client, get_token, user, skip_if_404):
 
 
 
+
+
+def test_contacts_count_follows_contact_writes(
+    auth_client, get_token, user, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    first = client.post(AUDIENCE_URL, {"name": "First"}).data["id"]
+    second = client.post(AUDIENCE_URL, {"name": "Second"}).data["id"]
+    contacts_url = reverse("contacts:contact-list")
+    ids = [
+        client.post(contacts_url, {"email": f"n{i}@x.com", "audience": first}, format="json").data["id"]
+        for i in range(3)
+    ]
+
+    def counts():
+        return {a["name"]: a["contacts_count"] for a in client.get(AUDIENCE_URL).data["results"]}
+
+    assert counts() == {"First": 3, "Second": 0}
+    with django_assert_num_queries(0):  # cached page, cached user
+        counts()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.patch(f"{contacts_url}{ids[0]}/", {"audience": second}, format="json")
+        client.delete(f"{contacts_url}{ids[1]}/")
+    assert counts() == {"First": 1, "Second": 1}
+
+    Audience.objects.filter(pk=first).update(contacts_count=42)
+    counters.recount()
+    assert counts() == {"First": 1, "Second": 1}
+
+
+def test_unsubscribe_of_archived_contact_keeps_contacts_count(user):
+    from django.utils import timezone as tz
+    from campaigns.models import Campaign
+    from contacts.models import Contact, ContactStatus
+    from emails.models import Email
+    from tracking.models import EmailRecipient, RecipientStatus
+    from tracking.services import events
+    from tracking.services.event_buffer import TrackingEvent
+
+    aud = Audience.objects.create(user=user, name="Counted")
+    kept = Contact.objects.create(audience=aud, email="kept@x.com")
+    gone = Contact.objects.create(audience=aud, email="gone@x.com")
+    email = Email.objects.create(
+        campaign=Campaign.objects.create(user=user, name="C"), audience=aud,
+        subject="S", content_text="B", from_email="me@x.com",
+    )
+    recipients = [EmailRecipient.objects.create(email=email, contact=c) for c in (kept, gone)]
+    Contact.objects.filter(pk=gone.pk).update(status=ContactStatus.ARCHIVED)
+    counters.recount()
+
+    events.apply_events([TrackingEvent(str(r.id), RecipientStatus.UNSUBSCRIBED, tz.now()) for r in recipients])
+
+    assert Contact.all_objects.get(pk=gone.pk).status == ContactStatus.ARCHIVED
+    assert Audience.objects.get(pk=aud.pk).contacts_count == 1
+    counters.recount()
+    assert Audience.objects.get(pk=aud.pk).contacts_count == 1
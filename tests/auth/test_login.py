@@ -1,5 +1,8 @@
 from django.urls import reverse
 import pytest
+from django.contrib.auth.signals import user_login_failed
+from accounts.services import password_service
+from accounts.throttles import LoginIPThrottle, LoginUsernameThrottle
 pytestmark = [pytest.mark.django_db, pytest.mark.auth]
 
 LOGIN_URL = reverse("accounts:login")
@@ -30,3 +33,81 @@ def test_login_fail(api_client, skip_if_404):
     assert res.status_code == 403
     assert ACCESS_FIELD not in res.data
     assert res.data['detail'] == "Invalid credentials"
+
+
+def test_login_upgrades_md5_hash(api_client, user, settings):
+    assert user.password.startswith("md5$")
+    settings.PASSWORD_HASHERS = [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+
+    res = api_client.post(LOGIN_URL, {"username": user.username, "password": "pass1234"}, format="json")
+
+    assert res.status_code == 200
+    user.refresh_from_db()
+    assert user.password.startswith("pbkdf2_sha256$")
+    assert user.check_password("pass1234")
+
+
+def test_login_goes_through_authenticate(api_client, user):
+    failures = []
+
+    def on_failure(sender, credentials, **kwargs):
+        failures.append(credentials["username"])
+
+    user_login_failed.connect(on_failure)
+    try:
+        res = api_client.post(LOGIN_URL, {"username": user.username, "password": "wrong"}, format="json")
+    finally:
+        user_login_failed.disconnect(on_failure)
+
+    assert res.status_code == 403
+    assert failures == [user.username]
+
+
+def test_login_throttled_per_username(api_client, user, monkeypatch):
+    rates = {"login_ip": "100/min", "login_username": "2/min"}
+    monkeypatch.setattr(LoginIPThrottle, "THROTTLE_RATES", rates)
+    monkeypatch.setattr(LoginUsernameThrottle, "THROTTLE_RATES", rates)
+
+    for _ in range(2):
+        api_client.post(LOGIN_URL, {"username": "Tester", "password": "wrong"}, format="json")
+    res = api_client.post(LOGIN_URL, {"username": user.username, "password": "pass1234"}, format="json")
+
+    assert res.status_code == 429
+    assert "Retry-After" in res
+    other = api_client.post(LOGIN_URL, {"username": "someone-else", "password": "x"}, format="json")
+    assert other.status_code == 403
+
+
+def test_login_ip_throttle_ignores_spoofed_forwarded_for(api_client, monkeypatch):
+    rates = {"login_ip": "2/min", "login_username": "100/min"}
+    monkeypatch.setattr(LoginIPThrottle, "THROTTLE_RATES", rates)
+    monkeypatch.setattr(LoginUsernameThrottle, "THROTTLE_RATES", rates)
+
+    statuses = [
+        api_client.post(
+            LOGIN_URL, {"username": f"guess{i}", "password": "x"}, format="json",
+            HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+        ).status_code
+        for i in range(3)
+    ]
+
+    assert statuses == [403, 403, 429]
+
+
+def test_login_fails_fast_when_hash_pool_is_full(api_client, user, settings):
+    settings.PASSWORD_HASH_WAIT = 0
+    _, slots = password_service._pool()
+    taken = 0
+    while slots.acquire(blocking=False):
+        taken += 1
+    try:
+        res = api_client.post(LOGIN_URL, {"username": user.username, "password": "pass1234"}, format="json")
+    finally:
+        for _ in range(taken):
+            slots.release()
+
+    assert res.status_code == 503
+    assert res["Retry-After"] == "1"
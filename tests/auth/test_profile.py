@@ -31,3 +31,62 @@ def test_profile_requires_auth(api_client, skip_if_404):
     assert res.status_code == 200
     assert res.data['user'] == "tester"
     assert res.data['email'] == "tester@example.com"
+
+
+def test_authenticated_user_is_cached_until_the_user_changes(
+    auth_client, get_token, user, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    assert client.get(PROFILE_URL).status_code == 200
+
+    with django_assert_num_queries(0):
+        assert client.get(PROFILE_URL).data["email"] == user.email
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.email = "changed@example.com"
+        user.save()
+    assert client.get(PROFILE_URL).data["email"] == "changed@example.com"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+    assert client.get(PROFILE_URL).status_code == 403
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+    assert client.get(PROFILE_URL).status_code == 403
+
+
+def test_user_loaded_before_a_revocation_is_not_cached_under_the_new_version(user):
+    from django_redis import get_redis_connection
+    from accounts import cache_utils
+
+    def load_then_revoke():
+        loaded = type(user).objects.get(pk=user.pk)
+        cache_utils.invalidate(user.pk)  # deactivation commits meanwhile
+        type(user).objects.filter(pk=user.pk).update(is_active=False)
+        return loaded
+
+    assert cache_utils.get_user(user.pk, load_then_revoke).is_active
+    cache_utils.clear_local()
+    fresh = cache_utils.get_user(user.pk, lambda: type(user).objects.get(pk=user.pk))
+    assert fresh.is_active is False
+
+    raw = b"".join(get_redis_connection("default").get(k) or b"" for k in get_redis_connection("default").keys("*auth_user:*"))
+    assert user.password.encode() not in raw
+    assert fresh.check_password("pass1234")  # loaded on demand
+
+
+def test_claims_principal_loads_the_user_only_when_needed(
+    auth_client, get_token, user, audience, settings, django_assert_num_queries
+):
+    settings.JWT_CLAIMS_PRINCIPAL = True
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+
+    with django_assert_num_queries(2):  # count + page; no User lookup
+        resp = client.get(reverse("audience:audience-list"))
+    assert [a["id"] for a in resp.data["results"]] == [str(audience.id)]
+
+    with django_assert_num_queries(1):  # username and email in one load
+        resp = client.get(PROFILE_URL)
+    assert resp.data == {"user": user.username, "email": user.email}
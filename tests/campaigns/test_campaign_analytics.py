@@ -0,0 +1,88 @@
+from datetime import timedelta
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from audience.models import Audience
+from campaigns.cache_utils import KEY_PREFIX
+from campaigns.models import Campaign
+from emails.models import Email
+from tracking.models import EmailStats, EmailStatsHourly
+from tracking.services.stats import hour_bucket
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    cache.delete_pattern(f"{KEY_PREFIX}:*")
+    yield
+    cache.delete_pattern(f"{KEY_PREFIX}:*")
+
+
+@pytest.fixture
+def seeded(user):
+    aud = Audience.objects.create(user=user, name="Analytics Audience")
+    camp = Campaign.objects.create(user=user, name="Analytics Campaign")
+    first = Email.objects.create(campaign=camp, audience=aud, subject="First", from_email="me@example.com")
+    followup = Email.objects.create(campaign=camp, depends_on=first, subject="Bump", from_email="me@example.com")
+    EmailStats.objects.create(email=first, sent=5, opened=3, clicked=2)
+    EmailStats.objects.create(email=followup, sent=2, bounced=1)
+
+    now = hour_bucket(timezone.now())
+    EmailStatsHourly.objects.create(email=first, bucket=now, sent=10, opened=4)
+    EmailStatsHourly.objects.create(email=followup, bucket=now, sent=3, clicked=1)
+    EmailStatsHourly.objects.create(email=first, bucket=now - timedelta(hours=3), opened=2)
+    return camp, first, followup, now
+
+
+def _client(user, auth_client, get_token):
+    return auth_client(get_token(username=user.username, password="pass1234"))
+
+
+def test_stats_sum_followups_and_are_cached(seeded, user, auth_client, get_token, django_assert_num_queries):
+    camp, first, followup, _ = seeded
+    client = _client(user, auth_client, get_token)
+    url = reverse("campaigns:campaign-stats", kwargs={"pk": camp.id})
+
+    resp = client.get(url)
+
+    assert resp.status_code == 200
+    assert resp.data["totals"]["sent"] == 7
+    assert resp.data["totals"]["total"] == 13
+    assert [e["subject"] for e in resp.data["emails"]] == ["First", "Bump"]
+    assert resp.data["emails"][1]["depends_on"] == str(first.id)
+
+    EmailStats.objects.filter(email=followup).update(sent=100)
+    with django_assert_num_queries(0):  # cached stats, cached user
+        assert client.get(url).data["totals"]["sent"] == 7
+
+
+def test_hourly_timeseries_is_zero_filled(seeded, user, auth_client, get_token):
+    camp, _, _, now = seeded
+    client = _client(user, auth_client, get_token)
+    url = reverse("campaigns:campaign-timeseries", kwargs={"pk": camp.id})
+
+    resp = client.get(url, {"bucket": "hour", "since": (now - timedelta(hours=4)).isoformat()})
+
+    assert resp.status_code == 200
+    points = resp.data["points"]
+    assert len(points) == 5
+    assert points[-1]["sent"] == 13 and points[-1]["clicked"] == 1 and points[-1]["opened"] == 4
+    assert points[1]["opened"] == 2
+    assert points[0]["opened"] == points[2]["opened"] == 0
+
+    day = client.get(url, {"bucket": "day"}).data["points"]
+    assert sum(p["opened"] for p in day) == 6
+
+
+def test_analytics_validate_input_and_ownership(seeded, other_user, auth_client, get_token):
+    camp, *_ = seeded
+    client = _client(other_user, auth_client, get_token)
+    assert client.get(reverse("campaigns:campaign-stats", kwargs={"pk": camp.id})).status_code == 404
+
+    owner_url = reverse("campaigns:campaign-timeseries", kwargs={"pk": camp.id})
+    owner = auth_client(get_token(username=camp.user.username, password="pass1234"))
+    assert owner.get(owner_url, {"bucket": "minute"}).status_code == 400
+    assert owner.get(owner_url, {"since": "yesterday"}).status_code == 400
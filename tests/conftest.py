@@ -9,6 +9,24 @@ CONTACTS_URL = reverse("contacts:contact-list")
 ACCESS_FIELD = "access_token"
 
 
+@pytest.fixture(autouse=True)
+def clear_list_caches():
+    # Redis outlives the test database, whose ids restart every run.
+    from django.core.cache import cache
+    from accounts import cache_utils as auth_cache
+    from audience.cache_utils import KEY_PREFIX as AUDIENCES_PREFIX
+    from contacts.cache_utils import KEY_PREFIX as CONTACTS_PREFIX
+    for prefix in (AUDIENCES_PREFIX, CONTACTS_PREFIX, auth_cache.KEY_PREFIX):
+        cache.delete_pattern(f"{prefix}:*")
+    auth_cache.clear_local()
+    cache.delete_pattern("throttle_*")
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(settings):
+    # PBKDF2 would cost ~100 ms per user created or logged in.
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
 @pytest.fixture
 def skip_if_404():
     def _skip(resp):
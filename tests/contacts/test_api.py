@@ -192,3 +192,59 @@ def test_filter_contacts_by_tags_overlap(auth_client, audience, get_token, user)
 
 
 
+
+
+def test_list_pages_are_cached_until_a_contact_changes(auth_client, audience, get_token, user, django_assert_num_queries):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    for i in range(3):
+        client.post(CONTACTS_URL, {"email": f"c{i}@x.com", "audience": audience.id}, format="json")
+
+    first = client.get(CONTACTS_URL, {"ordering": "email", "search": "x.com"})
+    with django_assert_num_queries(0):  # cached page, cached user
+        again = client.get(CONTACTS_URL, {"search": "x.com ", "ordering": "email"})
+    assert again.data == first.data
+    assert [c["email"] for c in first.data["results"]] == ["c0@x.com", "c1@x.com", "c2@x.com"]
+
+    contact_id = first.data["results"][0]["id"]
+    client.patch(f"{CONTACTS_URL}{contact_id}/", {"first_name": "Zed"}, format="json")
+    updated = client.get(CONTACTS_URL, {"ordering": "email", "search": "x.com"})
+    assert updated.data["results"][0]["first_name"] == "Zed"
+
+    client.delete(f"{CONTACTS_URL}{contact_id}/")
+    assert client.get(CONTACTS_URL, {"ordering": "email", "search": "x.com"}).data["count"] == 2
+
+
+def test_page_built_while_a_write_lands_is_not_cached_as_current(user, rf):
+    from rest_framework.request import Request
+    from contacts import cache_utils
+    from contacts.services.contact_service import ContactService
+
+    request = Request(rf.get(CONTACTS_URL, {"ordering": "email"}))
+    service = ContactService(user)
+
+    def build_during_write():
+        cache_utils.invalidate(user.id)  # a contact write commits mid-build
+        return {"results": ["stale"]}
+
+    assert service.list_page(request, build_during_write) == {"results": ["stale"]}
+    assert service.list_page(request, lambda: {"results": ["fresh"]}) == {"results": ["fresh"]}
+
+
+def test_search_matches_word_prefixes_and_email_prefix(auth_client, audience, get_token, user):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    Contact.objects.create(audience=audience, email="Ann.Lee@Acme.io", first_name="Ann", phone="+201001234567")
+    Contact.objects.create(audience=audience, email="bob@mail.com", last_name="Annable")
+    Contact.objects.create(audience=audience, email="carl_100@acme.io", status=ContactStatus.ARCHIVED)
+
+    def emails(term):
+        resp = client.get(CONTACTS_URL, {"search": term, "ordering": "email"})
+        return [c["email"] for c in resp.data["results"]]
+
+    assert emails("ann") == ["Ann.Lee@Acme.io", "bob@mail.com"]
+    assert emails("ANN acm") == ["Ann.Lee@Acme.io"]
+    assert emails("ann.lee@ac") == ["Ann.Lee@Acme.io"]
+    assert emails("bob@") == ["bob@mail.com"]
+    assert emails("+20 100") == ["Ann.Lee@Acme.io"]
+    assert emails("carl") == []
+    assert emails("nn") == []
+    assert emails("100%@") == []
@@ -0,0 +1,86 @@
+import pytest
+from django.urls import reverse
+
+from audience.models import Audience
+from contacts.models import Contact, ContactStatus, Tag
+
+pytestmark = [pytest.mark.django_db]
+
+CONTACTS_URL = reverse("contacts:contact-list")
+BULK_URL = reverse("contacts:contact-bulk")
+BULK_ARCHIVE_URL = reverse("contacts:contact-bulk-archive")
+
+
+@pytest.fixture
+def client(auth_client, get_token, user):
+    return auth_client(get_token(username=user.username, password="pass1234"))
+
+
+def test_bulk_create_validates_as_a_set(client, audience, other_audience, django_assert_max_num_queries):
+    Contact.objects.create(audience=audience, email="taken@x.com")
+    items = [{"audience": str(audience.id), "email": f"New{i}@X.com", "tags": ["CRM"]} for i in range(50)]
+    items += [
+        {"audience": str(audience.id), "email": "taken@x.com"},
+        {"audience": str(audience.id), "email": "new0@x.com"},       # repeats item 0
+        {"audience": str(other_audience.id), "email": "a@x.com"},
+        {"audience": str(audience.id), "email": "nope"},
+    ]
+
+    # auth + audiences + uniqueness + savepoint + insert + tags (2) + count + release
+    with django_assert_max_num_queries(10):
+        resp = client.post(BULK_URL, {"contacts": items}, format="json")
+
+    assert resp.status_code == 200
+    assert (resp.data["created"], resp.data["failed"]) == (50, 4)
+    errors = {r["index"]: r["errors"] for r in resp.data["results"] if not r["ok"]}
+    assert errors[50] == {"email": ["This email already exists in this audience."]}
+    assert errors[51] == {"email": ["This email already exists in this audience."]}
+    assert errors[52] == {"audience": ["No audience found for this id."]}
+    assert "email" in errors[53]
+    assert Contact.objects.filter(audience=audience).count() == 51
+    assert Contact.objects.get(email="new0@x.com").tags == ["crm"]
+    assert Tag.objects.filter(name="crm").count() == 1
+    assert Audience.objects.get(pk=audience.pk).contacts_count == 50
+
+
+def test_bulk_update_and_archive(client, audience, user):
+    second = Audience.objects.create(user=user, name="Second")
+    created = client.post(
+        BULK_URL,
+        {"contacts": [{"audience": str(audience.id), "email": f"u{i}@x.com"} for i in range(3)]},
+        format="json",
+    ).data["results"]
+    ids = [r["id"] for r in created]
+
+    resp = client.patch(BULK_URL, {"contacts": [
+        {"id": ids[0], "first_name": "Una", "tags": ["Lead"]},
+        {"id": ids[1], "audience": str(second.id)},
+        {"id": ids[2], "email": "u0@x.com"},                  # collides with ids[0]
+        {"id": ids[0], "last_name": "Twice"},
+    ]}, format="json")
+
+    assert (resp.data["updated"], resp.data["failed"]) == (2, 2)
+    first = Contact.objects.get(pk=ids[0])
+    assert (first.first_name, first.last_name, first.tags) == ("Una", "", ["lead"])
+    assert str(Contact.objects.get(pk=ids[1]).audience_id) == str(second.id)
+
+    archived = client.post(BULK_ARCHIVE_URL, {"ids": ids[:2] + ["00000000-0000-0000-0000-000000000000"]}, format="json")
+    assert archived.data["archived"] == 2
+    assert archived.data["not_found"] == ["00000000-0000-0000-0000-000000000000"]
+    assert Contact.all_objects.filter(pk__in=ids[:2], status=ContactStatus.ARCHIVED).count() == 2
+    counts = dict(Audience.objects.filter(pk__in=[audience.pk, second.pk]).values_list("name", "contacts_count"))
+    assert counts == {audience.name: 1, "Second": 0}
+
+    again = client.post(BULK_ARCHIVE_URL, {"ids": ids[:2]}, format="json")
+    assert again.data["archived"] == 0
+    assert Audience.objects.get(pk=audience.pk).contacts_count == 1
+
+    assert client.get(CONTACTS_URL).data["count"] == 1
+
+
+def test_bulk_rejects_oversized_or_malformed_batches(client, audience, settings):
+    settings.CONTACTS_BULK_MAX_OPERATIONS = 2
+    items = [{"audience": str(audience.id), "email": f"o{i}@x.com"} for i in range(3)]
+    assert client.post(BULK_URL, {"contacts": items}, format="json").status_code == 400
+    assert client.post(BULK_URL, {"contacts": "nope"}, format="json").status_code == 400
+    assert not Contact.objects.exists()
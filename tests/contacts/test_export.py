@@ -0,0 +1,62 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from contacts.models import Contact, ContactStatus
+
+pytestmark = [pytest.mark.django_db]
+
+EXPORT_URL = reverse("contacts:contact-export")
+
+
+@pytest.fixture
+def client(auth_client, get_token, user, audience, other_audience, settings):
+    settings.CONTACTS_EXPORT_CHUNK_SIZE = 2
+    Contact.objects.create(audience=audience, email="a@x.com", first_name="Ann, Jr.", tags=["vip", "lead"])
+    Contact.objects.create(audience=audience, email="b@x.com", status=ContactStatus.UNSUBSCRIBED)
+    Contact.objects.create(audience=audience, email="c@x.com")
+    Contact.objects.create(audience=audience, email="gone@x.com", status=ContactStatus.ARCHIVED)
+    Contact.objects.create(audience=other_audience, email="theirs@x.com")
+    return auth_client(get_token(username=user.username, password="pass1234"))
+
+
+def _body(resp):
+    assert resp.streaming
+    return b"".join(resp.streaming_content)
+
+
+def test_csv_export_streams_the_filtered_list(client):
+    resp = client.get(EXPORT_URL, {"ordering": "email"})
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("text/csv")
+    assert "attachment;" in resp["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(_body(resp).decode())))
+    assert [r["email"] for r in rows] == ["a@x.com", "b@x.com", "c@x.com"]
+    assert rows[0]["first_name"] == "Ann, Jr."
+    assert rows[0]["tags"] == "vip,lead"
+
+    active = client.get(EXPORT_URL, {"status": ContactStatus.ACTIVE, "search": "c@"})
+    assert [r["email"] for r in csv.DictReader(io.StringIO(_body(active).decode()))] == ["c@x.com"]
+
+
+def test_ndjson_export_gzipped_when_accepted(client):
+    resp = client.get(EXPORT_URL, {"format": "ndjson", "ordering": "email"}, HTTP_ACCEPT_ENCODING="gzip, br")
+
+    assert resp["Content-Type"].startswith("application/x-ndjson")
+    assert resp["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(_body(resp)).decode().splitlines()
+    first = json.loads(lines[0])
+    assert len(lines) == 3
+    assert first["email"] == "a@x.com"
+    assert first["tags"] == ["vip", "lead"]
+    assert first["created_at"].startswith(first["created_at"][:10] + "T")
+
+
+def test_export_requires_auth_and_rejects_bad_filters(client):
+    assert APIClient().get(EXPORT_URL).status_code == 403
+    assert client.get(EXPORT_URL, {"status": "bogus"}).status_code == 400
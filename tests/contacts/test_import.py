@@ -0,0 +1,135 @@
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from audience.models import Audience
+from contacts.models import Contact, ContactImport, ContactSource, ContactStatus, ImportStatus, Tag
+from contacts.services import import_service
+
+pytestmark = [pytest.mark.django_db]
+
+IMPORTS_URL = reverse("contacts:contact-import-list")
+
+CSV = (
+    "Email,First Name,Last Name,Phone,Tags\n"
+    "Ann@Example.com, Ann ,Lee,+20 (100) 123-4567,VIP; Owner\n"
+    "bob@example.com,Bob,,,\n"
+    "not-an-email,X,,,\n"
+    "\n"
+    "ann@example.com,Dup,,,\n"         # same batch as the first Ann
+    "old@example.com,Old,,,\n"         # already in the audience
+    "gone@example.com,Back,,,\n"       # archived in the audience: imported again
+    "carl@example.com,Carl,,12,\n"     # bad phone
+    "bob@example.com,Bob again,,,\n"   # later batch: deduped in the merge
+)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CONTACT_IMPORT_BATCH_SIZE = 4
+
+
+def _upload(client, audience, body=CSV, **extra):
+    upload = SimpleUploadedFile("people.csv", body.encode(), content_type="text/csv")
+    return client.post(IMPORTS_URL, {"file": upload, "audience": audience.id, **extra}, format="multipart")
+
+
+def test_upload_queues_job_and_import_merges_rows(
+    auth_client, get_token, user, audience, django_capture_on_commit_callbacks
+):
+    Contact.objects.create(audience=audience, email="old@example.com")
+    Contact.objects.create(audience=audience, email="gone@example.com", status=ContactStatus.ARCHIVED)
+    Audience.objects.filter(pk=audience.pk).update(contacts_count=1)
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        resp = _upload(client, audience, tags=["Imported"])
+    assert resp.status_code == 202
+    assert resp.data["status"] == ImportStatus.PENDING
+    assert len(callbacks) == 1
+
+    job = import_service.run_import(resp.data["id"])
+
+    assert job.status == ImportStatus.COMPLETED
+    assert (job.rows_read, job.rows_invalid, job.rows_duplicate, job.rows_existing, job.rows_imported) == (8, 2, 2, 1, 3)
+    assert [e["line"] for e in job.errors] == [4, 9]
+
+    ann = Contact.objects.get(audience=audience, email="ann@example.com")
+    assert (ann.first_name, ann.phone, ann.source) == ("Ann", "+201001234567", ContactSource.CSV)
+    assert ann.tags == ["imported", "owner", "vip"]
+    assert Contact.objects.get(audience=audience, email="bob@example.com").first_name == "Bob"
+    assert Contact.all_objects.filter(audience=audience, email="gone@example.com").count() == 2
+    assert set(Tag.objects.filter(user=user).values_list("name", flat=True)) == {"imported", "owner", "vip"}
+    audience.refresh_from_db()
+    assert audience.contacts_count == 4
+
+    progress = client.get(reverse("contacts:contact-import-detail", kwargs={"pk": job.id}))
+    assert progress.data["rows_imported"] == 3
+
+
+def test_missing_email_column_fails_the_job(auth_client, get_token, user, audience):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    resp = _upload(client, audience, body="name,phone\nAnn,\n")
+
+    job = import_service.run_import(resp.data["id"])
+
+    assert job.status == ImportStatus.FAILED
+    assert job.errors[-1]["error"] == "The CSV header has no email column."
+    assert not Contact.objects.filter(audience=audience).exists()
+
+
+def test_upload_rejects_other_users_audience_and_non_csv(auth_client, get_token, user, other_audience, audience):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    assert _upload(client, other_audience).status_code == 400
+
+    upload = SimpleUploadedFile("people.xlsx", b"x")
+    resp = client.post(IMPORTS_URL, {"file": upload, "audience": audience.id}, format="multipart")
+    assert resp.status_code == 400
+    assert not ContactImport.objects.exists()
+
+
+def test_import_is_claimed_once_and_its_file_removed(auth_client, get_token, user, audience):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    job_id = _upload(client, audience).data["id"]
+    path = ContactImport.objects.get(pk=job_id).file.path
+
+    assert import_service.run_import(job_id).rows_imported == 4
+    redelivered = import_service.run_import(job_id)  # second delivery of the task
+
+    assert redelivered.status == ImportStatus.COMPLETED and redelivered.rows_imported == 4
+    assert Contact.objects.filter(audience=audience).count() == 4
+    assert not os.path.exists(path)
+    assert ContactImport.objects.get(pk=job_id).file.name == ""
+
+
+def test_running_import_is_reclaimed_only_when_stale(auth_client, get_token, user, audience, settings):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    job_id = _upload(client, audience).data["id"]
+    ContactImport.objects.filter(pk=job_id).update(status=ImportStatus.RUNNING, rows_read=3)
+
+    assert import_service.run_import(job_id).status == ImportStatus.RUNNING  # live elsewhere
+    assert list(import_service.stale_imports()) == []
+
+    stale = timezone.now() - timedelta(seconds=settings.CONTACT_IMPORT_STALE_AFTER + 1)
+    ContactImport.objects.filter(pk=job_id).update(updated_at=stale)
+    assert [str(i) for i in import_service.stale_imports()] == [job_id]
+    job = import_service.run_import(job_id)
+
+    assert job.status == ImportStatus.COMPLETED
+    assert (job.rows_read, job.rows_imported) == (8, 4)
+
+
+def test_pending_import_whose_enqueue_was_lost_is_requeued(auth_client, get_token, user, audience, settings):
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+    job_id = _upload(client, audience).data["id"]
+    assert list(import_service.stale_imports()) == []
+
+    stale = timezone.now() - timedelta(seconds=settings.CONTACT_IMPORT_STALE_AFTER + 1)
+    ContactImport.objects.filter(pk=job_id).update(updated_at=stale)
+    assert [str(i) for i in import_service.stale_imports()] == [job_id]
+    assert import_service.run_import(job_id).status == ImportStatus.COMPLETED
@@ -17,6 +17,19 @@ def test_manager_excludes_archived(audience):
     assert "c1@x.com" in visible_emails
     assert "c2@x.com" not in visible_emails
 
+def test_search_vector_is_not_loaded_with_contacts(audience):
+    from django.test.utils import CaptureQueriesContext
+
+    created = Contact.objects.create(audience=audience, email="sv@x.com", first_name="Ann")
+    assert "search_vector" in created.get_deferred_fields()
+
+    with CaptureQueriesContext(connections["default"]) as queries:
+        list(Contact.objects.all())
+        list(Contact.all_objects.all())
+    assert all("search_vector" not in q["sql"] for q in queries.captured_queries)
+    assert Contact.objects.filter(search_vector="ann").get().pk == created.pk
+
+
 def test_unique_email_per_audience_ignores_archived(audience):
     old = Contact.objects.create(audience=audience, email="dup@x.com")
     old.archive()
@@ -0,0 +1,24 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from core.management.commands.db_connections import connection_usage
+
+
+@pytest.mark.django_db
+def test_connection_usage_groups_by_application_name():
+    max_connections, rows = connection_usage()
+    apps = {row[0]: row for row in rows}
+    name = settings.DATABASES["default"]["OPTIONS"]["application_name"]
+    assert max_connections > 0
+    assert apps[name][1] >= 1 and apps[name][2] >= 1  # this connection, running the query
+
+
+@pytest.mark.django_db
+def test_db_connections_command_reports_usage():
+    out = StringIO()
+    call_command("db_connections", stdout=out)
+    assert "connections (" in out.getvalue()
+    assert settings.DATABASES["default"]["OPTIONS"]["application_name"] in out.getvalue()
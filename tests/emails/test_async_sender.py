@@ -0,0 +1,191 @@
+import asyncio
+import json
+import socket
+import uuid
+import pytest
+from aiosmtpd.controller import Controller
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from campaigns.models import Campaign
+from audience.models import Audience
+from contacts.models import Contact
+from emails.models import Email
+from emails.services.async_sender import AsyncSendEngine, AsyncSMTPSender
+from emails.services.send_queue import SendQueue, async_redis_client
+from emails.services.send_service import build_message
+from tracking.models import EmailRecipient, RecipientStatus
+
+User = get_user_model()
+
+
+class _Handler:
+    def __init__(self):
+        self.rcpts = []
+        self.peers = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.rcpts.extend(envelope.rcpt_tos)
+        self.peers.add(session.peer)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server(settings):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = _Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    settings.EMAIL_HOST, settings.EMAIL_PORT = "127.0.0.1", port
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    yield handler
+    controller.stop()
+
+
+def _seed(addresses):
+    user = User.objects.create_user(username=f"u_{uuid.uuid4().hex[:8]}", password="x")
+    aud = Audience.objects.create(user=user, name="Async Audience")
+    camp = Campaign.objects.create(user=user, name="Async Campaign")
+    email = Email.objects.create(campaign=camp, audience=aud, subject="S", content_text="B", from_email="me@example.com")
+    return email, [
+        EmailRecipient.objects.create(email=email, contact=Contact.objects.create(audience=aud, email=address))
+        for address in addresses
+    ]
+
+
+@pytest.mark.django_db
+def test_sender_multiplexes_messages_over_bounded_sessions(smtp_server):
+    email, recipients = _seed([f"r{i}@example.com" for i in range(20)])
+    messages = [build_message(email, r.contact, str(r.id)) for r in recipients]
+
+    async def _run():
+        sender = AsyncSMTPSender(concurrency=4)
+        await sender.start()
+        futures = [await sender.send(m) for m in messages]
+        outcomes = await asyncio.gather(*futures)
+        await sender.close()
+        return sender, outcomes
+
+    sender, outcomes = asyncio.run(_run())
+
+    assert outcomes == [RecipientStatus.SENT] * 20
+    assert len(smtp_server.rcpts) == 20
+    assert sender.stats["connections_opened"] <= 4
+    assert len(smtp_server.peers) <= 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_engine_drains_queue_and_writes_statuses_in_bulk(smtp_server):
+    email, recipients = _seed(["ok1@example.com", "ok2@example.com", "reject@example.com"])
+    queue = SendQueue(name=f"test_send_queue_{uuid.uuid4().hex[:8]}")
+    queue.push([str(r.id) for r in recipients])
+
+    async def _run():
+        redis = async_redis_client()
+        sender = AsyncSMTPSender(concurrency=2)
+        engine = AsyncSendEngine(sender, redis, consumer="test", queue=queue, max_batches=2, flush_interval=0.05)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(engine.run(stop))
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if not await redis.llen(queue.ready_key) and not engine._in_flight and not engine._done:
+                break
+        stop.set()
+        await runner
+        leftover = await redis.llen(queue.processing_key("test"))
+        await redis.delete(queue.ready_key, queue.delayed_key, queue.processing_key("test"))
+        await redis.aclose()
+        # The flushes ran in sync_to_async's thread; close its DB connection there.
+        await sync_to_async(connections.close_all)()
+        return leftover
+
+    leftover = asyncio.run(_run())
+
+    statuses = dict(EmailRecipient.objects.filter(email=email).values_list("contact__email", "status"))
+    assert statuses == {
+        "ok1@example.com": RecipientStatus.SENT,
+        "ok2@example.com": RecipientStatus.SENT,
+        "reject@example.com": RecipientStatus.BOUNCED,
+    }
+    assert leftover == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_batch_is_requeued_and_acked(monkeypatch, settings):
+    settings.EMAIL_SEND_RETRY_DELAY = 60
+    _, recipients = _seed(["a@example.com", "b@example.com"])
+    ids = [str(r.id) for r in recipients]
+    queue = SendQueue(name=f"test_send_queue_{uuid.uuid4().hex[:8]}")
+    queue.push(ids)
+
+    def broken_build_message(*args):
+        raise RuntimeError("template exploded")
+
+    monkeypatch.setattr("emails.services.async_sender.build_message", broken_build_message)
+
+    async def _run():
+        redis = async_redis_client()
+        engine = AsyncSendEngine(AsyncSMTPSender(concurrency=1), redis, consumer="test", queue=queue, max_batches=1)
+        await engine._batch_slots.acquire()
+        await engine._process(*await queue.take(redis, "test"))
+        processing = await redis.llen(queue.processing_key("test"))
+        delayed = await redis.zrange(queue.delayed_key, 0, -1)
+        await redis.delete(queue.ready_key, queue.delayed_key, queue.processing_key("test"))
+        await redis.aclose()
+        await sync_to_async(connections.close_all)()
+        return processing, delayed
+
+    processing, delayed = asyncio.run(_run())
+
+    assert processing == 0
+    assert [sorted(json.loads(batch)) for batch in delayed] == [sorted(ids)]
+
+
+def test_reconnect_closes_the_dropped_session_first(monkeypatch, settings):
+    import aiosmtplib
+
+    class FakeSMTP:
+        def __init__(self):
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+        async def quit(self):
+            self.closed = True
+
+    sessions = []
+
+    async def connect(self):
+        sessions.append(FakeSMTP())
+        return sessions[-1]
+
+    async def deliver(smtp, message):
+        if smtp is sessions[0]:
+            raise aiosmtplib.SMTPServerDisconnected("dropped")
+
+    monkeypatch.setattr(AsyncSMTPSender, "_connect", connect)
+    monkeypatch.setattr(AsyncSMTPSender, "_deliver", staticmethod(deliver))
+
+    async def _run():
+        sender = AsyncSMTPSender(concurrency=1, hostname="unused")
+        await sender.start()
+        outcome = await (await sender.send(object()))
+        await sender.close()
+        return sender, outcome
+
+    sender, outcome = asyncio.run(_run())
+
+    assert outcome == RecipientStatus.SENT
+    assert sender.stats["reconnects"] == 1
+    assert [s.closed for s in sessions] == [True, True]  # dropped one at reconnect, new one at close
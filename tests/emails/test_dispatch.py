@@ -0,0 +1,117 @@
+import uuid
+import pytest
+from django.contrib.auth import get_user_model
+
+from campaigns.models import Campaign
+from audience.models import Audience
+from contacts.models import Contact, ContactStatus
+from emails.models import Email, EmailStatus
+from emails.cache_utils import get_checkpoint, set_checkpoint
+from emails.services.dispatch_service import eligible_contacts
+from emails.tasks import dispatch_email
+from tracking.models import EmailRecipient, RecipientStatus
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _seed(n_contacts=5):
+    user = User.objects.create_user(username=f"u_{uuid.uuid4().hex[:8]}", password="x", email="u@example.com")
+    aud = Audience.objects.create(user=user, name="Dispatch Audience")
+    contacts = [
+        Contact.objects.create(audience=aud, email=f"lead_{i}_{uuid.uuid4().hex[:6]}@example.com")
+        for i in range(n_contacts)
+    ]
+    camp = Campaign.objects.create(user=user, name="Dispatch Campaign")
+    email = Email.objects.create(
+        campaign=camp,
+        audience=aud,
+        subject="Hello",
+        content_text="Hi there",
+        from_email="noreply@example.com",
+    )
+    return aud, contacts, email
+
+
+@pytest.fixture
+def enqueued(mocker):
+    calls = mocker.patch("emails.tasks.send_batch.apply_async")
+    return calls
+
+
+def test_dispatch_creates_recipients_for_active_contacts(enqueued, settings):
+    settings.EMAIL_DISPATCH_CHUNK_SIZE = 2
+    aud, contacts, email = _seed(5)
+    Contact.objects.filter(pk=contacts[0].pk).update(status=ContactStatus.UNSUBSCRIBED)
+    contacts[1].archive()
+
+    count = dispatch_email(str(email.id))
+
+    assert count == 3
+    assert EmailRecipient.objects.filter(email=email).count() == 3
+    # one send batch per dispatch chunk (2 + 1 eligible contacts)
+    assert enqueued.call_count == 2
+    email.refresh_from_db()
+    assert email.status == EmailStatus.SENDING
+    assert get_checkpoint(email.id) is None
+
+
+def test_dispatch_is_idempotent_for_already_sent_recipients(enqueued):
+    aud, contacts, email = _seed(3)
+    sent = EmailRecipient.objects.create(email=email, contact=contacts[0], status=RecipientStatus.SENT)
+
+    count = dispatch_email(str(email.id))
+
+    assert count == 2
+    assert EmailRecipient.objects.filter(email=email).count() == 3
+    enqueued_ids = {rid for c in enqueued.call_args_list for rid in c.kwargs["args"][0]}
+    assert str(sent.id) not in enqueued_ids
+
+
+def test_redispatch_while_sending_enqueues_only_new_recipients(enqueued):
+    aud, contacts, email = _seed(3)
+    dispatch_email(str(email.id))
+    enqueued.reset_mock()
+    late = Contact.objects.create(audience=aud, email="late@example.com")
+
+    count = dispatch_email(str(email.id))
+
+    assert count == 1
+    [call] = enqueued.call_args_list
+    assert call.kwargs["args"][0] == [str(EmailRecipient.objects.get(email=email, contact=late).id)]
+
+
+def test_dispatch_resumes_from_checkpoint(enqueued):
+    aud, contacts, email = _seed(4)
+    ordered = sorted(c.id for c in contacts)
+    set_checkpoint(email.id, ordered[1])
+
+    count = dispatch_email(str(email.id))
+
+    assert count == 2
+    assert set(EmailRecipient.objects.filter(email=email).values_list("contact_id", flat=True)) == set(ordered[2:])
+
+
+def test_dispatch_skips_cancelled_email(enqueued):
+    aud, contacts, email = _seed(2)
+    Email.objects.filter(pk=email.pk).update(status=EmailStatus.CANCELLED)
+
+    assert dispatch_email(str(email.id)) == 0
+    assert not EmailRecipient.objects.filter(email=email).exists()
+    enqueued.assert_not_called()
+
+
+def test_followup_excludes_only_parent_bounces_and_unsubscribes():
+    aud, contacts, parent = _seed(3)
+    other = Email.objects.create(campaign=parent.campaign, audience=aud, subject="Other", content_text="x", from_email="noreply@example.com")
+    followup = Email.objects.create(
+        campaign=parent.campaign, audience=aud, subject="Follow-up", content_text="x",
+        from_email="noreply@example.com", depends_on=parent,
+    )
+    for contact, status in zip(contacts, [RecipientStatus.SENT, RecipientStatus.OPENED, RecipientStatus.BOUNCED]):
+        EmailRecipient.objects.create(email=parent, contact=contact, status=status)
+    # a bounce on an unrelated email must not drop contacts[0]
+    EmailRecipient.objects.create(email=other, contact=contacts[0], status=RecipientStatus.BOUNCED)
+
+    assert set(eligible_contacts(followup)) == {contacts[0], contacts[1]}
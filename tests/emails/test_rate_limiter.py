@@ -0,0 +1,94 @@
+import uuid
+import pytest
+from django.core import mail
+from django.contrib.auth import get_user_model
+
+from campaigns.models import Campaign
+from audience.models import Audience
+from contacts.models import Contact
+from emails.models import Email
+from emails.services.rate_limiter import SendRateLimiter, parse_rate, provider_domain
+from emails.tasks import send_batch
+from tracking.models import EmailRecipient, RecipientStatus
+
+User = get_user_model()
+
+
+def _unique_domain():
+    return f"{uuid.uuid4().hex[:10]}.example"
+
+
+def test_parse_rate():
+    assert parse_rate("600/m") == 10.0
+    assert parse_rate("3600/h") == 1.0
+    assert parse_rate("5") == 5.0
+
+
+def test_provider_domain_folds_aliases():
+    assert provider_domain("Someone@GoogleMail.com") == "gmail.com"
+    assert provider_domain("a@corp.example") == "corp.example"
+
+
+def test_bucket_throttles_after_burst_and_returns_wait(settings):
+    domain = _unique_domain()
+    settings.SEND_RATE_LIMITS = {"domain": {domain: "1/s"}, "sender": {}}
+    settings.SEND_RATE_LIMIT_BURST_SECONDS = 2
+
+    waits = SendRateLimiter().acquire_many([(f"x{i}@{domain}", "me@example.com") for i in range(3)])
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0 < waits[2] <= 1.0
+
+
+def test_deferred_sends_are_spaced_by_position(settings):
+    domain = _unique_domain()
+    settings.SEND_RATE_LIMITS = {"domain": {domain: "2/s"}, "sender": {}}
+    settings.SEND_RATE_LIMIT_BURST_SECONDS = 1
+
+    waits = SendRateLimiter().acquire_many([(f"x{i}@{domain}", "me@example.com") for i in range(6)])
+
+    assert waits[:2] == [0.0, 0.0]
+    deferred = waits[2:]
+    assert 0 < deferred[0] <= 0.5
+    assert all(abs((b - a) - 0.5) < 0.01 for a, b in zip(deferred, deferred[1:]))
+
+
+def test_sender_and_domain_buckets_are_both_required(settings):
+    domain, sender = _unique_domain(), f"{uuid.uuid4().hex[:8]}@example.com"
+    settings.SEND_RATE_LIMITS = {"domain": {"default": "1000/s"}, "sender": {sender: "1/m"}}
+    settings.SEND_RATE_LIMIT_BURST_SECONDS = 1
+
+    waits = SendRateLimiter().acquire_many([(f"a@{domain}", sender), (f"b@{domain}", sender)])
+
+    assert waits[0] == 0.0
+    assert waits[1] > 1
+
+
+@pytest.mark.django_db
+def test_throttled_recipients_are_rescheduled_not_sent(settings, mocker):
+    domain = _unique_domain()
+    settings.SEND_RATE_LIMITS = {"domain": {domain: "1/m"}, "sender": {}}
+    settings.SEND_RATE_LIMIT_BURST_SECONDS = 60
+    reschedule = mocker.patch("emails.tasks.send_batch.apply_async")
+
+    user = User.objects.create_user(username=f"u_{uuid.uuid4().hex[:8]}", password="x")
+    aud = Audience.objects.create(user=user, name="Throttle Audience")
+    camp = Campaign.objects.create(user=user, name="Throttle Campaign")
+    email = Email.objects.create(campaign=camp, audience=aud, subject="S", content_text="B", from_email="me@example.com")
+    ids = [
+        str(EmailRecipient.objects.create(
+            email=email, contact=Contact.objects.create(audience=aud, email=f"c{i}@{domain}")
+        ).id)
+        for i in range(3)
+    ]
+
+    result = send_batch(ids)
+
+    assert result == {"sent": 1, "bounced": 0, "deferred": 2}
+    assert len(mail.outbox) == 1
+    assert EmailRecipient.objects.filter(email=email, status=RecipientStatus.QUEUED).count() == 2
+    # one token per minute: the two deferred sends come back a minute apart
+    calls = sorted((c.kwargs["countdown"], c.kwargs["args"][0]) for c in reschedule.call_args_list)
+    assert [len(group) for _, group in calls] == [1, 1]
+    assert {i for _, group in calls for i in group} <= set(ids)
+    assert 59 <= calls[1][0] - calls[0][0] <= 61
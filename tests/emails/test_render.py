@@ -0,0 +1,85 @@
+import uuid
+import pytest
+from django.contrib.auth import get_user_model
+
+from campaigns.models import Campaign
+from audience.models import Audience
+from contacts.models import Contact
+from emails.models import Email
+from emails.services import render_service
+from tracking.rewrite import compile_html_links, rewrite_html_links
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    render_service.clear_compiled()
+    yield
+    render_service.clear_compiled()
+
+
+def _email(**kwargs):
+    user = User.objects.create_user(username=f"u_{uuid.uuid4().hex[:8]}", password="x")
+    aud = Audience.objects.create(user=user, name="Render Audience")
+    camp = Campaign.objects.create(user=user, name="Render Campaign")
+    fields = {"subject": "Hello", "content_text": "Body line 1\nline <2>", "from_email": "me@example.com"}
+    fields.update(kwargs)
+    email = Email.objects.create(campaign=camp, audience=aud, **fields)
+    return email, aud
+
+
+def test_render_matches_per_message_rewrite():
+    email, aud = _email()
+    contact = Contact.objects.create(audience=aud, email="a@example.com")
+    rid = str(uuid.uuid4())
+
+    msg = render_service.get_compiled(email).render(contact, rid)
+
+    expected_html = rewrite_html_links(None, "<div>Body line 1<br>line &lt;2&gt;</div>", rid)
+    assert msg.alternatives[0][0] == expected_html
+    assert msg.body == "Body line 1\nline <2>"
+    assert msg.subject == "Hello"
+    assert msg.to == ["a@example.com"]
+
+
+def test_compiled_links_match_rewrite_inside_body():
+    html = '<html><body><a href="https://x.test/a">A</a> <a href=\'https://x.test/b?q=1\'>B</a></BODY></html>'
+    compiled = render_service._split_merge_fields(compile_html_links(html))
+    rid = str(uuid.uuid4())
+    contact = Contact(email="a@example.com")
+
+    rendered = render_service.CompiledEmail(
+        subject=(), text=(), html=compiled, from_email="me@example.com", reply_to=None,
+    ).render(contact, rid).alternatives[0][0]
+
+    assert rendered == rewrite_html_links(None, html, rid)
+
+
+def test_merge_fields_are_filled_and_escaped_in_html():
+    email, aud = _email(subject="Hi {{ first_name }}", content_text="Dear {{first_name}} {{last_name}},")
+    contact = Contact.objects.create(audience=aud, email="b@example.com", first_name="<Ann>", last_name="Lee")
+
+    msg = render_service.get_compiled(email).render(contact, str(uuid.uuid4()))
+
+    assert msg.subject == "Hi <Ann>"
+    assert msg.body == "Dear <Ann> Lee,"
+    assert msg.alternatives[0][0].startswith("<div>Dear &lt;Ann&gt; Lee,</div>")
+
+
+def test_compiled_once_per_version(monkeypatch):
+    email, _ = _email()
+    calls = []
+    real = render_service.compile_email
+    monkeypatch.setattr(render_service, "compile_email", lambda e: calls.append(e.pk) or real(e))
+
+    first = render_service.get_compiled(email)
+    assert render_service.get_compiled(Email.objects.get(pk=email.pk)) is first
+    assert len(calls) == 1
+
+    email.subject = "Edited"
+    email.save()
+    assert render_service.get_compiled(email).subject == ("Edited",)
+    assert len(calls) == 2
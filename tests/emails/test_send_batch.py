@@ -0,0 +1,103 @@
+import smtplib
+import uuid
+import pytest
+from django.core import mail
+from django.contrib.auth import get_user_model
+
+from campaigns.models import Campaign
+from audience.models import Audience
+from contacts.models import Contact
+from emails.models import Email
+from emails.services import send_service, smtp_pool
+from emails.tasks import send_batch
+from tracking.models import EmailRecipient, RecipientStatus
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _seed_recipients(n=3):
+    user = User.objects.create_user(username=f"u_{uuid.uuid4().hex[:8]}", password="x", email="u@example.com")
+    aud = Audience.objects.create(user=user, name="Send Audience")
+    camp = Campaign.objects.create(user=user, name="Send Campaign")
+    email = Email.objects.create(
+        campaign=camp,
+        audience=aud,
+        subject="Batch subject",
+        content_text="Hello batch",
+        from_email="noreply@example.com",
+    )
+    recipients = []
+    for i in range(n):
+        contact = Contact.objects.create(audience=aud, email=f"rcpt{i}@example.com")
+        recipients.append(EmailRecipient.objects.create(email=email, contact=contact))
+    return email, recipients
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fresh = smtp_pool.SMTPConnectionPool()
+    monkeypatch.setattr(send_service, "smtp_pool", fresh)
+    return fresh
+
+
+def test_send_batch_sends_all_over_one_connection(pool):
+    email, recipients = _seed_recipients(3)
+
+    result = send_batch([str(r.id) for r in recipients])
+
+    assert result == {"sent": 3, "bounced": 0, "deferred": 0}
+    assert pool.stats["connections_opened"] == 1
+    assert len(mail.outbox) == 3
+    assert {m.to[0] for m in mail.outbox} == {"rcpt0@example.com", "rcpt1@example.com", "rcpt2@example.com"}
+    for r in recipients:
+        r.refresh_from_db()
+        assert r.status == RecipientStatus.SENT
+        assert r.provider_message_id
+
+
+def test_send_batch_skips_recipients_no_longer_queued(pool):
+    email, recipients = _seed_recipients(2)
+    EmailRecipient.objects.filter(pk=recipients[0].pk).update(status=RecipientStatus.SENT)
+
+    result = send_batch([str(r.id) for r in recipients])
+
+    assert result == {"sent": 1, "bounced": 0, "deferred": 0}
+    assert len(mail.outbox) == 1
+
+
+def test_send_batch_marks_refused_recipient_bounced(mocker, pool):
+    email, recipients = _seed_recipients(2)
+    connection = mocker.MagicMock()
+
+    def _send(messages):
+        if messages[0].to[0] == "rcpt0@example.com":
+            raise smtplib.SMTPRecipientsRefused({"rcpt0@example.com": (550, b"no such user")})
+        return 1
+
+    connection.send_messages.side_effect = _send
+    mocker.patch.object(smtp_pool, "get_connection", return_value=connection)
+
+    result = send_service.send_recipients([str(r.id) for r in recipients], reschedule=mocker.Mock())
+
+    assert result == {"sent": 1, "bounced": 1, "deferred": 0}
+    statuses = dict(EmailRecipient.objects.filter(email=email).values_list("contact__email", "status"))
+    assert statuses == {"rcpt0@example.com": RecipientStatus.BOUNCED, "rcpt1@example.com": RecipientStatus.SENT}
+
+
+def test_send_interrupted_keeps_unsent_tail_queued(mocker, pool):
+    email, recipients = _seed_recipients(3)
+    connection = mocker.MagicMock()
+    connection.send_messages.side_effect = [1, smtplib.SMTPServerDisconnected("gone"), smtplib.SMTPServerDisconnected("gone")]
+    mocker.patch.object(smtp_pool, "get_connection", return_value=connection)
+
+    with pytest.raises(send_service.SendInterrupted) as exc:
+        send_service.send_recipients([str(r.id) for r in recipients], reschedule=mocker.Mock())
+
+    assert len(exc.value.remaining_ids) == 2
+    assert EmailRecipient.objects.filter(email=email, status=RecipientStatus.SENT).count() == 1
+    assert EmailRecipient.objects.filter(email=email, status=RecipientStatus.QUEUED).count() == 2
+    # the broken session is not handed to the next task
+    assert pool.stats["reconnects"] == 1
+    assert not pool._idle.get(pool._key())
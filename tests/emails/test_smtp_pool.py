@@ -0,0 +1,92 @@
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from django.core.mail import EmailMessage
+
+from emails.services.smtp_pool import SMTPConnectionPool
+
+pytestmark = pytest.mark.unit
+
+
+class _RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(settings):
+    handler = _RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = "127.0.0.1"
+    settings.EMAIL_PORT = controller.port
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = ""
+    settings.EMAIL_HOST_PASSWORD = ""
+    settings.SMTP_POOL_HEALTHCHECK_INTERVAL = 0
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def pool():
+    p = SMTPConnectionPool()
+    yield p
+    p.close_all()
+
+
+def _msg(i=0):
+    return EmailMessage(subject=f"s{i}", body="b", from_email="from@example.com", to=[f"to{i}@example.com"])
+
+
+def test_connection_is_reused_across_borrows(smtp_server, pool):
+    for i in range(3):
+        with pool.connection() as conn:
+            conn.send_messages([_msg(i)])
+
+    assert len(smtp_server.messages) == 3
+    assert len(smtp_server.peers) == 1
+    assert pool.stats == {"connections_opened": 1, "messages_sent": 3, "reconnects": 0}
+
+
+def test_message_cap_rotates_connection(smtp_server, pool, settings):
+    settings.SMTP_POOL_MAX_MESSAGES = 2
+    with pool.connection() as conn:
+        for i in range(5):
+            conn.send_messages([_msg(i)])
+
+    assert len(smtp_server.messages) == 5
+    assert pool.stats["connections_opened"] == 3
+
+
+def test_dropped_session_is_replaced(smtp_server, pool):
+    with pool.connection() as conn:
+        conn.send_messages([_msg(0)])
+        # simulate the relay dropping an idle session
+        conn.backend.connection.close()
+
+    # NOOP health check fails on borrow -> fresh connection
+    with pool.connection() as conn:
+        conn.send_messages([_msg(1)])
+
+    # dropped mid-use -> one transparent reconnect
+    with pool.connection() as conn:
+        conn.backend.connection.close()
+        conn.send_messages([_msg(2)])
+
+    assert len(smtp_server.messages) == 3
+    assert pool.stats["connections_opened"] == 3
+    assert pool.stats["reconnects"] == 1
@@ -0,0 +1,149 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+from tracking.async_views import AsyncClickRedirectView, AsyncOpenPixelView, AsyncUnsubscribeView
+from tracking.models import RecipientStatus, TrackEvent
+from tracking.utils import build_click_url, build_open_url, build_unsubscribe_url
+from tracking.views import PIXEL_GIF
+
+from .test_open_pixel import _clear_seen, buffer  # noqa: F401
+from .test_tracking_endpoints import _request_with_host, _seed
+
+pytestmark = pytest.mark.django_db
+
+
+def _get(view, url):
+    parts = urlsplit(url)
+    request = AsyncRequestFactory().get(f"{parts.path}?{parts.query}")
+    return async_to_sync(view.as_view())(request)
+
+
+def test_async_click_writes_through_when_not_buffered():
+    *_, recipient = _seed()
+    target = "https://example.com/landing"
+
+    resp = _get(AsyncClickRedirectView, build_click_url(_request_with_host(), str(recipient.id), target))
+
+    assert resp.status_code == 302
+    assert resp["Location"] == target
+    recipient.refresh_from_db()
+    assert recipient.status == RecipientStatus.CLICKED
+    assert TrackEvent.objects.get(recipient=recipient).metadata == {"url": target}
+
+
+def test_async_views_buffer_hits_in_redis(buffer, settings):  # noqa: F811
+    settings.TRACKING_WRITE_BEHIND = True
+    *_, recipient = _seed()
+
+    unsub = _get(AsyncUnsubscribeView, build_unsubscribe_url(_request_with_host(), str(recipient.id)))
+    pixels = [_get(AsyncOpenPixelView, build_open_url(None, str(recipient.id))) for _ in range(2)]
+
+    assert unsub.status_code == 200
+    assert [p.content for p in pixels] == [PIXEL_GIF, PIXEL_GIF]
+    assert [e.event_type for e in buffer.claim(10)] == [RecipientStatus.UNSUBSCRIBED, RecipientStatus.OPENED]
+    assert not TrackEvent.objects.exists()
+    _clear_seen(recipient.id)
+
+
+def test_async_click_rejects_bad_signature():
+    *_, recipient = _seed()
+    url = build_click_url(_request_with_host(), str(recipient.id), "https://example.com/") + "00"
+
+    assert _get(AsyncClickRedirectView, url).status_code == 400
+
+
+def _asgi_get(url, host=b"testserver", scheme="http"):
+    from core.asgi import application
+
+    parts = urlsplit(url)
+    scope = {
+        "type": "http", "method": "GET", "path": parts.path, "query_string": parts.query.encode(),
+        "headers": [(b"host", host)], "server": ("testserver", 80), "scheme": scheme,
+    }
+    sent = []
+
+    received = []
+
+    async def receive():
+        if received:  # Django listens for a disconnect until it has responded
+            await asyncio.Event().wait()
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), sent[1]["body"]
+
+
+def test_asgi_fast_path_serves_buffered_hits(buffer, settings):  # noqa: F811
+    from tracking.asgi import fast_view
+
+    *_, recipient = _seed()
+    target = "https://example.com/landing"
+    click_url = build_click_url(_request_with_host(), str(recipient.id), target)
+    assert fast_view({"type": "http", "method": "GET", "path": urlsplit(click_url).path}) is None
+
+    settings.TRACKING_WRITE_BEHIND = True
+    status, headers, body = _asgi_get(click_url)
+    assert (status, headers[b"Location"], headers[b"content-length"], body) == (302, target.encode(), b"0", b"")
+
+    status, headers, body = _asgi_get(build_open_url(None, str(recipient.id)))
+    assert (status, headers[b"Content-Type"], body) == (200, b"image/gif", PIXEL_GIF)
+
+    assert [e.event_type for e in buffer.claim(10)] == [RecipientStatus.CLICKED, RecipientStatus.OPENED]
+    _clear_seen(recipient.id)
+
+
+def test_asgi_fast_path_sets_the_security_middleware_headers(buffer, settings):  # noqa: F811
+    settings.SECURE_HSTS_SECONDS = 3600
+    settings.SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+    *_, recipient = _seed()
+    url = build_open_url(None, str(recipient.id))
+
+    _, headers, _ = _asgi_get(url, scheme="https")
+
+    assert headers[b"X-Content-Type-Options"] == b"nosniff"
+    assert headers[b"Referrer-Policy"] == b"same-origin"
+    assert headers[b"X-Frame-Options"] == b"DENY"
+    assert headers[b"Strict-Transport-Security"] == b"max-age=3600; includeSubDomains"
+    _, headers, _ = _asgi_get(url)
+    assert b"Strict-Transport-Security" not in headers  # HSTS only over HTTPS, as in Django
+    _clear_seen(recipient.id)
+
+
+def test_asgi_fast_path_leaves_disallowed_hosts_to_django(buffer, settings):  # noqa: F811
+    settings.TRACKING_WRITE_BEHIND = True
+    settings.ALLOWED_HOSTS = ["testserver"]
+    *_, recipient = _seed()
+
+    status, _, _ = _asgi_get(build_open_url(None, str(recipient.id)), host=b"evil.example")
+
+    assert status == 400  # DisallowedHost, from Django
+    assert buffer.claim(10) == []
+
+
+def test_async_redis_uses_the_cache_connection_options(settings):
+    from tracking.services.event_buffer import async_connection_params
+
+    settings.CACHES = {"default": {
+        **settings.CACHES["default"],
+        "LOCATION": "rediss://primary:6380/1,rediss://replica:6380/1",
+        "OPTIONS": {
+            "PASSWORD": "s3cret", "SOCKET_TIMEOUT": 2, "SOCKET_CONNECT_TIMEOUT": 1,
+            "CONNECTION_POOL_KWARGS": {"ssl_cert_reqs": None, "max_connections": 50},
+        },
+    }}
+
+    url, kwargs = async_connection_params()
+
+    assert url == "rediss://primary:6380/1"
+    assert kwargs == {
+        "password": "s3cret", "socket_timeout": 2, "socket_connect_timeout": 1,
+        "ssl_cert_reqs": None, "max_connections": 50,
+    }
@@ -0,0 +1,122 @@
+import uuid
+import pytest
+from django.db import IntegrityError
+from django.test import RequestFactory
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework.test import APIClient
+
+from contacts.models import Contact, ContactStatus
+from tracking.models import EmailRecipient, RecipientStatus, TrackEvent
+from tracking.services import events
+from tracking.services.event_buffer import EventBuffer, TrackingEvent
+from tracking.utils import build_click_url, build_unsubscribe_url
+
+from .test_tracking_endpoints import _seed
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(settings, monkeypatch):
+    settings.TRACKING_WRITE_BEHIND = True
+    fresh = EventBuffer(name=f"test_tracking_events_{uuid.uuid4().hex[:8]}")
+    monkeypatch.setattr(events, "buffer", fresh)
+    yield fresh
+    get_redis_connection("default").delete(fresh.key, fresh.inflight_key, fresh.dead_key)
+
+
+def _req():
+    return RequestFactory().get("/", HTTP_HOST="testserver")
+
+
+def test_click_redirects_before_anything_is_written(buffer, django_assert_num_queries):
+    *_, recipient = _seed()
+    url = build_click_url(_req(), str(recipient.id), "https://example.com/x")
+
+    with django_assert_num_queries(0):
+        resp = APIClient().get(url)
+
+    assert resp.status_code == 302
+    assert buffer.size() == 1
+    assert not TrackEvent.objects.exists()
+
+
+def test_flush_writes_events_and_statuses_in_batches(buffer, django_assert_num_queries):
+    _, _, contact, _, _, recipient = _seed()
+    *_, other = _seed()
+    client = APIClient()
+    client.get(build_click_url(_req(), str(recipient.id), "https://example.com/a"))
+    client.get(build_click_url(_req(), str(other.id), "https://example.com/b"))
+    client.get(build_unsubscribe_url(_req(), str(recipient.id)))
+
+    # savepoint + status update + insert + suppression
+    # + stats lock + stats upsert + hourly upsert + release
+    with django_assert_num_queries(8):
+        assert events.flush_buffer() == 3
+
+    recipient.refresh_from_db()
+    other.refresh_from_db()
+    contact.refresh_from_db()
+    assert recipient.status == RecipientStatus.UNSUBSCRIBED
+    assert other.status == RecipientStatus.CLICKED
+    assert contact.status == ContactStatus.UNSUBSCRIBED
+    assert TrackEvent.objects.filter(recipient=recipient).count() == 2
+    assert buffer.size() == 0
+
+
+def test_unacked_batch_is_replayed_without_duplicates(buffer):
+    *_, recipient = _seed()
+    buffer.push(TrackingEvent(str(recipient.id), RecipientStatus.CLICKED, timezone.now(), {"url": "u"}))
+    claimed = buffer.claim(100)
+    events.apply_events(claimed)  # worker dies before ack
+
+    assert events.flush_buffer() == 1
+    assert TrackEvent.objects.filter(recipient=recipient).count() == 1
+    assert buffer.claim(100) == []
+
+
+def test_flush_drops_events_for_deleted_recipients(buffer):
+    *_, recipient = _seed()
+    buffer.push(TrackingEvent(str(recipient.id), RecipientStatus.CLICKED, timezone.now()))
+    buffer.push(TrackingEvent(str(uuid.uuid4()), RecipientStatus.CLICKED, timezone.now()))
+
+    assert events.flush_buffer() == 1
+    assert EmailRecipient.objects.get(id=recipient.id).status == RecipientStatus.CLICKED
+
+
+def test_unsubscribe_leaves_archived_contact_alone_when_address_was_readded(buffer):
+    _, aud, contact, _, _, recipient = _seed()
+    Contact.objects.filter(pk=contact.pk).update(status=ContactStatus.ARCHIVED)
+    readded = Contact.objects.create(audience=aud, email=contact.email)
+    buffer.push(TrackingEvent(str(recipient.id), RecipientStatus.UNSUBSCRIBED, timezone.now()))
+
+    assert events.flush_buffer() == 1
+
+    assert Contact.all_objects.get(pk=contact.pk).status == ContactStatus.ARCHIVED
+    assert Contact.objects.get(pk=readded.pk).status == ContactStatus.ACTIVE
+    assert EmailRecipient.objects.get(id=recipient.id).status == RecipientStatus.UNSUBSCRIBED
+    assert buffer.claim(100) == []
+
+
+def test_failing_event_is_dead_lettered_and_the_rest_written(buffer, monkeypatch):
+    *_, good = _seed()
+    *_, bad = _seed()
+    suppress = events._suppress_contacts
+
+    def failing(recipient_ids):
+        if str(bad.id) in recipient_ids:
+            raise IntegrityError("uniq_email_aud_active")
+        suppress(recipient_ids)
+
+    monkeypatch.setattr(events, "_suppress_contacts", failing)
+    buffer.push(TrackingEvent(str(good.id), RecipientStatus.UNSUBSCRIBED, timezone.now()))
+    buffer.push(TrackingEvent(str(bad.id), RecipientStatus.UNSUBSCRIBED, timezone.now()))
+
+    assert events.flush_buffer() == 1
+
+    assert EmailRecipient.objects.get(id=good.id).status == RecipientStatus.UNSUBSCRIBED
+    assert EmailRecipient.objects.get(id=bad.id).status == RecipientStatus.QUEUED
+    assert buffer.claim(100) == []
+    dead = get_redis_connection("default").lrange(buffer.dead_key, 0, -1)
+    assert [TrackingEvent.loads(raw).recipient_id for raw in dead] == [str(bad.id)]
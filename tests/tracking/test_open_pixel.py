@@ -0,0 +1,59 @@
+import uuid
+import pytest
+from django_redis import get_redis_connection
+from rest_framework.test import APIClient
+
+from tracking.models import RecipientStatus, TrackEvent
+from tracking.services import events
+from tracking.services.event_buffer import KEY_PREFIX, EventBuffer
+from tracking.utils import build_open_url
+from tracking.views import PIXEL_GIF
+
+from .test_tracking_endpoints import _seed
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    fresh = EventBuffer(name=f"test_tracking_events_{uuid.uuid4().hex[:8]}")
+    monkeypatch.setattr(events, "buffer", fresh)
+    yield fresh
+    get_redis_connection("default").delete(fresh.key, fresh.inflight_key, fresh.dead_key)
+
+
+def _clear_seen(recipient_id):
+    get_redis_connection("default").delete(f"{KEY_PREFIX}:tracking:open_seen:{recipient_id}")
+
+
+def test_pixel_is_served_without_db_and_opens_are_deduped(buffer, django_assert_num_queries):
+    *_, recipient = _seed()
+    url = build_open_url(None, str(recipient.id))
+    client = APIClient()
+
+    with django_assert_num_queries(0):
+        responses = [client.get(url) for _ in range(3)]
+
+    for resp in responses:
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "image/gif"
+        assert resp.content == PIXEL_GIF
+        assert "no-store" in resp["Cache-Control"]
+    assert buffer.size() == 1
+
+    assert events.flush_buffer() == 1
+    recipient.refresh_from_db()
+    assert recipient.status == RecipientStatus.OPENED
+    assert TrackEvent.objects.filter(recipient=recipient, event_type=RecipientStatus.OPENED).count() == 1
+    _clear_seen(recipient.id)
+
+
+def test_bad_signature_still_gets_pixel_but_is_not_recorded(buffer):
+    *_, recipient = _seed()
+    url = build_open_url(None, str(recipient.id)).replace("&s=", "&s=00")
+
+    resp = APIClient().get(url)
+
+    assert resp.status_code == 200
+    assert resp.content == PIXEL_GIF
+    assert buffer.size() == 0
@@ -0,0 +1,81 @@
+from datetime import date, datetime, timezone as dt_timezone
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from tracking.models import EmailRecipient, RecipientStatus, TrackEvent
+from tracking.services import partitions
+
+from .test_tracking_endpoints import _seed
+
+pytestmark = pytest.mark.django_db
+
+
+def _partition_of(event_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT tableoid::regclass::text FROM {partitions.PARENT} WHERE id = %s", [event_id])
+        return cursor.fetchone()[0]
+
+
+def test_events_land_in_their_month_and_time_filters_prune():
+    *_, recipient = _seed()
+    event = TrackEvent.objects.create(recipient=recipient, event_type=RecipientStatus.OPENED)
+
+    assert _partition_of(event.id) == partitions.partition_name(partitions.current_month())
+
+    month = partitions.current_month()
+    qs = TrackEvent.objects.filter(occurred_at__gte=datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc))
+    plan = qs.explain()
+    assert partitions.partition_name(partitions.add_months(month, -1)) not in plan
+    assert partitions.partition_name(month) in plan
+
+
+def test_ensure_partitions_moves_rows_out_of_default():
+    *_, recipient = _seed()
+    far = partitions.add_months(partitions.current_month(), 12)
+    event = TrackEvent.objects.create(
+        recipient=recipient, event_type=RecipientStatus.CLICKED,
+        occurred_at=datetime(far.year, far.month, 15, tzinfo=dt_timezone.utc),
+    )
+    assert _partition_of(event.id) == partitions.DEFAULT_PARTITION
+
+    created = partitions.ensure_partitions(12)
+
+    assert partitions.partition_name(far) in created
+    assert _partition_of(event.id) == partitions.partition_name(far)
+    assert partitions.ensure_partitions(12) == []
+
+
+def test_expire_partitions_detaches_old_months(capsys):
+    old = partitions.add_months(partitions.current_month(), -6)
+    with connection.cursor() as cursor:
+        partitions._create_partition(cursor, old)
+
+    call_command("trackevent_partitions", "--retention-months", "3", "--drop")
+
+    assert old not in partitions.existing_partitions()
+    assert f"dropped {partitions.partition_name(old)}" in capsys.readouterr().out
+
+
+def test_recipients_can_be_deleted_after_their_partition_is_detached():
+    *_, recipient = _seed()
+    old = partitions.add_months(partitions.current_month(), -6)
+    with connection.cursor() as cursor:
+        partitions._create_partition(cursor, old)
+    TrackEvent.objects.create(
+        recipient=recipient, event_type=RecipientStatus.OPENED,
+        occurred_at=datetime(old.year, old.month, 10, tzinfo=dt_timezone.utc),
+    )
+
+    assert partitions.expire_partitions(3) == [partitions.partition_name(old)]
+
+    recipient.delete()
+    assert not EmailRecipient.objects.filter(pk=recipient.pk).exists()
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {partitions.partition_name(old)}")
+        assert cursor.fetchone()[0] == 1  # history kept, just unlinked
+
+
+def test_add_months_wraps_years():
+    assert partitions.add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert partitions.add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
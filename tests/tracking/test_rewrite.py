@@ -0,0 +1,46 @@
+import uuid
+from urllib.parse import parse_qs, urlparse
+
+from tracking.rewrite import CLICK, RecipientLinks, TrackedLink, compile_html_links, fill_links, rewrite_html_links
+from tracking.utils import build_click_url, build_open_url, build_unsubscribe_url, decode_tracked_url, verify_signature
+
+HTML = (
+    '<html><body><a href="https://example.com/a">A</a>'
+    "<a href='https://example.com/b?x=1&y=2'>B</a>"
+    '<a HREF="https://example.com/a">A again</a></body></html>'
+)
+
+
+def test_precomputed_urls_match_the_reference_builders():
+    rid = str(uuid.uuid4())
+    links = RecipientLinks(None, rid)
+
+    for url in ["https://example.com/a", "https://example.com/ü?q=a b"]:
+        assert links.url(TrackedLink(CLICK, url)) == build_click_url(None, rid, url)
+    assert fill_links(compile_html_links("x"), links).count(build_unsubscribe_url(None, rid)) == 1
+
+
+def test_rewritten_links_verify_and_decode():
+    rid = str(uuid.uuid4())
+    out = rewrite_html_links(None, HTML, rid)
+
+    hrefs = [seg for seg in compile_html_links(HTML) if isinstance(seg, TrackedLink)]
+    assert [h.url for h in hrefs[:3]] == ["https://example.com/a", "https://example.com/b?x=1&y=2", "https://example.com/a"]
+    for link in hrefs:
+        url = RecipientLinks(None, rid).url(link)
+        assert url in out
+        q = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        original = decode_tracked_url(q["u"])
+        assert original == link.url
+        assert verify_signature(q["r"], original, q["s"])
+
+
+def test_footer_and_pixel_go_before_last_body_tag():
+    rid = str(uuid.uuid4())
+    out = rewrite_html_links(None, "<body>one</body><body>two</BODY>tail", rid)
+    assert out.startswith("<body>one</body><body>two<p ")
+    assert f'[Unsubscribe]</a></p><img src="{build_open_url(None, rid)}"' in out
+    assert out.endswith('height:1px;"></BODY>tail')
+
+    bare = rewrite_html_links(None, "<div>hi</div>", rid, unsubscribe_text=None, track_opens=False)
+    assert bare == "<div>hi</div>"
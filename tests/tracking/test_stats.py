@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+import importlib
+import pytest
+from django.urls import reverse
+from django.db import connection
+from django.utils import timezone
+
+from audience.models import Audience
+from campaigns.models import Campaign
+from contacts.models import Contact
+from emails.models import Email
+from emails.services import dispatch_service
+from tracking.models import EmailRecipient, EmailStats, EmailStatsHourly, RecipientStatus
+from tracking.services import events, partitions, stats
+from tracking.services.event_buffer import TrackingEvent
+
+pytestmark = pytest.mark.django_db
+
+
+def _email(user, n_contacts=4):
+    aud = Audience.objects.create(user=user, name="Stats Audience")
+    camp = Campaign.objects.create(user=user, name="Stats Campaign")
+    for i in range(n_contacts):
+        Contact.objects.create(audience=aud, email=f"s{i}@example.com")
+    email = Email.objects.create(campaign=camp, audience=aud, subject="S", content_text="B", from_email="me@example.com")
+    return camp, email
+
+
+def _sent_recipients(email):
+    contact_ids = list(Contact.objects.filter(audience=email.audience).values_list("id", flat=True))
+    ids = dispatch_service.materialize_recipients(email.pk, contact_ids)
+    recipients = list(EmailRecipient.objects.filter(id__in=ids).order_by("id"))
+    for r, outcome in zip(recipients, [RecipientStatus.SENT] * 3 + [RecipientStatus.BOUNCED]):
+        r.status = outcome
+    events.apply_send_results(recipients)
+    return recipients
+
+
+def _snapshot(email_id):
+    s = EmailStats.objects.get(email_id=email_id)
+    hourly = sorted(
+        EmailStatsHourly.objects.filter(email_id=email_id).values_list("bucket", "sent", "bounced", "opened", "clicked")
+    )
+    return stats.summarize(s), hourly
+
+
+def test_incremental_rollups_match_reconcile(user):
+    _, email = _email(user)
+    r = _sent_recipients(email)
+    now = timezone.now()
+    events.apply_events([
+        TrackingEvent(str(r[0].id), RecipientStatus.OPENED, now),
+        TrackingEvent(str(r[0].id), RecipientStatus.CLICKED, now),
+        TrackingEvent(str(r[1].id), RecipientStatus.OPENED, now - timedelta(hours=2)),
+        TrackingEvent(str(r[0].id), RecipientStatus.OPENED, now),  # no status change
+    ])
+
+    incremental = _snapshot(email.pk)
+    counts, hourly = incremental
+    assert counts == {
+        "queued": 0, "sent": 1, "delivered": 0, "bounced": 1, "complained": 0,
+        "unsubscribed": 0, "opened": 1, "clicked": 1, "total": 4,
+    }
+    assert sum(h[3] for h in hourly) == 3  # opens are events, not recipients
+    assert len(hourly) == 2
+
+    stats.reconcile(email.pk)
+    assert _snapshot(email.pk) == incremental
+
+
+def test_reconcile_repairs_drift(user):
+    _, email = _email(user)
+    _sent_recipients(email)
+    EmailStats.objects.filter(email_id=email.pk).update(sent=999, queued=-5)
+
+    stats.reconcile(email.pk)
+
+    assert stats.for_email(Email.objects.get(pk=email.pk))["sent"] == 3
+    assert EmailStats.objects.get(email_id=email.pk).queued == 0
+
+
+def test_email_and_campaign_detail_read_rollups(user, auth_client, get_token):
+    camp, email = _email(user)
+    _sent_recipients(email)
+    client = auth_client(get_token(username=user.username, password="pass1234"))
+
+    email_resp = client.get(reverse("emails:email-detail", kwargs={"campaign_id": camp.id, "id": email.id}))
+    campaign_resp = client.get(reverse("campaigns:campaign-detail", kwargs={"pk": camp.id}))
+
+    assert email_resp.data["stats"]["sent"] == 3
+    assert email_resp.data["stats"]["bounced"] == 1
+    assert campaign_resp.data["stats"]["total"] == 4
+
+
+def test_send_results_do_not_move_engaged_recipients_back(user):
+    _, email = _email(user, n_contacts=1)
+    contact_ids = list(Contact.objects.filter(audience=email.audience).values_list("id", flat=True))
+    recipient = EmailRecipient.objects.get(id__in=dispatch_service.materialize_recipients(email.pk, contact_ids))
+    # An image proxy fetched the pixel before the send finished
+    events.apply_events([TrackingEvent(str(recipient.id), RecipientStatus.OPENED, timezone.now())])
+
+    recipient.status = RecipientStatus.SENT
+    recipient.provider_message_id = "<m1@example.com>"
+    events.apply_send_results([recipient])
+
+    stored = EmailRecipient.objects.get(pk=recipient.pk)
+    assert stored.status == RecipientStatus.OPENED
+    assert stored.provider_message_id == "<m1@example.com>"
+    incremental = _snapshot(email.pk)
+    assert incremental[0]["opened"] == 1 and incremental[0]["sent"] == 0 and incremental[0]["total"] == 1
+    stats.reconcile(email.pk)
+    assert _snapshot(email.pk) == incremental
+
+
+def test_reconcile_does_not_mark_the_email_for_the_next_run(user):
+    _, email = _email(user)
+    _sent_recipients(email)
+    EmailStats.objects.filter(email_id=email.pk).update(updated_at=timezone.now() - timedelta(days=30))
+    since = timezone.now() - timedelta(days=1)
+
+    stats.reconcile(email.pk)
+
+    assert email.pk not in set(stats.emails_to_reconcile(since))
+
+
+def test_reconcile_keeps_hours_whose_partition_was_detached(user):
+    _, email = _email(user)
+    r = _sent_recipients(email)
+    old = partitions.add_months(partitions.current_month(), -6)
+    with connection.cursor() as cursor:
+        partitions._create_partition(cursor, old)
+    events.apply_events([
+        TrackingEvent(str(r[0].id), RecipientStatus.OPENED, datetime(old.year, old.month, 3, 10, tzinfo=dt_timezone.utc)),
+    ])
+    partitions.expire_partitions(3)
+
+    stats.reconcile(email.pk)
+
+    old_hour = datetime(old.year, old.month, 3, 10, tzinfo=dt_timezone.utc)
+    assert EmailStatsHourly.objects.get(email_id=email.pk, bucket=old_hour).opened == 1
+    assert EmailStatsHourly.objects.filter(email_id=email.pk, bucket__gt=old_hour).exists()
+
+
+def test_migration_backfills_rollups_of_existing_emails(user):
+    _, email = _email(user)
+    r = _sent_recipients(email)
+    events.apply_events([TrackingEvent(str(r[0].id), RecipientStatus.CLICKED, timezone.now())])
+    expected = _snapshot(email.pk)
+    EmailStats.objects.all().delete()
+    EmailStatsHourly.objects.all().delete()
+
+    backfill = importlib.import_module("tracking.migrations.0004_backfill_email_stats")
+    with connection.cursor() as cursor:
+        for operation in backfill.Migration.operations:
+            cursor.execute(operation.sql)
+
+    assert _snapshot(email.pk) == expected
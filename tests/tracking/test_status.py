@@ -0,0 +1,72 @@
+import uuid
+from datetime import timedelta
+import pytest
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracking.models import EmailRecipient, RecipientStatus, TrackEvent
+from tracking.services import status
+from tracking.utils import build_click_url, build_unsubscribe_url
+
+from .test_tracking_endpoints import _seed
+
+pytestmark = pytest.mark.django_db
+
+
+def _req():
+    return RequestFactory().get("/", HTTP_HOST="testserver")
+
+
+def test_lattice_order():
+    rank = status.STATUS_RANK
+    assert rank[RecipientStatus.OPENED] < rank[RecipientStatus.CLICKED] < rank[RecipientStatus.UNSUBSCRIBED]
+    assert rank[RecipientStatus.QUEUED] < rank[RecipientStatus.SENT] < rank[RecipientStatus.OPENED]
+    assert set(rank) == set(RecipientStatus)
+
+
+def test_advance_only_moves_forward_and_keeps_latest_event_time():
+    *_, clicked = _seed()
+    *_, sent = _seed()
+    EmailRecipient.objects.filter(id=clicked.id).update(status=RecipientStatus.CLICKED)
+    EmailRecipient.objects.filter(id=sent.id).update(status=RecipientStatus.SENT)
+    now = timezone.now()
+
+    advanced = status.advance([
+        (str(clicked.id), RecipientStatus.OPENED, now),
+        (str(sent.id), RecipientStatus.CLICKED, now - timedelta(minutes=1)),
+        (str(sent.id), RecipientStatus.OPENED, now),
+        (str(uuid.uuid4()), RecipientStatus.OPENED, now),
+    ])
+
+    assert set(advanced) == {str(clicked.id), str(sent.id)}
+    assert advanced[str(sent.id)].old_status == RecipientStatus.SENT
+    assert advanced[str(sent.id)].new_status == RecipientStatus.CLICKED
+    assert advanced[str(clicked.id)].new_status == RecipientStatus.CLICKED
+    clicked.refresh_from_db()
+    sent.refresh_from_db()
+    assert clicked.status == RecipientStatus.CLICKED
+    assert clicked.last_event_at == now
+    assert sent.status == RecipientStatus.CLICKED
+    assert sent.last_event_at == now
+
+
+def test_click_after_unsubscribe_is_logged_without_status_change(django_assert_num_queries):
+    *_, recipient = _seed()
+    client = APIClient()
+    client.get(build_unsubscribe_url(_req(), str(recipient.id)))
+
+    # savepoint + status update + event insert + stats lock + hourly upsert
+    # + release; no SELECT, and no status upsert since nothing moved
+    with django_assert_num_queries(6):
+        resp = client.get(build_click_url(_req(), str(recipient.id), "https://example.com/late"))
+
+    assert resp.status_code == 302
+    recipient.refresh_from_db()
+    assert recipient.status == RecipientStatus.UNSUBSCRIBED
+    assert TrackEvent.objects.filter(recipient=recipient, event_type=RecipientStatus.CLICKED).exists()
+
+
+def test_unknown_recipient_is_404_when_written_synchronously():
+    url = build_click_url(_req(), str(uuid.uuid4()), "https://example.com/x")
+    assert APIClient().get(url).status_code == 404
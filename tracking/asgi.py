@@ -0,0 +1,109 @@
+"""
+ASGI fast path for the public tracking hits (see core.asgi).
+
+A buffered hit needs no session, user, CSRF or database, yet Django's
+ASGIHandler spends about a millisecond of CPU on each: a thread-sensitive
+context (a new thread per request) and sync_to_async hops for every
+MiddlewareMixin middleware and for the request signals. Hits that only
+touch Redis are answered here, straight from the scope, by the same
+async views; the rest (written now, wrong method, unknown path, a Host
+outside ALLOWED_HOSTS, plain HTTP under SECURE_SSL_REDIRECT) go to Django
+as usual.
+
+Of the MIDDLEWARE stack, only the response headers of SecurityMiddleware
+(HSTS, nosniff, Referrer-Policy, COOP) and XFrameOptionsMiddleware are
+applied here, by their own process_response. The rest is skipped on
+purpose: sessions, auth and messages (the hits are anonymous), CSRF
+(GET only), CORS (email clients and browsers navigating, not scripts)
+and CommonMiddleware (the routes are exact paths, no slash or www
+redirects).
+"""
+from urllib.parse import parse_qsl
+
+from django.conf import settings
+from django.http.request import split_domain_port, validate_host
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.security import SecurityMiddleware
+from django.urls import reverse
+
+from tracking.async_views import AsyncClickRedirectView, AsyncOpenPixelView, AsyncUnsubscribeView
+
+
+class ScopeRequest:
+    """
+    What the tracking views and the header middleware read from a
+    request: its query string and whether it came over HTTPS.
+    """
+
+    __slots__ = ("GET", "_scope")
+
+    def __init__(self, scope):
+        self.GET = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+        self._scope = scope
+
+    def is_secure(self) -> bool:
+        # As HttpRequest.is_secure(), behind a TLS-terminating proxy too.
+        if settings.SECURE_PROXY_SSL_HEADER:
+            meta_name, secure_value = settings.SECURE_PROXY_SSL_HEADER
+            name = meta_name.removeprefix("HTTP_").lower().replace("_", "-").encode("latin-1")
+            value = _header(self._scope, name)
+            if value is not None:
+                return value.decode("latin-1").split(",", 1)[0].strip() == secure_value
+        return self._scope.get("scheme", "http") == "https"
+
+
+_routes = None
+
+
+def fast_view(scope):
+    """The async view class to serve `scope` with, or None for Django."""
+    global _routes
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    if _routes is None:
+        _routes = {
+            reverse("track-click"): AsyncClickRedirectView,
+            reverse("track-unsubscribe"): AsyncUnsubscribeView,
+            reverse("track-open"): AsyncOpenPixelView,
+        }
+    view = _routes.get(scope["path"])
+    # Opens are always buffered; clicks/unsubscribes only with write-behind
+    if view is None or not (view is AsyncOpenPixelView or settings.TRACKING_WRITE_BEHIND):
+        return None
+    # Django would reject a Host outside ALLOWED_HOSTS (DisallowedHost)
+    # or redirect plain HTTP to HTTPS; leave those to it.
+    if settings.SECURE_SSL_REDIRECT and not ScopeRequest(scope).is_secure():
+        return None
+    return view if _allowed_host(scope) else None
+
+
+def _header(scope, name: bytes):
+    return next((value for key, value in scope.get("headers", ()) if key == name), None)
+
+
+def _allowed_host(scope) -> bool:
+    host = _header(scope, b"host")
+    if host is None:
+        return False
+    domain, _ = split_domain_port(host.decode("latin-1"))
+    allowed = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed:
+        allowed = [".localhost", "127.0.0.1", "[::1]"]  # as HttpRequest.get_host()
+    return bool(domain) and validate_host(domain, allowed)
+
+
+def _noop(request):
+    return None
+
+
+async def serve(view, scope, send) -> None:
+    request = ScopeRequest(scope)
+    response = await view().get(request)
+    # Built per response: each reads its settings in __init__.
+    for middleware in (SecurityMiddleware(_noop), XFrameOptionsMiddleware(_noop)):
+        response = middleware.process_response(request, response)
+    body = response.content
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response.items()]
+    headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
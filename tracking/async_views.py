@@ -0,0 +1,57 @@
+"""
+Async counterparts of tracking.views, used by tracking.urls when
+TRACKING_ASYNC_VIEWS is on (the ASGI serving profile). Checks and
+responses are shared with the sync views; only the recording differs:
+buffered hits go to Redis via redis.asyncio, so a hit holds no thread.
+"""
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils import timezone
+from django.views import View
+
+from tracking.models import RecipientStatus
+from tracking.services import events
+from tracking.views import (
+    click_target,
+    open_recipient,
+    pixel_response,
+    tracking_event,
+    unsubscribe_recipient,
+    unsubscribed_response,
+)
+
+
+class AsyncClickRedirectView(View):
+    """GET /t/c?r=<uuid>&u=<b64url>&s=<sig>"""
+    async def get(self, request):
+        target = click_target(request)
+        if isinstance(target, HttpResponse):
+            return target
+        r, original_url = target
+
+        await _record(r, RecipientStatus.CLICKED, {"url": original_url})
+        return HttpResponseRedirect(original_url)
+
+
+class AsyncOpenPixelView(View):
+    """GET /t/o?r=<uuid>&u=<b64('OPEN')>&s=<sig>"""
+    async def get(self, request):
+        r = open_recipient(request)
+        if r:
+            await events.arecord_open(r, timezone.now())
+        return pixel_response()
+
+
+class AsyncUnsubscribeView(View):
+    """GET /t/u?r=<uuid>&u=<b64('UNSUB')>&s=<sig>"""
+    async def get(self, request):
+        r = unsubscribe_recipient(request)
+        if isinstance(r, HttpResponse):
+            return r
+
+        await _record(r, RecipientStatus.UNSUBSCRIBED, {})
+        return unsubscribed_response()
+
+
+async def _record(recipient_id: str, event_type: str, metadata: dict) -> None:
+    if not await events.arecord(tracking_event(recipient_id, event_type, metadata)):
+        raise Http404("No EmailRecipient matches the given query.")
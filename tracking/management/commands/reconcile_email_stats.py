@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from emails.models import Email
+from tracking.services import stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-email rollups (EmailStats, EmailStatsHourly) from EmailRecipient and TrackEvent."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", action="append", default=[], help="Email id (repeatable)")
+        parser.add_argument("--all", action="store_true", help="Every email, not only recently active ones")
+
+    def handle(self, *args, **options):
+        if options["email"]:
+            email_ids = options["email"]
+        elif options["all"]:
+            email_ids = Email.objects.values_list("id", flat=True).iterator()
+        else:
+            since = timezone.now() - timedelta(days=settings.EMAIL_STATS_RECONCILE_DAYS)
+            email_ids = stats.emails_to_reconcile(since).iterator()
+
+        n = 0
+        for n, email_id in enumerate(email_ids, start=1):
+            stats.reconcile(email_id)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {n} emails."))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracking.services import partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly TrackEvent partitions and detach or drop expired ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead", type=int, default=settings.TRACKEVENT_PARTITIONS_AHEAD,
+            help=f"Months to create ahead of the current one (default: {settings.TRACKEVENT_PARTITIONS_AHEAD})",
+        )
+        parser.add_argument(
+            "--retention-months", type=int, default=settings.TRACKEVENT_RETENTION_MONTHS,
+            help="Full months to keep; 0 keeps everything (default: TRACKEVENT_RETENTION_MONTHS)",
+        )
+        parser.add_argument(
+            "--drop", action="store_true", default=settings.TRACKEVENT_RETENTION_DROP,
+            help="Drop expired partitions instead of only detaching them",
+        )
+
+    def handle(self, *args, **options):
+        for name in partitions.ensure_partitions(options["ahead"]):
+            self.stdout.write(f"created {name}")
+        if options["retention_months"] > 0:
+            verb = "dropped" if options["drop"] else "detached"
+            for name in partitions.expire_partitions(options["retention_months"], drop=options["drop"]):
+                self.stdout.write(f"{verb} {name}")
+        self.stdout.write(self.style.SUCCESS("TrackEvent partitions up to date."))
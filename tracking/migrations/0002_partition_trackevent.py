@@ -0,0 +1,88 @@
+from django.db import migrations
+
+# Rebuilds tracking_trackevent as a table range-partitioned by month on
+# occurred_at. Postgres requires the partition key in every unique index,
+# so the primary key becomes (id, occurred_at); Django still treats `id`
+# as the pk. Index and constraint names are the ones Django generated for
+# the plain table, so later AlterField/AddIndex migrations keep working.
+# Monthly partitions cover existing rows plus three months ahead; anything
+# outside lands in the DEFAULT partition until tracking.services.partitions
+# creates its month.
+
+COLUMNS = """
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    id uuid NOT NULL,
+    event_type varchar(20) NOT NULL,
+    occurred_at timestamp with time zone NOT NULL,
+    metadata jsonb NOT NULL,
+    recipient_id uuid NOT NULL
+"""
+
+INDEXES = """
+CREATE INDEX tracking_tr_recipie_45342a_idx ON tracking_trackevent (recipient_id, event_type);
+CREATE INDEX tracking_tr_event_t_23ce16_idx ON tracking_trackevent (event_type, occurred_at);
+CREATE INDEX tracking_trackevent_created_at_7f01ad54 ON tracking_trackevent (created_at);
+CREATE INDEX tracking_trackevent_event_type_eae82aea ON tracking_trackevent (event_type);
+CREATE INDEX tracking_trackevent_event_type_eae82aea_like ON tracking_trackevent (event_type varchar_pattern_ops);
+CREATE INDEX tracking_trackevent_occurred_at_50c9ac01 ON tracking_trackevent (occurred_at);
+CREATE INDEX tracking_trackevent_recipient_id_16f48f28 ON tracking_trackevent (recipient_id);
+ALTER TABLE tracking_trackevent ADD CONSTRAINT tracking_trackevent_recipient_id_16f48f28_fk_tracking_
+    FOREIGN KEY (recipient_id) REFERENCES tracking_emailrecipient (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+FORWARD = f"""
+SET LOCAL timezone = 'UTC';
+
+CREATE TABLE tracking_trackevent_partitioned ({COLUMNS}) PARTITION BY RANGE (occurred_at);
+
+DO $$
+DECLARE
+    first_month timestamptz;
+    month timestamptz;
+BEGIN
+    SELECT date_trunc('month', LEAST(MIN(occurred_at), now())) INTO first_month FROM tracking_trackevent;
+    FOR month IN SELECT generate_series(first_month, date_trunc('month', now()) + interval '3 months', interval '1 month')
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF tracking_trackevent_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'tracking_trackevent_p' || to_char(month, 'YYYY_MM'), month, month + interval '1 month'
+        );
+    END LOOP;
+END $$;
+
+CREATE TABLE tracking_trackevent_default PARTITION OF tracking_trackevent_partitioned DEFAULT;
+
+INSERT INTO tracking_trackevent_partitioned
+    (created_at, updated_at, id, event_type, occurred_at, metadata, recipient_id)
+SELECT created_at, updated_at, id, event_type, occurred_at, metadata, recipient_id FROM tracking_trackevent;
+
+DROP TABLE tracking_trackevent;
+ALTER TABLE tracking_trackevent_partitioned RENAME TO tracking_trackevent;
+ALTER TABLE tracking_trackevent ADD CONSTRAINT tracking_trackevent_pkey PRIMARY KEY (id, occurred_at);
+{INDEXES}
+"""
+
+BACKWARD = f"""
+CREATE TABLE tracking_trackevent_plain ({COLUMNS});
+
+INSERT INTO tracking_trackevent_plain
+    (created_at, updated_at, id, event_type, occurred_at, metadata, recipient_id)
+SELECT created_at, updated_at, id, event_type, occurred_at, metadata, recipient_id FROM tracking_trackevent;
+
+DROP TABLE tracking_trackevent CASCADE;
+ALTER TABLE tracking_trackevent_plain RENAME TO tracking_trackevent;
+ALTER TABLE tracking_trackevent ADD CONSTRAINT tracking_trackevent_pkey PRIMARY KEY (id);
+{INDEXES}
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, BACKWARD),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0002_alter_email_from_name'),
+        ('tracking', '0002_partition_trackevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailStats',
+            fields=[
+                ('email', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='emails.email')),
+                ('queued', models.BigIntegerField(default=0)),
+                ('sent', models.BigIntegerField(default=0)),
+                ('delivered', models.BigIntegerField(default=0)),
+                ('bounced', models.BigIntegerField(default=0)),
+                ('complained', models.BigIntegerField(default=0)),
+                ('unsubscribed', models.BigIntegerField(default=0)),
+                ('opened', models.BigIntegerField(default=0)),
+                ('clicked', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EmailStatsHourly',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField()),
+                ('sent', models.BigIntegerField(default=0)),
+                ('delivered', models.BigIntegerField(default=0)),
+                ('bounced', models.BigIntegerField(default=0)),
+                ('complained', models.BigIntegerField(default=0)),
+                ('unsubscribed', models.BigIntegerField(default=0)),
+                ('opened', models.BigIntegerField(default=0)),
+                ('clicked', models.BigIntegerField(default=0)),
+                ('email', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_stats', to='emails.email')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('email', 'bucket'), name='uniq_email_stats_hour')],
+            },
+        ),
+    ]
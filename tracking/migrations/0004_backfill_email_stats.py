@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:02
+
+from django.db import migrations
+
+STATUS_FIELDS = ["queued", "sent", "delivered", "bounced", "complained", "unsubscribed", "opened", "clicked"]
+EVENT_FIELDS = [f for f in STATUS_FIELDS if f != "queued"]
+
+
+def _counts(column, fields):
+    return ", ".join(f"COUNT(*) FILTER (WHERE {column} = '{f}')" for f in fields)
+
+
+def _overwrite(fields):
+    return ", ".join(f"{f} = EXCLUDED.{f}" for f in fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0003_email_stats'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f"""
+                INSERT INTO tracking_emailstats (email_id, {", ".join(STATUS_FIELDS)}, updated_at)
+                SELECT email_id, {_counts("status", STATUS_FIELDS)}, now()
+                FROM tracking_emailrecipient
+                GROUP BY email_id
+                ON CONFLICT (email_id) DO UPDATE SET {_overwrite(STATUS_FIELDS)}
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=f"""
+                INSERT INTO tracking_emailstatshourly (email_id, bucket, {", ".join(EVENT_FIELDS)})
+                SELECT r.email_id,
+                       date_trunc('hour', e.occurred_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                       {_counts("e.event_type", EVENT_FIELDS)}
+                FROM tracking_trackevent AS e
+                JOIN tracking_emailrecipient AS r ON r.id = e.recipient_id
+                WHERE e.event_type IN ({", ".join(f"'{f}'" for f in EVENT_FIELDS)})
+                GROUP BY 1, 2
+                ON CONFLICT (email_id, bucket) DO UPDATE SET {_overwrite(EVENT_FIELDS)}
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
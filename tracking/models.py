@@ -92,4 +92,58 @@ class TrackEvent(TimeStampedModel):
         ]
 
     def __str__(self):
-        return f"{self.recipient_id} → {self.event_type} @ {self.occurred_at}"
\ No newline at end of file
+        return f"{self.recipient_id} → {self.event_type} @ {self.occurred_at}"
+
+class EmailStats(models.Model):
+    """
+    Rollup of an Email's recipients by current status, kept current by
+    tracking.services.stats as statuses change and rebuilt from
+    EmailRecipient by the reconcile job.
+    """
+    email = models.OneToOneField(
+        "emails.Email",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    queued = models.BigIntegerField(default=0)
+    sent = models.BigIntegerField(default=0)
+    delivered = models.BigIntegerField(default=0)
+    bounced = models.BigIntegerField(default=0)
+    complained = models.BigIntegerField(default=0)
+    unsubscribed = models.BigIntegerField(default=0)
+    opened = models.BigIntegerField(default=0)
+    clicked = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"stats {self.email_id}"
+
+
+class EmailStatsHourly(models.Model):
+    """
+    Event counts per Email per UTC hour, incremented as events are applied
+    and rebuilt from TrackEvent by the reconcile job.
+    """
+    id = models.BigAutoField(primary_key=True)
+    email = models.ForeignKey(
+        "emails.Email",
+        on_delete=models.CASCADE,
+        related_name="hourly_stats",
+    )
+    bucket = models.DateTimeField()
+    sent = models.BigIntegerField(default=0)
+    delivered = models.BigIntegerField(default=0)
+    bounced = models.BigIntegerField(default=0)
+    complained = models.BigIntegerField(default=0)
+    unsubscribed = models.BigIntegerField(default=0)
+    opened = models.BigIntegerField(default=0)
+    clicked = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=("email", "bucket"), name="uniq_email_stats_hour"),
+        ]
+
+    def __str__(self):
+        return f"stats {self.email_id} @ {self.bucket}"
@@ -1,38 +1,127 @@
+import hashlib
+import hmac
 import re
-from typing import Callable
+from dataclasses import dataclass, field
+from typing import Dict
+from urllib.parse import quote_plus
 from django.http import HttpRequest
-from tracking.utils import build_click_url, build_unsubscribe_url
+from tracking.utils import (
+    HMAC_KEY, OPEN_MARKER, SIGNATURE_LENGTH, UNSUBSCRIBE_MARKER, _scheme_and_host, _urlsafe_b64encode,
+)
 
 HREF_RE = re.compile(r'href=(["\'])(?P<url>.+?)\1', flags=re.IGNORECASE)
 
-def rewrite_html_links(
-    request: HttpRequest,
-    html: str,
-    recipient_id: str,
-    unsubscribe_text: str | None = "Unsubscribe",
-) -> str:
+# Slot kinds in a compiled segment list; see compile_html_links.
+CLICK = "click"
+UNSUBSCRIBE = "unsubscribe"
+OPEN = "open"
+
+
+@dataclass(frozen=True)
+class TrackedLink:
+    """
+    One link slot with everything that does not depend on the recipient
+    precomputed: the base64 of the original URL and the signed suffix.
     """
-    Rewrites all hrefs to tracked click URLs and appends an unsubscribe link.
+    kind: str
+    url: str
+    u_enc: str = field(init=False)
+    signed_suffix: bytes = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "u_enc", _urlsafe_b64encode(self.url))
+        object.__setattr__(self, "signed_suffix", f"|{self.url}".encode())
+
+
+class RecipientLinks:
+    """
+    Builds one recipient's tracked URLs. Produces the same URLs as
+    build_click_url / build_unsubscribe_url / build_open_url, but keys
+    the HMAC with the recipient id once and signs each distinct URL once.
     """
 
-    def _replace(match: re.Match) -> str:
+    def __init__(self, request: HttpRequest | None, recipient_id: str):
+        scheme, netloc = _scheme_and_host(request)
+        r = quote_plus(recipient_id)
+        self._prefix = {
+            CLICK: f"{scheme}://{netloc}/t/c?r={r}&u=",
+            UNSUBSCRIBE: f"{scheme}://{netloc}/t/u?r={r}&u=",
+            OPEN: f"{scheme}://{netloc}/t/o?r={r}&u=",
+        }
+        self._mac = hmac.new(HMAC_KEY, recipient_id.encode(), hashlib.sha256)
+        self._urls: Dict[TrackedLink, str] = {}
+
+    def url(self, link: TrackedLink) -> str:
+        url = self._urls.get(link)
+        if url is None:
+            mac = self._mac.copy()
+            mac.update(link.signed_suffix)
+            sig = mac.hexdigest()[:SIGNATURE_LENGTH]
+            url = self._urls[link] = f"{self._prefix[link.kind]}{link.u_enc}&s={sig}"
+        return url
+
+
+def _link_segments(html: str) -> list:
+    segments, pos = [], 0
+    for match in HREF_RE.finditer(html):
         quote = match.group(1)
-        url = match.group("url")
-        tracked = build_click_url(request, recipient_id, url)
-        return f'href={quote}{tracked}{quote}'
+        segments.append(f"{html[pos:match.start()]}href={quote}")
+        segments.append(TrackedLink(CLICK, match.group("url")))
+        segments.append(quote)
+        pos = match.end()
+    segments.append(html[pos:])
+    return segments
 
-    rewritten = HREF_RE.sub(_replace, html)
 
+def compile_html_links(
+    html: str,
+    unsubscribe_text: str | None = "Unsubscribe",
+    track_opens: bool = True,
+) -> list:
+    """
+    Parse `html` once into literal strings and TrackedLink slots where the
+    tracked click URLs, the unsubscribe footer URL and the open pixel go.
+    Footer and pixel go before the last </body>, or at the end.
+    """
+    tail = []
     if unsubscribe_text:
-        unsub = build_unsubscribe_url(request, recipient_id)
-        footer = f'<p style="font-size:12px;color:#6b7280;">' \
-                 f'<a href="{unsub}" target="_blank" rel="noopener">[{unsubscribe_text}]</a></p>'
-        # naive append before closing body
-        if "</body>" in rewritten.lower():
-            # case-insensitive replace last occurrence would be nicer; keep simple:
-            parts = re.split("(?i)</body>", rewritten)
-            rewritten = f"{'</body>'.join(parts[:-1])}{footer}</body>{parts[-1]}"
-        else:
-            rewritten += footer
-
-    return rewritten
\ No newline at end of file
+        tail += [
+            '<p style="font-size:12px;color:#6b7280;"><a href="',
+            TrackedLink(UNSUBSCRIBE, UNSUBSCRIBE_MARKER),
+            f'" target="_blank" rel="noopener">[{unsubscribe_text}]</a></p>',
+        ]
+    if track_opens:
+        tail += [
+            '<img src="',
+            TrackedLink(OPEN, OPEN_MARKER),
+            '" width="1" height="1" alt="" style="border:0;width:1px;height:1px;">',
+        ]
+    if not tail:
+        return _link_segments(html)
+
+    body_end = html.lower().rfind("</body>")
+    if body_end == -1:
+        body_end = len(html)
+    return _link_segments(html[:body_end]) + tail + _link_segments(html[body_end:])
+
+
+def fill_links(segments: list, links: RecipientLinks) -> str:
+    """Join compiled segments with one recipient's tracked URLs."""
+    return "".join(s if isinstance(s, str) else links.url(s) for s in segments)
+
+
+def rewrite_html_links(
+    request: HttpRequest | None,
+    html: str,
+    recipient_id: str,
+    unsubscribe_text: str | None = "Unsubscribe",
+    track_opens: bool = True,
+) -> str:
+    """
+    Rewrites all hrefs to tracked click URLs and appends an unsubscribe
+    link and an open-tracking pixel.
+    Pass request=None outside a request cycle to use TRACKING_BASE_URL.
+    For many recipients of the same HTML, compile once and use fill_links.
+    """
+    segments = compile_html_links(html, unsubscribe_text, track_opens)
+    return fill_links(segments, RecipientLinks(request, recipient_id))
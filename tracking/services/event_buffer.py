@@ -0,0 +1,153 @@
+import asyncio
+import json
+import uuid
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timezone as dt_timezone
+from typing import List
+
+import redis.asyncio
+from django.conf import settings
+from django_redis import get_redis_connection
+from django_redis.pool import ConnectionFactory
+
+KEY_PREFIX = "coldreach"
+
+# Moves up to ARGV[1] events from the head of the buffer to the in-flight
+# list in one step, so a drainer that dies mid-batch loses nothing.
+CLAIM_LUA = """
+local batch = redis.call('LPOP', KEYS[1], tonumber(ARGV[1]))
+if not batch then return {} end
+for i = 1, #batch, 1000 do
+    redis.call('RPUSH', KEYS[2], unpack(batch, i, math.min(i + 999, #batch)))
+end
+return batch
+"""
+
+# Buffers the event only if the dedupe key is not set yet; the key
+# expires after the window, so one event per key per window gets through.
+PUSH_ONCE_LUA = """
+if redis.call('SET', KEYS[2], '1', 'NX', 'EX', tonumber(ARGV[2])) then
+    return redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class TrackingEvent:
+    """
+    One tracking hit as the views see it. The id is assigned up front
+    and reused as the TrackEvent pk, so replaying a batch is harmless.
+    """
+    recipient_id: str
+    event_type: str
+    occurred_at: datetime
+    metadata: dict = field(default_factory=dict)
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    def dumps(self) -> str:
+        return json.dumps(
+            [self.id, self.recipient_id, self.event_type, self.occurred_at.timestamp(), self.metadata],
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def loads(cls, raw) -> "TrackingEvent":
+        event_id, recipient_id, event_type, ts, metadata = json.loads(raw)
+        return cls(
+            recipient_id=recipient_id,
+            event_type=event_type,
+            occurred_at=datetime.fromtimestamp(ts, tz=dt_timezone.utc),
+            metadata=metadata,
+            id=event_id,
+        )
+
+
+class EventBuffer:
+    """
+    Redis list of compact tracking events written by the views and
+    drained in batches by the tracking worker. One drainer at a time
+    (see events.flush_buffer); an unacked in-flight batch is handed out
+    again before anything new.
+    """
+
+    def __init__(self, name: str = "tracking_events"):
+        self.key = f"{KEY_PREFIX}:{name}"
+        self.inflight_key = f"{KEY_PREFIX}:{name}:inflight"
+        self.dead_key = f"{KEY_PREFIX}:{name}:dead"
+
+    def push(self, event: TrackingEvent) -> None:
+        get_redis_connection("default").rpush(self.key, event.dumps())
+
+    def push_once(self, event: TrackingEvent, dedupe_key: str, window: int) -> bool:
+        """Push unless `dedupe_key` was pushed in the last `window` seconds."""
+        return bool(get_redis_connection("default").eval(
+            PUSH_ONCE_LUA, 2, self.key, f"{KEY_PREFIX}:{dedupe_key}", event.dumps(), window,
+        ))
+
+    async def apush(self, event: TrackingEvent) -> None:
+        await async_redis().rpush(self.key, event.dumps())
+
+    async def apush_once(self, event: TrackingEvent, dedupe_key: str, window: int) -> bool:
+        return bool(await async_redis().eval(
+            PUSH_ONCE_LUA, 2, self.key, f"{KEY_PREFIX}:{dedupe_key}", event.dumps(), window,
+        ))
+
+    def claim(self, batch_size: int) -> List[TrackingEvent]:
+        client = get_redis_connection("default")
+        raw = client.lrange(self.inflight_key, 0, -1)
+        if not raw:
+            raw = client.eval(CLAIM_LUA, 2, self.key, self.inflight_key, batch_size)
+        return [TrackingEvent.loads(r) for r in raw]
+
+    def ack(self) -> None:
+        get_redis_connection("default").delete(self.inflight_key)
+
+    def dead_letter(self, event: TrackingEvent) -> None:
+        """Park an event the database keeps rejecting, for inspection or replay."""
+        get_redis_connection("default").rpush(self.dead_key, event.dumps())
+
+    def size(self) -> int:
+        return get_redis_connection("default").llen(self.key)
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.asyncio.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def async_redis() -> redis.asyncio.Redis:
+    """
+    asyncio client for the cache's Redis, one per event loop (its pooled
+    connections belong to the loop that opened them).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        url, kwargs = async_connection_params()
+        client = redis.asyncio.Redis.from_url(url, **kwargs)
+        _async_clients[loop] = client
+    return client
+
+
+def async_connection_params():
+    """
+    (url, kwargs) for the default cache's Redis, built the way django-redis
+    builds its own connections: the first (primary) LOCATION, PASSWORD,
+    socket timeouts and CONNECTION_POOL_KWARGS (ssl options, ...). The
+    parser class is left to redis.asyncio.
+    """
+    cache = settings.CACHES["default"]
+    options = cache.get("OPTIONS", {})
+    location = cache["LOCATION"]
+    url = (location.split(",") if isinstance(location, str) else location)[0].strip()
+    factory = ConnectionFactory(options)
+    kwargs = factory.make_connection_params(url)
+    kwargs.pop("url")
+    kwargs.pop("parser_class")
+    kwargs.update(factory.pool_cls_kwargs)
+    return url, kwargs
+
+
+buffer = EventBuffer()
@@ -0,0 +1,199 @@
+import logging
+from typing import Iterable, List
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from audience.models import Audience
+from contacts import cache_utils as contacts_cache
+from contacts.models import Contact, ContactStatus
+from tracking.models import EmailRecipient, RecipientStatus, TrackEvent
+
+from . import stats, status
+from .event_buffer import TrackingEvent, buffer
+
+logger = logging.getLogger(__name__)
+
+FLUSH_LOCK_KEY = "tracking:flush_lock"
+
+
+def record(event: TrackingEvent) -> bool:
+    """
+    Single entry point for tracking hits. With TRACKING_WRITE_BEHIND the
+    event goes to the Redis buffer and the caller returns immediately;
+    otherwise it is written now. The caller has verified the signature.
+    Returns False only when written now and the recipient does not exist.
+    """
+    if settings.TRACKING_WRITE_BEHIND:
+        buffer.push(event)
+        return True
+    return apply_events([event]) > 0
+
+
+def record_open(recipient_id: str, occurred_at) -> bool:
+    """
+    Opens always take the buffered path: repeated opens of one recipient
+    within TRACKING_OPEN_DEDUPE_WINDOW collapse into the first, in Redis,
+    before any of them reaches the database. Returns True if buffered.
+    """
+    event = TrackingEvent(recipient_id=recipient_id, event_type=RecipientStatus.OPENED, occurred_at=occurred_at)
+    return buffer.push_once(event, f"tracking:open_seen:{recipient_id}", settings.TRACKING_OPEN_DEDUPE_WINDOW)
+
+
+async def arecord(event: TrackingEvent) -> bool:
+    """record() for async views: the buffered path never leaves the loop."""
+    if settings.TRACKING_WRITE_BEHIND:
+        await buffer.apush(event)
+        return True
+    return await sync_to_async(apply_events)([event]) > 0
+
+
+async def arecord_open(recipient_id: str, occurred_at) -> bool:
+    event = TrackingEvent(recipient_id=recipient_id, event_type=RecipientStatus.OPENED, occurred_at=occurred_at)
+    return await buffer.apush_once(event, f"tracking:open_seen:{recipient_id}", settings.TRACKING_OPEN_DEDUPE_WINDOW)
+
+
+def apply_events(events: Iterable[TrackingEvent]) -> int:
+    """
+    Persist a batch of events, dropping those for unknown recipients:
+    - one UPDATE advancing recipient statuses (status.advance), which
+      also tells which recipients exist
+    - one INSERT for their TrackEvent rows (replays are ignored by id)
+    - one UPDATE suppressing the contacts that unsubscribed
+    - the EmailStats / EmailStatsHourly upserts for the batch
+    Returns the number of events written.
+    """
+    events = list(events)
+    if not events:
+        return 0
+
+    with transaction.atomic():
+        advanced = status.advance((e.recipient_id, e.event_type, e.occurred_at) for e in events)
+        events = [e for e in events if e.recipient_id in advanced]
+        TrackEvent.objects.bulk_create(
+            [
+                TrackEvent(
+                    id=e.id,
+                    recipient_id=e.recipient_id,
+                    event_type=e.event_type,
+                    occurred_at=e.occurred_at,
+                    metadata=e.metadata,
+                )
+                for e in events
+            ],
+            ignore_conflicts=True,
+        )
+        unsubscribed = {e.recipient_id for e in events if e.event_type == RecipientStatus.UNSUBSCRIBED}
+        if unsubscribed:
+            _suppress_contacts(unsubscribed)
+
+        delta = stats.StatsDelta()
+        for a in advanced.values():
+            delta.transition(a.email_id, a.old_status, a.new_status)
+        for e in events:
+            delta.event(advanced[e.recipient_id].email_id, e.event_type, e.occurred_at)
+        delta.apply()
+    return len(events)
+
+
+def _suppress_contacts(recipient_ids) -> None:
+    """
+    Global suppression: the recipients' contacts get no further emails.
+    Archived contacts are left alone: they are already out of every send,
+    and the address may have been added back as a new active row, which
+    uniq_email_aud_active would not let them rejoin. Every status written
+    here is therefore one audience.services.counters already counts, so
+    contacts_count needs no adjustment.
+    Owners' cached contact lists are invalidated once the batch commits.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {Contact._meta.db_table} AS c SET status = %s "
+            f"FROM {EmailRecipient._meta.db_table} AS r, {Audience._meta.db_table} AS a "
+            "WHERE r.contact_id = c.id AND a.id = c.audience_id AND r.id = ANY(%s::uuid[]) "
+            "AND c.status <> %s "
+            "RETURNING a.user_id",
+            [ContactStatus.UNSUBSCRIBED, list(recipient_ids), ContactStatus.ARCHIVED],
+        )
+        user_ids = {row[0] for row in cursor.fetchall()}
+
+    def invalidate():
+        for user_id in user_ids:
+            contacts_cache.invalidate(user_id)
+
+    transaction.on_commit(invalidate)
+
+
+def apply_send_results(recipients: List[EmailRecipient], created: bool = False) -> None:
+    """
+    Persist send outcomes already set on the instances (SENT or BOUNCED)
+    through status.advance, so an open or click recorded while the batch
+    was sending is not moved back; the rollups count the transitions
+    that actually happened. Then one INSERT of the matching TrackEvents
+    and the rollup upserts. `created` marks rows inserted just for this
+    send, which are not in the rollups yet.
+    """
+    if not recipients:
+        return
+    now = timezone.now()
+    message_ids = {str(r.id): r.provider_message_id for r in recipients if r.provider_message_id}
+
+    with transaction.atomic():
+        advanced = status.advance(((str(r.id), r.status, now) for r in recipients), message_ids)
+        recipients = [r for r in recipients if str(r.id) in advanced]
+        delta = stats.StatsDelta()
+        for r in recipients:
+            a = advanced[str(r.id)]
+            delta.transition(r.email_id, None if created else a.old_status, a.new_status)
+            delta.event(r.email_id, r.status, now)
+        TrackEvent.objects.bulk_create([
+            TrackEvent(recipient_id=r.id, event_type=r.status, occurred_at=now)
+            for r in recipients
+        ])
+        delta.apply()
+    for r in recipients:
+        r.status = advanced[str(r.id)].new_status
+        r.last_event_at = r.updated_at = now
+
+
+def flush_buffer(max_batches: int | None = None) -> int:
+    """
+    Drain the write-behind buffer in TRACKING_FLUSH_BATCH_SIZE batches.
+    A cache lock keeps overlapping beat runs from draining concurrently.
+    A batch the database rejects is retried event by event, and the
+    events that still fail go to the dead-letter list, so one bad event
+    cannot hold up the buffer. Returns the number of events written.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, timeout=settings.TRACKING_FLUSH_LOCK_TIMEOUT):
+        return 0
+    written = 0
+    try:
+        for _ in range(max_batches or settings.TRACKING_FLUSH_MAX_BATCHES):
+            events = buffer.claim(settings.TRACKING_FLUSH_BATCH_SIZE)
+            if not events:
+                break
+            try:
+                written += apply_events(events)
+            except DatabaseError:
+                logger.exception("tracking flush: batch of %d failed, applying one by one", len(events))
+                written += _apply_each(events)
+            buffer.ack()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+    if written:
+        logger.info("tracking flush: %d events written, %d still buffered", written, buffer.size())
+    return written
+
+
+def _apply_each(events: List[TrackingEvent]) -> int:
+    written = 0
+    for event in events:
+        try:
+            written += apply_events([event])
+        except DatabaseError:
+            logger.exception("tracking flush: event %s dead-lettered", event.id)
+            buffer.dead_letter(event)
+    return written
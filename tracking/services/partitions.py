@@ -0,0 +1,123 @@
+import logging
+import re
+from datetime import date, timezone as dt_timezone
+from typing import Dict, List
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tracking.models import TrackEvent
+
+logger = logging.getLogger(__name__)
+
+# Monthly range partitions of TrackEvent on occurred_at, in UTC, named
+# <table>_pYYYY_MM, plus a DEFAULT partition for anything unplanned.
+# Created by migration 0002_partition_trackevent.
+PARENT = TrackEvent._meta.db_table
+DEFAULT_PARTITION = f"{PARENT}_default"
+PARTITION_RE = re.compile(rf"^{PARENT}_p(\d{{4}})_(\d{{2}})$")
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month() -> date:
+    return timezone.now().astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def existing_partitions() -> Dict[date, str]:
+    """Attached monthly partitions by first day of month."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            months[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return months
+
+
+def _create_partition(cursor, month: date) -> None:
+    name, lo, hi = partition_name(month), _bound(month), _bound(add_months(month, 1))
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE occurred_at >= {lo} AND occurred_at < {hi})"
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ({lo}) TO ({hi})")
+        return
+
+    # Rows for this month already sit in DEFAULT, which would reject the
+    # new range; move them over while DEFAULT is detached.
+    logger.warning("moving rows for %s out of %s", name, DEFAULT_PARTITION)
+    cursor.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}")
+    cursor.execute(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ({lo}) TO ({hi})")
+    cursor.execute(
+        f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE occurred_at >= {lo} AND occurred_at < {hi}"
+    )
+    cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at >= {lo} AND occurred_at < {hi}")
+    cursor.execute(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+
+
+def ensure_partitions(ahead: int) -> List[str]:
+    """Create the partitions for this month and `ahead` months after it."""
+    existing = existing_partitions()
+    created = []
+    start = current_month()
+    for n in range(ahead + 1):
+        month = add_months(start, n)
+        if month in existing:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            _create_partition(cursor, month)
+        created.append(partition_name(month))
+    return created
+
+
+def expire_partitions(retention_months: int, drop: bool = False) -> List[str]:
+    """
+    Detach (and with `drop`, drop) partitions entirely older than
+    `retention_months` full months. Metadata-only: no row is deleted.
+    A detached table keeps its own copy of the recipient foreign key,
+    which would block deleting those recipients; it is dropped too.
+    """
+    cutoff = add_months(current_month(), -retention_months)
+    expired = []
+    for month, name in sorted(existing_partitions().items()):
+        if month >= cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Fire deferred FK checks first: ALTER TABLE refuses a table
+            # with pending trigger events (rows written earlier in the
+            # caller's transaction).
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+            if drop:
+                cursor.execute(f"DROP TABLE {name}")
+            else:
+                _drop_foreign_keys(cursor, name)
+        expired.append(name)
+    return expired
+
+
+def _drop_foreign_keys(cursor, table: str) -> None:
+    cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [table])
+    for (constraint,) in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"')
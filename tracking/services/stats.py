@@ -0,0 +1,178 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from tracking.models import EmailRecipient, EmailStats, EmailStatsHourly, RecipientStatus, TrackEvent
+
+from . import partitions
+
+# EmailStats has one column per status, EmailStatsHourly one per event type.
+STATUS_FIELDS = [status.value for status in RecipientStatus]
+EVENT_FIELDS = [field for field in STATUS_FIELDS if field != RecipientStatus.QUEUED]
+
+# Incremental updates take this advisory lock shared per email, the
+# reconcile job takes it exclusively, so a rebuild never double-counts a
+# delta committed while it ran.
+STATS_LOCK_CLASS = 7401
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _lock(email_ids, shared: bool) -> None:
+    fn = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {fn}(%s, hashtext(e)) FROM unnest(%s::text[]) AS e",
+            [STATS_LOCK_CLASS, sorted(str(e) for e in email_ids)],
+        )
+
+
+def _upsert(table: str, key_columns, fields, rows, params_per_row) -> None:
+    columns = [*key_columns, *fields]
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    updates = ", ".join(f"{f} = {table}.{f} + EXCLUDED.{f}" for f in fields if f != "updated_at")
+    if "updated_at" in fields:
+        updates += ", updated_at = EXCLUDED.updated_at"
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([placeholders] * len(rows))} "
+        f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+    )
+    params = [p for row in rows for p in params_per_row(row)]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+class StatsDelta:
+    """
+    Collects status transitions and events from one write batch and
+    applies them as one upsert per rollup table, inside the caller's
+    transaction so the rollups commit together with the rows they count.
+    """
+
+    def __init__(self):
+        self.status: Dict[str, Counter] = defaultdict(Counter)
+        self.hourly: Dict[tuple, Counter] = defaultdict(Counter)
+
+    def transition(self, email_id, old: str | None, new: str) -> None:
+        if old == new:
+            return
+        if old is not None:
+            self.status[str(email_id)][old] -= 1
+        self.status[str(email_id)][new] += 1
+
+    def created(self, email_id, status: str, n: int) -> None:
+        """`n` new recipients entered `status`."""
+        if n:
+            self.status[str(email_id)][status] += n
+
+    def event(self, email_id, event_type: str, occurred_at: datetime) -> None:
+        self.hourly[(str(email_id), hour_bucket(occurred_at))][event_type] += 1
+
+    def apply(self) -> None:
+        if not self.status and not self.hourly:
+            return
+        with transaction.atomic(savepoint=False):
+            _lock({e for e in self.status} | {e for e, _ in self.hourly}, shared=True)
+            now = timezone.now()
+            if self.status:
+                _upsert(
+                    EmailStats._meta.db_table, ["email_id"], [*STATUS_FIELDS, "updated_at"],
+                    list(self.status.items()),
+                    lambda row: [row[0], *(row[1][f] for f in STATUS_FIELDS), now],
+                )
+            if self.hourly:
+                _upsert(
+                    EmailStatsHourly._meta.db_table, ["email_id", "bucket"], EVENT_FIELDS,
+                    list(self.hourly.items()),
+                    lambda row: [row[0][0], row[0][1], *(row[1][f] for f in EVENT_FIELDS)],
+                )
+
+
+def reconcile(email_id) -> EmailStats:
+    """
+    Rebuild one Email's rollups from the source tables: status counts
+    from EmailRecipient, hourly event counts from TrackEvent. updated_at
+    is left alone: it marks incremental changes (emails_to_reconcile),
+    and a rebuild is not one. Hours before the oldest attached TrackEvent
+    partition keep their rollups, whose events were detached on expiry.
+    """
+    with transaction.atomic():
+        _lock([email_id], shared=False)
+
+        counts = dict(
+            EmailRecipient.objects.filter(email_id=email_id)
+            .values_list("status")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        counts = {f: counts.get(f, 0) for f in STATUS_FIELDS}
+        if not EmailStats.objects.filter(email_id=email_id).update(**counts):
+            EmailStats.objects.create(email_id=email_id, **counts)
+
+        retained_from = _retained_from()
+        events = TrackEvent.objects.filter(recipient__email_id=email_id, event_type__in=EVENT_FIELDS)
+        hourly_rows = EmailStatsHourly.objects.filter(email_id=email_id)
+        if retained_from is not None:
+            events = events.filter(occurred_at__gte=retained_from)
+            hourly_rows = hourly_rows.filter(bucket__gte=retained_from)
+
+        hourly = defaultdict(Counter)
+        rows = (
+            events.annotate(bucket=TruncHour("occurred_at", tzinfo=dt_timezone.utc))
+            .values_list("bucket", "event_type")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for bucket, event_type, n in rows:
+            hourly[bucket][event_type] = n
+        hourly_rows.delete()
+        EmailStatsHourly.objects.bulk_create([
+            EmailStatsHourly(email_id=email_id, bucket=bucket, **{f: c[f] for f in EVENT_FIELDS})
+            for bucket, c in hourly.items()
+        ])
+    return EmailStats.objects.get(email_id=email_id)
+
+
+def _retained_from() -> datetime | None:
+    """Start of the oldest attached monthly TrackEvent partition, if any."""
+    months = partitions.existing_partitions()
+    if not months:
+        return None
+    oldest = min(months)
+    return datetime(oldest.year, oldest.month, 1, tzinfo=dt_timezone.utc)
+
+
+def summarize(stats: EmailStats | dict | None) -> dict:
+    """API shape: recipients by current status plus their total."""
+    if isinstance(stats, EmailStats):
+        stats = {f: getattr(stats, f) for f in STATUS_FIELDS}
+    counts = {f: (stats or {}).get(f) or 0 for f in STATUS_FIELDS}
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def for_email(email) -> dict:
+    try:
+        return summarize(email.stats)
+    except EmailStats.DoesNotExist:
+        return summarize(None)
+
+
+def for_emails(email_filter: dict) -> dict:
+    """Summed rollups of the emails matching `email_filter` (one row per email read)."""
+    totals = EmailStats.objects.filter(**{f"email__{k}": v for k, v in email_filter.items()}).aggregate(
+        **{f: Sum(f) for f in STATUS_FIELDS}
+    )
+    return summarize(totals)
+
+
+def emails_to_reconcile(since: datetime):
+    """Emails whose rollups were incremented since `since` (reconcile does not count)."""
+    return EmailStats.objects.filter(updated_at__gte=since).values_list("email_id", flat=True)
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+from django.db import connection
+from django.utils import timezone
+
+from tracking.models import EmailRecipient, RecipientStatus
+
+# Recipient statuses only move up this order. Engagement outranks
+# delivery, and the terminal outcomes outrank engagement, so a late open
+# never hides a click and nothing overwrites an unsubscribe, bounce or
+# complaint with a lesser status.
+STATUS_ORDER = (
+    RecipientStatus.QUEUED,
+    RecipientStatus.SENT,
+    RecipientStatus.DELIVERED,
+    RecipientStatus.OPENED,
+    RecipientStatus.CLICKED,
+    RecipientStatus.UNSUBSCRIBED,
+    RecipientStatus.BOUNCED,
+    RecipientStatus.COMPLAINED,
+)
+STATUS_RANK = {status: rank for rank, status in enumerate(STATUS_ORDER)}
+
+
+_RANK_SQL = "CASE r.status {} END".format(
+    " ".join(f"WHEN '{status.value}' THEN {rank}" for status, rank in STATUS_RANK.items())
+)
+
+_ADVANCE_SQL = f"""
+WITH v(id, status, rank, occurred_at, message_id) AS (VALUES {{values}}),
+old AS (
+    SELECT r.id, r.status FROM {EmailRecipient._meta.db_table} AS r
+    JOIN v ON v.id = r.id
+    FOR UPDATE OF r
+)
+UPDATE {EmailRecipient._meta.db_table} AS r
+SET status = CASE WHEN {_RANK_SQL} < v.rank THEN v.status ELSE r.status END,
+    last_event_at = GREATEST(r.last_event_at, v.occurred_at),
+    provider_message_id = COALESCE(v.message_id, r.provider_message_id),
+    updated_at = %s
+FROM v JOIN old ON old.id = v.id
+WHERE r.id = v.id
+RETURNING r.id, r.email_id, old.status, r.status
+"""
+
+
+class Advanced(NamedTuple):
+    recipient_id: str
+    email_id: str
+    old_status: str
+    new_status: str
+
+
+def advance(
+    transitions: Iterable[Tuple[str, str, datetime]],
+    message_ids: Dict[str, str] | None = None,
+) -> Dict[str, Advanced]:
+    """
+    Apply (recipient_id, status, occurred_at) transitions in one
+    statement: a CTE locks the rows (SELECT ... FOR UPDATE) and keeps
+    their old status for the UPDATE that follows. Per recipient the
+    highest-ranked status wins and replaces the stored one only if it
+    ranks higher; with the rows locked first, concurrent hits cannot
+    move a status backwards. last_event_at keeps the latest time seen, and
+    `message_ids` (recipient_id -> Message-ID) are stored whatever the
+    status outcome.
+    Returns the existing recipients by id with their status before and after.
+    """
+    targets = {}
+    for recipient_id, status, occurred_at in transitions:
+        current = targets.get(recipient_id)
+        if current is None:
+            targets[recipient_id] = (status, occurred_at)
+        else:
+            best = status if STATUS_RANK[status] > STATUS_RANK[current[0]] else current[0]
+            targets[recipient_id] = (best, max(occurred_at, current[1]))
+    if not targets:
+        return {}
+
+    message_ids = message_ids or {}
+    params = []
+    for recipient_id, (status, occurred_at) in targets.items():
+        params += [recipient_id, str(status), STATUS_RANK[status], occurred_at, message_ids.get(recipient_id)]
+    params.append(timezone.now())
+    values = ", ".join(["(%s::uuid, %s, %s, %s::timestamptz, %s::text)"] * len(targets))
+    with connection.cursor() as cursor:
+        cursor.execute(_ADVANCE_SQL.format(values=values), params)
+        return {
+            str(row[0]): Advanced(str(row[0]), str(row[1]), row[2], row[3])
+            for row in cursor.fetchall()
+        }
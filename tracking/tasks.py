@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from tracking.services import events, partitions, stats
+
+
+@shared_task(queue="tracking", ignore_result=True)
+def flush_tracking_events() -> int:
+    """
+    Drain the write-behind tracking buffer into TrackEvent and
+    EmailRecipient with batched statements. Scheduled by beat.
+    """
+    return events.flush_buffer()
+
+
+@shared_task(queue="tracking")
+def rotate_trackevent_partitions() -> dict:
+    """
+    Pre-create upcoming monthly TrackEvent partitions and detach/drop the
+    ones past TRACKEVENT_RETENTION_MONTHS. Scheduled daily by beat.
+    """
+    created = partitions.ensure_partitions(settings.TRACKEVENT_PARTITIONS_AHEAD)
+    expired = []
+    if settings.TRACKEVENT_RETENTION_MONTHS > 0:
+        expired = partitions.expire_partitions(
+            settings.TRACKEVENT_RETENTION_MONTHS, drop=settings.TRACKEVENT_RETENTION_DROP
+        )
+    return {"created": created, "expired": expired}
+
+
+@shared_task(queue="tracking")
+def reconcile_email_stats(email_id: str | None = None) -> int:
+    """
+    Rebuild EmailStats / EmailStatsHourly from EmailRecipient and TrackEvent,
+    for one email or for every email whose rollups moved in the last
+    EMAIL_STATS_RECONCILE_DAYS days. Scheduled nightly by beat.
+    """
+    if email_id:
+        email_ids = [email_id]
+    else:
+        since = timezone.now() - timedelta(days=settings.EMAIL_STATS_RECONCILE_DAYS)
+        email_ids = list(stats.emails_to_reconcile(since))
+    for eid in email_ids:
+        stats.reconcile(eid)
+    return len(email_ids)
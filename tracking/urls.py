@@ -1,7 +1,17 @@
+from django.conf import settings
 from django.urls import path
-from tracking.views import ClickRedirectView, UnsubscribeView
+
+if settings.TRACKING_ASYNC_VIEWS:
+    from tracking.async_views import (
+        AsyncClickRedirectView as ClickRedirectView,
+        AsyncOpenPixelView as OpenPixelView,
+        AsyncUnsubscribeView as UnsubscribeView,
+    )
+else:
+    from tracking.views import ClickRedirectView, OpenPixelView, UnsubscribeView
 
 urlpatterns = [
     path("t/c", ClickRedirectView.as_view(), name="track-click"),
     path("t/u", UnsubscribeView.as_view(), name="track-unsubscribe"),
-]
\ No newline at end of file
+    path("t/o", OpenPixelView.as_view(), name="track-open"),
+]
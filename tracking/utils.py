@@ -5,6 +5,9 @@ from urllib.parse import urlencode, urlparse, urlunparse
 from django.conf import settings
 
 HMAC_KEY = settings.SECRET_KEY.encode()
+SIGNATURE_LENGTH = 32
+UNSUBSCRIBE_MARKER = "UNSUB"
+OPEN_MARKER = "OPEN"
 
 def _urlsafe_b64encode(s: str) -> str:
     return base64.urlsafe_b64encode(s.encode()).decode().rstrip("=")
@@ -18,35 +21,48 @@ def make_signature(r: str, u: str) -> str:
     msg = f"{r}|{u}".encode()
     digest = hmac.new(HMAC_KEY, msg, hashlib.sha256).hexdigest()
     # keep it short; 24–32 hex chars is typically enough. Use full digest if you prefer.
-    return digest[:32]
+    return digest[:SIGNATURE_LENGTH]
 
 def verify_signature(r: str, u: str, s: str) -> bool:
     expected = make_signature(r, u)
     return hmac.compare_digest(expected, s)
 
+def _scheme_and_host(request) -> tuple[str, str]:
+    """Current host/proto, or TRACKING_BASE_URL when there is no request (workers)."""
+    if request is not None:
+        scheme = "https" if request.is_secure() else "http"
+        return scheme, request.get_host()
+    base = urlparse(settings.TRACKING_BASE_URL)
+    return base.scheme, base.netloc
+
 def build_click_url(request, recipient_id: str, original_url: str) -> str:
     """Construct /t/c?r=<uuid>&u=<b64url>&s=<sig> absolute URL."""
     u_enc = _urlsafe_b64encode(original_url)
     sig = make_signature(recipient_id, original_url)
     query = urlencode({"r": recipient_id, "u": u_enc, "s": sig})
     # Build absolute URL using current host/proto
-    scheme = "https" if request.is_secure() else "http"
-    netloc = request.get_host()
+    scheme, netloc = _scheme_and_host(request)
     path = "/t/c"
     return urlunparse((scheme, netloc, path, "", query, ""))
 
 def build_unsubscribe_url(request, recipient_id: str) -> str:
     """One-click unsubscribe URL that doesn’t need original URL."""
     # We still sign against a fixed 'u' string to keep format uniform.
-    original_url = "UNSUB"
+    original_url = UNSUBSCRIBE_MARKER
     u_enc = _urlsafe_b64encode(original_url)
     sig = make_signature(recipient_id, original_url)
     query = urlencode({"r": recipient_id, "u": u_enc, "s": sig})
-    scheme = "https" if request.is_secure() else "http"
-    netloc = request.get_host()
+    scheme, netloc = _scheme_and_host(request)
     path = "/t/u"
     return urlunparse((scheme, netloc, path, "", query, ""))
 
 def decode_tracked_url(u_enc: str) -> str:
     return _urlsafe_b64decode(u_enc)
 
+def build_open_url(request, recipient_id: str) -> str:
+    """Open-tracking pixel URL; signed against a fixed 'u' like unsubscribe."""
+    u_enc = _urlsafe_b64encode(OPEN_MARKER)
+    sig = make_signature(recipient_id, OPEN_MARKER)
+    query = urlencode({"r": recipient_id, "u": u_enc, "s": sig})
+    scheme, netloc = _scheme_and_host(request)
+    return urlunparse((scheme, netloc, "/t/o", "", query, ""))
@@ -1,17 +1,25 @@
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.utils import timezone
 from django.views import View
-from django.db import transaction
-from django.shortcuts import get_object_or_404
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 
-from tracking.models import EmailRecipient, TrackEvent, RecipientStatus
-from tracking.utils import verify_signature, decode_tracked_url
+from tracking.models import RecipientStatus
+from tracking.services import events
+from tracking.services.event_buffer import TrackingEvent
+from tracking.utils import OPEN_MARKER, _urlsafe_b64encode, verify_signature, decode_tracked_url
 
 
 SAFE_REDIRECT_SCHEMES = {"http", "https"}
 
+OPEN_U = _urlsafe_b64encode(OPEN_MARKER)
+
+# 1x1 transparent GIF, served from memory for every open.
+PIXEL_GIF = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+    b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+
 def _is_safe_redirect(url: str) -> bool:
     try:
         URLValidator(schemes=list(SAFE_REDIRECT_SCHEMES))(url)
@@ -20,99 +28,123 @@ def _is_safe_redirect(url: str) -> bool:
         return False
     
 
+def click_target(request):
+    """
+    Checks a click link. Returns (recipient_id, url) to record and
+    redirect to, or the error response to send instead.
+    """
+    r = request.GET.get("r")
+    u_enc = request.GET.get("u")
+    s = request.GET.get("s")
+    if not r or not u_enc or not s:
+        return JsonResponse({"detail": "Missing parameters."}, status=400)
+
+    try:
+        original_url = decode_tracked_url(u_enc)
+    except Exception:
+        return JsonResponse({"detail": "Invalid URL encoding."}, status=400)
+
+    if not verify_signature(r, original_url, s):
+        return JsonResponse({"detail": "Invalid signature."}, status=400)
+
+    if not _is_safe_redirect(original_url):
+        return JsonResponse({"detail": "Unsafe redirect target."}, status=400)
+    return r, original_url
+
+
+def open_recipient(request):
+    """Recipient id of a validly signed open pixel, else None."""
+    r = request.GET.get("r")
+    s = request.GET.get("s")
+    if r and s and request.GET.get("u") == OPEN_U and verify_signature(r, OPEN_MARKER, s):
+        return r
+    return None
+
+
+def unsubscribe_recipient(request):
+    """Recipient id of an unsubscribe link, or the error response."""
+    r = request.GET.get("r")
+    u_enc = request.GET.get("u")
+    s = request.GET.get("s")
+    if not r or not u_enc or not s:
+        return JsonResponse({"detail": "Missing parameters."}, status=400)
+
+    try:
+        marker = decode_tracked_url(u_enc)
+    except Exception:
+        return JsonResponse({"detail": "Invalid URL encoding."}, status=400)
+
+    if marker != "UNSUB" or not verify_signature(r, marker, s):
+        return JsonResponse({"detail": "Invalid signature."}, status=400)
+    return r
+
+
+def pixel_response() -> HttpResponse:
+    response = HttpResponse(PIXEL_GIF, content_type="image/gif")
+    response["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
+    return response
+
+
+def unsubscribed_response() -> HttpResponse:
+    # Simple confirmation page (you can brand this later)
+    return HttpResponse(
+        "<!doctype html><meta charset='utf-8'><title>Unsubscribed</title>"
+        "<div style='font-family:system-ui;margin:40px;'>"
+        "<h1>You’re unsubscribed</h1>"
+        "<p>You won’t receive further emails from this sender.</p>"
+        "</div>",
+        content_type="text/html; charset=utf-8",
+    )
+
+
+def tracking_event(recipient_id: str, event_type: str, metadata: dict) -> TrackingEvent:
+    return TrackingEvent(
+        recipient_id=recipient_id,
+        event_type=event_type,
+        occurred_at=timezone.now(),
+        metadata=metadata,
+    )
+
+
 class ClickRedirectView(View):
     """GET /t/c?r=<uuid>&u=<b64url>&s=<sig>"""
     def get(self, request):
-        r = request.GET.get("r")
-        u_enc = request.GET.get("u")
-        s = request.GET.get("s")
-        if not r or not u_enc or not s:
-            return JsonResponse({"detail": "Missing parameters."}, status=400)
-
-        try:
-            original_url = decode_tracked_url(u_enc)
-        except Exception:
-            return JsonResponse({"detail": "Invalid URL encoding."}, status=400)
-
-        if not verify_signature(r, original_url, s):
-            return JsonResponse({"detail": "Invalid signature."}, status=400)
-
-        if not _is_safe_redirect(original_url):
-            return JsonResponse({"detail": "Unsafe redirect target."}, status=400)
-
-        recipient = get_object_or_404(EmailRecipient, id=r)
-
-        with transaction.atomic():
-            # Log event
-            TrackEvent.objects.create(
-                recipient=recipient,
-                event_type=RecipientStatus.CLICKED,
-                occurred_at=timezone.now(),
-                metadata={"url": original_url},
-            )
-            # Update latest status + last_event_at
-            recipient.status = RecipientStatus.CLICKED
-            recipient.last_event_at = timezone.now()
-            recipient.save(update_fields=["status", "last_event_at", "updated_at"])
+        target = click_target(request)
+        if isinstance(target, HttpResponse):
+            return target
+        r, original_url = target
+
+        _record(r, RecipientStatus.CLICKED, {"url": original_url})
 
         return HttpResponseRedirect(original_url)
     
+class OpenPixelView(View):
+    """
+    GET /t/o?r=<uuid>&u=<b64('OPEN')>&s=<sig>
+    Always answers with the pixel (a broken image helps no one) and never
+    touches the database; valid opens go to the dedupe buffer.
+    """
+    def get(self, request):
+        r = open_recipient(request)
+        if r:
+            events.record_open(r, timezone.now())
+        return pixel_response()
+
+
 class UnsubscribeView(View):
     """GET /t/u?r=<uuid>&u=<b64('UNSUB')>&s=<sig>"""
     def get(self, request):
-        r = request.GET.get("r")
-        u_enc = request.GET.get("u")
-        s = request.GET.get("s")
-        if not r or not u_enc or not s:
-            return JsonResponse({"detail": "Missing parameters."}, status=400)
-
-        try:
-            marker = decode_tracked_url(u_enc)
-        except Exception:
-            return JsonResponse({"detail": "Invalid URL encoding."}, status=400)
-
-        if marker != "UNSUB" or not verify_signature(r, marker, s):
-            return JsonResponse({"detail": "Invalid signature."}, status=400)
-
-        recipient = get_object_or_404(EmailRecipient, id=r)
-
-        with transaction.atomic():
-            # Log event
-            TrackEvent.objects.create(
-                recipient=recipient,
-                event_type=RecipientStatus.UNSUBSCRIBED,
-                occurred_at=timezone.now(),
-                metadata={},
-            )
-            # Update recipient status
-            recipient.status = RecipientStatus.UNSUBSCRIBED
-            recipient.last_event_at = timezone.now()
-            recipient.save(update_fields=["status", "last_event_at", "updated_at"])
-
-            # Apply global suppression (hook point)
-            _apply_global_suppression(recipient)
-
-        # Simple confirmation page (you can brand this later)
-        return HttpResponse(
-            "<!doctype html><meta charset='utf-8'><title>Unsubscribed</title>"
-            "<div style='font-family:system-ui;margin:40px;'>"
-            "<h1>You’re unsubscribed</h1>"
-            "<p>You won’t receive further emails from this sender.</p>"
-            "</div>",
-            content_type="text/html; charset=utf-8",
-        )
-
-def _apply_global_suppression(recipient: EmailRecipient) -> None:
+        r = unsubscribe_recipient(request)
+        if isinstance(r, HttpResponse):
+            return r
+
+        _record(r, RecipientStatus.UNSUBSCRIBED, {})
+        return unsubscribed_response()
+
+def _record(recipient_id: str, event_type: str, metadata: dict) -> None:
     """
-    Hook: mark the contact as globally unsubscribed/suppressed.
-    Integrate with your suppressions list or Contact model flag here.
+    Hand a verified hit to the tracking service. Written now, an unknown
+    recipient is a 404; buffered, the flush drops it instead.
     """
-    try:
-        contact = recipient.contact
-        # Example if you have a boolean on Contact:
-        contact.status = "unsubscribed"
-        contact.save(update_fields=["status"])
-        # If you have a Suppression model, create/update it here instead.
-    except Exception:
-        # Don’t fail the unsubscribe path if suppression write fails; log it.
-        pass
\ No newline at end of file
+    if not events.record(tracking_event(recipient_id, event_type, metadata)):
+        raise Http404("No EmailRecipient matches the given query.")